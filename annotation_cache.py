@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from image_io import JPEG_QUALITY, decode_image, encode_jpeg
+from image_processing import detect_slope_protection
+
+ANNOTATION_CACHE_DIR = os.path.join(".cache", "annotations")
+ANNOTATION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# detect_and_annotate defaults; every one of them changes the annotated output
+DETECTION_DEFAULTS = {
+    "blur_kernel_size": (5, 5),
+    "canny_threshold1": 100,
+    "canny_threshold2": 200,
+    "contour_size_threshold": 50,
+    "max_annotations": 5,
+    "max_detection_side": 1600,
+}
+
+
+def annotation_key(data, **detect_kwargs):
+    """
+    Content address of an annotated image: SHA-256 of the upload bytes and the detection parameters.
+    """
+    params = {**DETECTION_DEFAULTS, **detect_kwargs}
+    digest = hashlib.sha256(data)
+    digest.update(repr(sorted((name, tuple(value) if isinstance(value, list) else value)
+                              for name, value in params.items())).encode())
+    digest.update(f"bgr-jpeg{JPEG_QUALITY}-scores".encode())
+    return digest.hexdigest()
+
+
+class AnnotationCache:
+    """
+    Size-capped, content-addressed store of encoded annotated images.
+
+    Entries live in ``<root>/<key[:2]>/<key>.jpg``, with the detector's
+    protection scores beside them in ``<key>.json``. A hit refreshes the image's
+    modification time, and once the total size exceeds ``max_bytes`` the
+    least recently used files are deleted. The in-memory index is rebuilt
+    from the directory on first use, so the cache survives restarts.
+    """
+
+    def __init__(self, root=ANNOTATION_CACHE_DIR, max_bytes=ANNOTATION_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, extension=".jpg"):
+        return os.path.join(self.root, key[:2], key + extension)
+
+    def _load_entries(self):
+        # key -> [size, last used]
+        self._entries = {}
+        if os.path.isdir(self.root):
+            for shard in os.listdir(self.root):
+                shard_dir = os.path.join(self.root, shard)
+                if not os.path.isdir(shard_dir):
+                    continue
+                for entry in os.listdir(shard_dir):
+                    if entry.endswith(".jpg"):
+                        stat = os.stat(os.path.join(shard_dir, entry))
+                        if os.path.exists(os.path.join(shard_dir, entry[:-4] + ".json")):
+                            self._entries[entry[:-4]] = [stat.st_size, stat.st_mtime]
+        self._total_bytes = sum(size for size, _ in self._entries.values())
+
+    def get(self, key):
+        """
+        Returns the cached (encoded image, scores) for ``key``, or None.
+        """
+        with self._lock:
+            if self._entries is None:
+                self._load_entries()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as f:
+                    encoded = f.read()
+                with open(self._path(key, ".json"), encoding="utf-8") as f:
+                    scores = json.load(f)
+                os.utime(self._path(key))
+            except OSError:
+                # Removed behind our back; forget it
+                self._total_bytes -= entry[0]
+                del self._entries[key]
+                self.misses += 1
+                return None
+            entry[1] = time.time()
+            self.hits += 1
+            return encoded, scores
+
+    def put(self, key, encoded, scores):
+        """
+        Stores an encoded image with its scores and evicts least recently used entries beyond the size cap.
+        """
+        # The scores are written first; an image without its scores is never indexed
+        os.makedirs(os.path.dirname(self._path(key)), exist_ok=True)
+        for path, content in ((self._path(key, ".json"), json.dumps(scores).encode()), (self._path(key), encoded)):
+            scratch = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(scratch, "wb") as f:
+                f.write(content)
+            os.replace(scratch, path)
+
+        with self._lock:
+            if self._entries is None:
+                self._load_entries()
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._entries[key] = [len(encoded), time.time()]
+            self._total_bytes += len(encoded)
+
+            if self._total_bytes > self.max_bytes:
+                for old_key, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+                    if self._total_bytes <= self.max_bytes or old_key == key:
+                        break
+                    for extension in (".jpg", ".json"):
+                        try:
+                            os.remove(self._path(old_key, extension))
+                        except FileNotFoundError:
+                            pass
+                    del self._entries[old_key]
+                    self._total_bytes -= size
+
+    def stats(self):
+        with self._lock:
+            entries = 0 if self._entries is None else len(self._entries)
+            return {"entries": entries, "bytes": self._total_bytes, "hits": self.hits, "misses": self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_annotation_cache():
+    """
+    Returns the process-wide annotation cache under ANNOTATION_CACHE_DIR.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnnotationCache()
+    return _cache
+
+
+def annotate_upload(data, cache=None, **detect_kwargs):
+    """
+    Annotates an uploaded image and scores its protection measures, reusing the cached
+    result for identical bytes and parameters.
+
+    Parameters:
+    - data: Encoded JPEG/PNG bytes of the upload.
+    - cache: AnnotationCache to use (default: the process-wide cache).
+    - detect_kwargs: Passed on to detect_and_annotate.
+
+    Returns:
+    - tuple: (annotated image as JPEG bytes, protection scores per measure).
+      On a cache hit the upload is never decoded.
+    """
+    cache = cache or get_annotation_cache()
+    key = annotation_key(data, **detect_kwargs)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Decode straight from the upload buffer, annotate in place and encode once
+    image_bgr = decode_image(data)
+    _, scores = detect_slope_protection(image_bgr, color_order="BGR", **detect_kwargs)
+    encoded = encode_jpeg(image_bgr)
+    cache.put(key, encoded, scores)
+    return encoded, scores
@@ -0,0 +1,269 @@
+import datetime
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ASSESSMENT_STORE_PATH = os.path.join("assessment_store", "assessments.db")
+
+# Fuzzy inputs recorded with every assessment, as named in the fuzzy model
+INPUT_COLUMNS = [
+    'rainfall', 'soil_moisture', 'slope_steepness', 'vegetated_surface', 'human_activity',
+    'historical_landslides', 'drainage_system', 'soil_type', 'slope_nature',
+    'soil_nailing', 'slope_netting', 'gabion_wall', 'rubble_wall',
+]
+ASSESSMENT_COLUMNS = ["id", "assessment_date", "lat", "lon"] + INPUT_COLUMNS + ["risk_score", "risk_category"]
+
+# Metres per degree of latitude, and of longitude at the equator
+METRES_PER_DEGREE_LAT = 110_574
+METRES_PER_DEGREE_LON = 111_320
+EARTH_RADIUS_M = 6_371_008.8
+
+# Radius within which two assessments count as the same slope
+SITE_RADIUS_M = 50
+
+# Time axis scale of the R*Tree. Its node splits favour the longest axis, so days
+# are indexed at roughly the size of a spatial query (one day ~ 110 m) to keep
+# the nodes spatially compact as well as compact in time.
+DEGREES_PER_DAY = 0.001
+
+
+def _day_number(value):
+    # Days since the epoch of a date, datetime or ISO date string
+    return pd.Timestamp(value).normalize().value // (86400 * 10**9)
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in metres between points given in degrees; broadcasts over arrays.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def local_metres(lat, lon, reference_lat):
+    """
+    Projects points to (x, y) metres, equirectangular around reference_lat; exact enough within an island.
+    """
+    x = np.asarray(lon, dtype=np.float64) * METRES_PER_DEGREE_LON * np.cos(np.radians(reference_lat))
+    return np.column_stack([x, np.asarray(lat, dtype=np.float64) * METRES_PER_DEGREE_LAT])
+
+
+def latest_per_site(assessments, radius_m=SITE_RADIUS_M):
+    """
+    Keeps the most recent assessment of every slope.
+
+    Assessments within ``radius_m`` of a more recent one that is kept count as
+    the same slope, as in site_trend, so repeated assessments of a slope taken
+    a few metres apart are not counted as separate sites.
+
+    Parameters:
+    - assessments: DataFrame with lat, lon, assessment_date and id, e.g. from query_bounds.
+    - radius_m: Radius within which two assessments count as the same slope.
+
+    Returns:
+    - pd.DataFrame: One row per slope, most recent first.
+    """
+    if assessments.empty:
+        return assessments.reset_index(drop=True)
+    # scipy comes with scikit-fuzzy; imported here so importing the store stays cheap
+    from scipy.spatial import cKDTree
+
+    assessments = assessments.sort_values(["assessment_date", "id"], ascending=False, kind="stable")
+    points = local_metres(assessments["lat"], assessments["lon"], float(assessments["lat"].mean()))
+    neighbours = cKDTree(points).query_ball_point(points, radius_m)
+    covered = np.zeros(len(assessments), dtype=bool)
+    keep = np.zeros(len(assessments), dtype=bool)
+    for row in range(len(assessments)):
+        if not covered[row]:
+            keep[row] = True
+            covered[neighbours[row]] = True
+    return assessments[keep].reset_index(drop=True)
+
+
+class AssessmentStore:
+    """
+    Persistent record of landslide risk assessments in SQLite.
+
+    Every assessment is a row of ``assessments`` (date, location, all fuzzy
+    inputs, score and category) plus an entry in the ``assessment_index``
+    R*Tree over (longitude, latitude, day). Spatial and time window queries
+    walk the R*Tree and only read the rows it returns; radius queries then
+    drop the corners of the bounding box with an exact distance check.
+    """
+
+    def __init__(self, path=ASSESSMENT_STORE_PATH):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # One connection shared by the Streamlit script threads, serialized by the lock
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            input_columns = "".join(f", {name} REAL" for name in INPUT_COLUMNS)
+            connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS assessments (
+                    id INTEGER PRIMARY KEY,
+                    assessment_date TEXT NOT NULL,
+                    assessment_day INTEGER NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    lat REAL NOT NULL,
+                    lon REAL NOT NULL{input_columns},
+                    risk_score REAL,
+                    risk_category TEXT
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS assessment_index USING rtree(
+                    id, min_lon, max_lon, min_lat, max_lat, min_day, max_day
+                );
+            """)
+            self._connection = connection
+        return self._connection
+
+    def _insert(self, connection, assessment_date, lat, lon, inputs, risk_score, risk_category):
+        date = pd.Timestamp(assessment_date).date().isoformat()
+        day = _day_number(date)
+        row = [date, day, time.time(), float(lat), float(lon)]
+        row += [None if inputs.get(name) is None else float(inputs[name]) for name in INPUT_COLUMNS]
+        row += [None if risk_score is None else float(risk_score), risk_category]
+        columns = ["assessment_date", "assessment_day", "recorded_at", "lat", "lon"] + INPUT_COLUMNS + \
+                  ["risk_score", "risk_category"]
+        cursor = connection.execute(f"INSERT INTO assessments ({', '.join(columns)}) "
+                                    f"VALUES ({', '.join('?' * len(row))})", row)
+        connection.execute("INSERT INTO assessment_index VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           (cursor.lastrowid, lon, lon, lat, lat, day * DEGREES_PER_DAY, day * DEGREES_PER_DAY))
+        return cursor.lastrowid
+
+    def record(self, assessment_date, lat, lon, inputs, risk_score, risk_category):
+        """
+        Stores one assessment.
+
+        Parameters:
+        - assessment_date: Date of the assessment (date, datetime or ISO string).
+        - lat, lon: Location in degrees.
+        - inputs: Fuzzy input values keyed by name; names outside INPUT_COLUMNS are ignored.
+        - risk_score: Calculated landslide risk score.
+        - risk_category: "Safe", "Moderate" or "High".
+
+        Returns:
+        - int: The assessment id.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return self._insert(connection, assessment_date, lat, lon, inputs, risk_score, risk_category)
+
+    def query_bounds(self, bounds, start_date=None, end_date=None, limit=None):
+        """
+        Reads the assessments inside a lon/lat box and date range from the R*Tree.
+
+        Parameters:
+        - bounds: (min_lon, min_lat, max_lon, max_lat).
+        - start_date, end_date: Inclusive date range; either may be None for open.
+        - limit: Maximum number of rows, most recent first.
+
+        Returns:
+        - pd.DataFrame: ASSESSMENT_COLUMNS, most recent first.
+        """
+        min_lon, min_lat, max_lon, max_lat = bounds
+        min_day = -10**6 if start_date is None else _day_number(start_date)
+        max_day = 10**6 if end_date is None else _day_number(end_date)
+        # The R*Tree keeps 32-bit floats rounded outwards; the stored columns make the final check
+        sql = (f"SELECT {', '.join('a.' + column for column in ASSESSMENT_COLUMNS)} "
+               "FROM assessment_index AS i JOIN assessments AS a ON a.id = i.id "
+               "WHERE i.max_lon >= ? AND i.min_lon <= ? AND i.max_lat >= ? AND i.min_lat <= ? "
+               "AND i.max_day >= ? AND i.min_day <= ? "
+               "AND a.lon BETWEEN ? AND ? AND a.lat BETWEEN ? AND ? AND a.assessment_day BETWEEN ? AND ? "
+               "ORDER BY a.assessment_date DESC, a.id DESC")
+        params = [min_lon, max_lon, min_lat, max_lat, min_day * DEGREES_PER_DAY, max_day * DEGREES_PER_DAY,
+                  min_lon, max_lon, min_lat, max_lat, min_day, max_day]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=ASSESSMENT_COLUMNS)
+
+    def query_radius(self, lat, lon, radius_m, start_date=None, end_date=None):
+        """
+        Reads the assessments within ``radius_m`` metres of a point and inside a date range.
+
+        Example: ``query_radius(5.4225, 100.2714, 500, date - timedelta(days=90), date)``
+        returns every assessment within 500 m in the 90 days up to ``date``.
+
+        Returns:
+        - pd.DataFrame: ASSESSMENT_COLUMNS plus ``distance_m``, most recent first.
+        """
+        lat_span = radius_m / METRES_PER_DEGREE_LAT
+        lon_span = radius_m / (METRES_PER_DEGREE_LON * max(np.cos(np.radians(lat)), 1e-6))
+        assessments = self.query_bounds((lon - lon_span, lat - lat_span, lon + lon_span, lat + lat_span),
+                                        start_date, end_date)
+        assessments["distance_m"] = haversine_m(lat, lon, assessments["lat"], assessments["lon"])
+        return assessments[assessments["distance_m"] <= radius_m].reset_index(drop=True)
+
+    def site_trend(self, lat, lon, radius_m=SITE_RADIUS_M):
+        """
+        Risk history of the slope at a point: every assessment within ``radius_m``, oldest first.
+        """
+        trend = self.query_radius(lat, lon, radius_m)
+        return trend.sort_values(["assessment_date", "id"], kind="stable").reset_index(drop=True)
+
+    def count(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_assessment_store():
+    """
+    Returns the process-wide assessment store at ASSESSMENT_STORE_PATH.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AssessmentStore()
+    return _store
+
+
+if __name__ == "__main__":
+    # Time radius queries against a store of simulated assessments around Penang
+    import sys
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as scratch:
+        store = AssessmentStore(os.path.join(scratch, "assessments.db"))
+        started = time.perf_counter()
+        first_day = datetime.date(2022, 1, 1)
+        lat = rng.uniform(5.12, 5.59, count)
+        lon = rng.uniform(100.17, 100.56, count)
+        day = rng.integers(0, 3 * 365, count)
+        connection = store._connect()
+        with store._lock, connection:
+            for i in range(count):
+                store._insert(connection, first_day + datetime.timedelta(days=int(day[i])), lat[i], lon[i], {},
+                              50.0, "Moderate")
+        print(f"Inserted {count:,} assessments in {time.perf_counter() - started:.1f} s")
+
+        end = datetime.date(2024, 6, 30)
+        started = time.perf_counter()
+        for _ in range(100):
+            nearby = store.query_radius(5.4225, 100.2714, 500, end - datetime.timedelta(days=90), end)
+        print(f"Within 500 m in the last 90 days: {len(nearby)} rows in "
+              f"{(time.perf_counter() - started) * 10:.2f} ms per query")
+
+        started = time.perf_counter()
+        recent = store.query_bounds((100.17, 5.12, 100.56, 5.59), end - datetime.timedelta(days=30), end)
+        print(f"Whole island, last 30 days: {len(recent)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
@@ -0,0 +1,170 @@
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import cv2
+
+from image_io import decode_image, preview_reduction
+from image_processing import detect_and_annotate
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def _is_image_name(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS) and not os.path.basename(name).startswith(".")
+
+
+def iter_image_sources(path):
+    """
+    Lists the site photos in a folder (recursively) or a zip archive.
+
+    Parameters:
+    - path: Folder or .zip file on the server.
+
+    Returns:
+    - generator: (name, read) pairs, where read() returns the encoded image
+      bytes; files are only read when the work queue reaches them. A zip
+      archive is opened once and closed when the generator is exhausted or
+      closed, so call each read() before advancing past the last member.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            yield from _iter_zip_members(archive)
+    elif os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                if _is_image_name(file_name):
+                    file_path = os.path.join(root, file_name)
+                    yield os.path.relpath(file_path, path), lambda file_path=file_path: _read_file(file_path)
+    else:
+        raise ValueError(f"{path} is neither a folder nor a zip archive")
+
+
+def iter_uploaded_sources(uploaded_files):
+    """
+    Turns Streamlit uploads into (name, read) pairs; zip uploads are expanded into their images.
+
+    As with iter_image_sources, a zip upload stays open only until the generator moves past its last member.
+    """
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(uploaded_file) as archive:
+                for name, read in _iter_zip_members(archive):
+                    yield f"{uploaded_file.name}/{name}", read
+        else:
+            yield uploaded_file.name, uploaded_file.getvalue
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _iter_zip_members(archive):
+    # Every member is read through the one open archive; reopening it per member
+    # would re-parse the central directory each time
+    for name in sorted(name for name in archive.namelist() if _is_image_name(name)):
+        yield name, lambda name=name: archive.read(name)
+
+
+def inspect_image_bytes(data, preview_side=None, reduced_decode=False, **detect_kwargs):
+    """
+    Decodes one encoded image and annotates it in place.
+
+    Parameters:
+    - data: Encoded JPEG/PNG bytes.
+    - preview_side: If given, the annotated image is shrunk so its longest side is at most this.
+    - reduced_decode: Decode JPEGs at the coarsest resolution that still
+      covers preview_side; much faster, with approximate annotations.
+    - detect_kwargs: Passed on to detect_and_annotate.
+
+    Returns:
+    - np.ndarray: The annotated image in BGR order.
+    """
+    reduce = 1
+    if reduced_decode and preview_side is not None:
+        reduce = preview_reduction(data, preview_side, detect_kwargs.get("max_detection_side", 1600))
+    image_bgr = decode_image(data, reduce)
+    detect_and_annotate(image_bgr, color_order="BGR", **detect_kwargs)
+    height, width = image_bgr.shape[:2]
+    if preview_side is not None and max(height, width) > preview_side:
+        factor = preview_side / max(height, width)
+        image_bgr = cv2.resize(image_bgr, (max(1, round(width * factor)), max(1, round(height * factor))),
+                               interpolation=cv2.INTER_AREA)
+    return image_bgr
+
+
+def _inspect_source(name, data, preview_side, reduced_decode, detect_kwargs):
+    try:
+        return name, inspect_image_bytes(data, preview_side, reduced_decode, **detect_kwargs), None
+    except Exception as error:
+        return name, None, f"{type(error).__name__}: {error}"
+
+
+def inspect_images(sources, workers=None, max_pending=None, use_processes=False, preview_side=None,
+                   reduced_decode=False, **detect_kwargs):
+    """
+    Annotates many site photos in parallel, yielding results as they complete.
+
+    OpenCV releases the GIL, so a thread pool keeps every core busy; a
+    process pool can be requested instead. At most ``max_pending`` images are
+    read and in flight at any time, so peak memory is bounded by the queue
+    size rather than by the number of photos.
+
+    Parameters:
+    - sources: Iterable of (name, read) pairs, e.g. from iter_image_sources.
+    - workers: Pool size (default: number of CPUs).
+    - max_pending: Work queue size (default: twice the pool size).
+    - use_processes: Use a process pool instead of threads.
+    - preview_side: Shrink each annotated image to at most this many pixels on its longest side.
+    - reduced_decode: Decode at reduced resolution for the previews (see inspect_image_bytes).
+    - detect_kwargs: Passed on to detect_and_annotate.
+
+    Returns:
+    - generator: (name, annotated BGR image or None, error message or None) in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    sources = iter(sources)
+
+    with executor_class(max_workers=workers) as executor:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            # Top up the work queue, reading each file only when it is submitted
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    name, read = next(sources)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    data = read()
+                except (OSError, zipfile.BadZipFile, KeyError) as error:
+                    # A missing file or a corrupt archive member fails only that photo
+                    yield name, None, f"{type(error).__name__}: {error}"
+                    continue
+                pending.add(executor.submit(_inspect_source, name, data, preview_side, reduced_decode,
+                                             detect_kwargs))
+
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+if __name__ == "__main__":
+    # Annotate every photo in a folder or zip and report throughput
+    import sys
+    import time
+
+    started = time.perf_counter()
+    count = 0
+    for name, annotated_image_np, error in inspect_images(iter_image_sources(sys.argv[1])):
+        count += 1
+        print(f"{name}: {error or 'ok'}")
+    elapsed = time.perf_counter() - started
+    print(f"Inspected {count} images in {elapsed:.1f} s ({count / elapsed:.1f} images/s)")
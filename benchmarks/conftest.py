@@ -0,0 +1,84 @@
+"""
+Benchmark suite for the fuzzy model, the image pipeline and the data layer.
+
+Run from the repository root after installing benchmarks/requirements.txt::
+
+    python -m pytest benchmarks
+
+Every benchmark is warmed up before it is timed, so imports, lazily built
+tables and file caches do not land in the measured rounds. Runs are compared
+only against a baseline recorded on this machine, which lives in the
+untracked LOCAL_BASELINE_DIR. Record one, and again after an intended change,
+with::
+
+    python -m pytest benchmarks --benchmark-save=baseline
+
+Once it exists every run is compared with the latest saved run, and a
+benchmark whose fastest round is more than REGRESSION_THRESHOLD slower fails
+the run. benchmarks/baselines holds the reference results of the machine the
+suite was written on; compare with them explicitly, keeping in mind that they
+come from different hardware::
+
+    python -m pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-compare='*/0001'
+
+Everything runs offline on the repository's CSV and geojson files and on
+synthetic data from synthetic.py.
+"""
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Runs saved on this machine; never committed, so a comparison is always against the user's own run
+LOCAL_BASELINE_DIR = os.path.join(REPO_ROOT, ".cache", "benchmarks")
+
+# Slowdown of a benchmark's fastest round against the baseline that fails the run.
+# The fastest round is the statistic least disturbed by other load, but shared
+# runners can drift by almost that much between runs, so only a doubling fails by
+# default; tighten it on a quiet machine with e.g. --benchmark-compare-fail=min:15%
+REGRESSION_THRESHOLD = "min:100%"
+
+# The app modules live at the repository root and read their data files relative to it
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+
+def pytest_configure(config):
+    # Runs before pytest-benchmark reads its options, so explicit command line options still win
+    if not hasattr(config.option, "benchmark_storage"):
+        return
+    from pytest_benchmark.utils import get_machine_id, parse_compare_fail
+
+    # A cold first round (imports, page cache) would otherwise read as a regression
+    warmup_given = any(arg == "--benchmark-warmup" or arg.startswith("--benchmark-warmup=")
+                       for arg in config.invocation_params.args)
+    if not warmup_given:
+        config.option.benchmark_warmup = True
+
+    # The generic machine id (platform and Python version) matches very different hardware,
+    # so only runs saved in the untracked local directory are compared automatically
+    if config.option.benchmark_storage != "file://./.benchmarks":
+        return
+    config.option.benchmark_storage = "file://" + LOCAL_BASELINE_DIR
+    machine_dir = os.path.join(LOCAL_BASELINE_DIR, get_machine_id())
+    has_baseline = os.path.isdir(machine_dir) and any(name.endswith(".json") for name in os.listdir(machine_dir))
+    saving = config.option.benchmark_save or config.option.benchmark_autosave
+    if has_baseline and not saving and not config.option.benchmark_compare:
+        config.option.benchmark_compare = True
+        if not config.option.benchmark_compare_fail:
+            config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+@pytest.fixture(scope="session")
+def fuzzy_engine():
+    from fuzzy_engine import get_fuzzy_engine
+
+    return get_fuzzy_engine()
+
+
+@pytest.fixture(scope="session")
+def fuzzy_lookup():
+    from fuzzy_lookup import get_fuzzy_lookup
+
+    return get_fuzzy_lookup()
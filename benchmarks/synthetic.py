@@ -0,0 +1,140 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from landslide_scoring import SLOPE_STEEPNESS_LEVELS, VEGETATION_COVERAGE_LEVELS
+from water_datasets import AREA_DTYPE, MONTH_ORDER
+
+# Image sizes of the detection benchmarks: phone previews up to full-frame camera photos
+IMAGE_SIZES = {"1MP": (1000, 1000), "12MP": (3000, 4000), "24MP": (4000, 6000)}
+
+
+def synthetic_site_inputs(n_sites, seed=0):
+    """
+    Generates fuzzy inputs for many slope sites, drawn from the landslide form's options.
+
+    Returns:
+    - dict: One float array of n_sites values per fuzzy input.
+    """
+    rng = np.random.default_rng(seed)
+
+    def installed(share):
+        return np.where(rng.random(n_sites) < share, 100.0, 0.0)
+
+    return {
+        'rainfall': rng.gamma(4.0, 75.0, n_sites).clip(0, 1000),
+        'soil_moisture': rng.uniform(0, 100, n_sites),
+        'slope_steepness': rng.choice(list(SLOPE_STEEPNESS_LEVELS.values()), n_sites).astype(np.float64),
+        'human_activity': installed(0.4),
+        'historical_landslides': installed(0.2),
+        'soil_type': rng.integers(0, 6, n_sites).astype(np.float64),
+        'drainage_system': rng.choice([25.0, 50.0, 75.0], n_sites),
+        'vegetated_surface': rng.choice(list(VEGETATION_COVERAGE_LEVELS.values()), n_sites).astype(np.float64),
+        'slope_nature': installed(0.5),
+        'soil_nailing': installed(0.1),
+        'slope_netting': installed(0.2),
+        'gabion_wall': installed(0.05),
+        'rubble_wall': installed(0.05),
+    }
+
+
+def synthetic_slope_image(height, width, seed=0):
+    """
+    Draws a slope photo stand-in: a shaded, noisy hillside with a netting grid
+    and a few wall blocks, so edge and contour detection has realistic work.
+
+    Returns:
+    - np.ndarray: uint8 RGB image of shape (height, width, 3).
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    rows = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    cols = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    shade = 90 + 80 * rows + 30 * np.sin(6 * cols + 3 * rows)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    for channel, tint in enumerate((0.8, 1.0, 0.6)):
+        image[..., channel] = np.clip(shade * tint + rng.normal(0, 12, (height, width)), 0, 255)
+
+    # Netting over the upper half, scaled with the image
+    spacing = max(width // 60, 8)
+    thickness = max(width // 1000, 1)
+    for x in range(0, width, spacing):
+        cv2.line(image, (x, 0), (x + height // 4, height // 2), (40, 40, 40), thickness)
+        cv2.line(image, (x, 0), (x - height // 4, height // 2), (40, 40, 40), thickness)
+
+    # Gabion blocks along the toe of the slope
+    block = max(width // 12, 16)
+    for x in range(0, width - block, block + block // 4):
+        top = int(height * 0.75 + rng.integers(-block // 4, block // 4))
+        cv2.rectangle(image, (x, top), (x + block, top + block // 2), (120, 110, 100), -1)
+        cv2.rectangle(image, (x, top), (x + block, top + block // 2), (30, 30, 30), thickness * 2)
+    return image
+
+
+def synthetic_water_usage(n_years, seed=0):
+    """
+    Generates a water_data.csv style table with one row per month, area and year.
+
+    Returns:
+    - pd.DataFrame: Columns Month, Area, Weather, Festival, No_Visitor_Area,
+      No_Residence_Area and Avg_Usage_Litre, as plain strings and integers like the CSV.
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = n_years * len(MONTH_ORDER) * len(AREA_DTYPE.categories)
+    month = np.tile(np.repeat(np.arange(len(MONTH_ORDER)), len(AREA_DTYPE.categories)), n_years)
+    visitors = rng.integers(500, 5000, n_rows)
+    residents = rng.integers(100, 1500, n_rows)
+    usage = 2_000_000 + 150 * visitors + 400 * residents + rng.normal(0, 200_000, n_rows)
+    return pd.DataFrame({
+        "Month": np.asarray(MONTH_ORDER)[month],
+        "Area": np.tile(np.asarray(AREA_DTYPE.categories), n_rows // len(AREA_DTYPE.categories)),
+        "Weather": rng.choice(["Sunny", "Cloudy", "Rainy"], n_rows),
+        "Festival": rng.choice(["No", "Yes"], n_rows, p=[0.8, 0.2]),
+        "No_Visitor_Area": visitors,
+        "No_Residence_Area": residents,
+        "Avg_Usage_Litre": usage.astype(np.int64),
+    })
+
+
+def synthetic_area_totals(n_areas, seed=0):
+    """
+    Generates a V_Choropleth_Data.csv style table: an Area column and one usage column per month.
+    """
+    rng = np.random.default_rng(seed)
+    totals = pd.DataFrame(rng.integers(3_000_000, 6_000_000, (n_areas, len(MONTH_ORDER))), columns=MONTH_ORDER)
+    totals.insert(0, "Area", [f"Area {number}" for number in range(n_areas)])
+    return totals
+
+
+def write_synthetic_geojson(path, n_features, vertices_per_ring, seed=0):
+    """
+    Writes a FeatureCollection of star-shaped polygons tiling the Penang bounding box,
+    with every tenth feature a MultiPolygon with a hole, like constituency boundaries.
+    """
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(n_features)))
+    cell_lon, cell_lat = 0.6 / side, 0.5 / side
+    angles = np.linspace(0, 2 * np.pi, vertices_per_ring, endpoint=False)
+
+    def ring(center_lon, center_lat, scale):
+        radius = scale * (0.35 + 0.1 * rng.random(vertices_per_ring))
+        points = np.column_stack([center_lon + radius * cell_lon * np.cos(angles),
+                                  center_lat + radius * cell_lat * np.sin(angles)]).round(6).tolist()
+        return points + points[:1]
+
+    features = []
+    for feature_id in range(n_features):
+        center_lon = 100.15 + (feature_id % side + 0.5) * cell_lon
+        center_lat = 5.10 + (feature_id // side + 0.5) * cell_lat
+        outer = ring(center_lon, center_lat, 1.0)
+        if feature_id % 10 == 0:
+            geometry = {"type": "MultiPolygon",
+                        "coordinates": [[outer, ring(center_lon, center_lat, 0.3)[::-1]]]}
+        else:
+            geometry = {"type": "Polygon", "coordinates": [outer]}
+        features.append({"type": "Feature", "properties": {"name": f"P{feature_id:03d}"}, "geometry": geometry})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+    return path
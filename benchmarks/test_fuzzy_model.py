@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from synthetic import synthetic_site_inputs
+
+SITE_INPUTS = {'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': 15, 'human_activity': 0,
+               'historical_landslides': 0, 'soil_type': 2, 'drainage_system': 50,
+               'vegetated_surface': 45, 'slope_nature': 100}
+
+
+def test_create_fuzzy_system(benchmark):
+    from fuzzy_model import create_fuzzy_system
+
+    benchmark(create_fuzzy_system)
+
+
+def test_compile_fuzzy_engine(benchmark):
+    from fuzzy_engine import CompiledFuzzyEngine
+    from fuzzy_model import create_fuzzy_system
+
+    fuzzy_system = create_fuzzy_system()
+    benchmark(CompiledFuzzyEngine, fuzzy_system)
+
+
+def test_calculate_landslide_risk(benchmark):
+    from fuzzy_model import calculate_landslide_risk, create_fuzzy_system
+
+    fuzzy_system = create_fuzzy_system()
+    risk_score = benchmark(calculate_landslide_risk, fuzzy_system, SITE_INPUTS)
+    assert 0 <= risk_score <= 100
+
+
+def test_engine_single_site(benchmark, fuzzy_engine):
+    risk_score = benchmark(fuzzy_engine.evaluate, SITE_INPUTS)
+    assert 0 <= risk_score <= 100
+
+
+@pytest.mark.parametrize("n_sites", [1_000, 100_000])
+def test_calculate_landslide_risk_batch(benchmark, fuzzy_engine, n_sites):
+    inputs = synthetic_site_inputs(n_sites)
+    scores = benchmark(fuzzy_engine.evaluate_batch, inputs)
+    assert scores.shape == (n_sites,) and not np.isnan(scores).all()
+
+
+@pytest.mark.parametrize("n_sites", [1_000, 100_000])
+def test_lookup_table_batch(benchmark, fuzzy_lookup, n_sites):
+    inputs = synthetic_site_inputs(n_sites)
+    scores = benchmark(fuzzy_lookup.evaluate_batch, inputs)
+    assert scores.shape == (n_sites,)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from synthetic import write_synthetic_geojson
+
+
+@pytest.fixture(scope="module")
+def large_geojson(tmp_path_factory):
+    # 200 constituency-like polygons of 500 vertices each, about 3 MB
+    return str(write_synthetic_geojson(tmp_path_factory.mktemp("geo") / "synthetic.geojson", 200, 500))
+
+
+@pytest.fixture(params=["penang", "synthetic"])
+def geojson_path(request, large_geojson):
+    from geo_index import PENANG_GEOJSON_PATH
+
+    return PENANG_GEOJSON_PATH if request.param == "penang" else large_geojson
+
+
+def test_load_geojson_polygons(benchmark, geojson_path):
+    from geo_index import load_geojson_polygons
+
+    polygons = benchmark(load_geojson_polygons, geojson_path)
+    assert len(polygons["ring_offsets"]) > 1
+
+
+def test_load_polygon_cache_warm(benchmark, geojson_path, tmp_path):
+    from geo_index import load_polygon_cache
+
+    load_polygon_cache(geojson_path, cache_dir=str(tmp_path))
+    polygons = benchmark(load_polygon_cache, geojson_path, cache_dir=str(tmp_path))
+    assert len(polygons["ring_offsets"]) > 1
+
+
+def test_build_polygon_index(benchmark, geojson_path, tmp_path):
+    from geo_index import PolygonIndex, load_polygon_cache
+
+    polygons = load_polygon_cache(geojson_path, cache_dir=str(tmp_path))
+    benchmark(PolygonIndex, polygons["coords"], polygons["ring_offsets"], polygons["ring_feature"],
+              polygons["properties"])
+
+
+def test_locate_points(benchmark, geojson_path, tmp_path):
+    from geo_index import PolygonIndex, load_polygon_cache
+
+    polygons = load_polygon_cache(geojson_path, cache_dir=str(tmp_path))
+    index = PolygonIndex(polygons["coords"], polygons["ring_offsets"], polygons["ring_feature"],
+                         polygons["properties"])
+    rng = np.random.default_rng(0)
+    lon, lat = rng.uniform(100.15, 100.75, 100_000), rng.uniform(5.10, 5.60, 100_000)
+    benchmark(index.locate, lon, lat)
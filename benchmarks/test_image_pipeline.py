@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from synthetic import IMAGE_SIZES, synthetic_slope_image
+
+
+@pytest.fixture(scope="module", params=list(IMAGE_SIZES))
+def slope_image(request):
+    return synthetic_slope_image(*IMAGE_SIZES[request.param])
+
+
+def test_detect_and_annotate(benchmark, slope_image):
+    from image_processing import detect_and_annotate
+
+    # detect_and_annotate draws into its input by default; a separate buffer keeps every round on the clean image
+    out = np.empty_like(slope_image)
+    annotated = benchmark(detect_and_annotate, slope_image, out=out)
+    assert annotated.shape == slope_image.shape
+
+
+def test_decode_and_annotate_jpeg(benchmark, slope_image):
+    from batch_inspection import inspect_image_bytes
+    from image_io import encode_jpeg
+
+    data = encode_jpeg(np.ascontiguousarray(slope_image[..., ::-1]))
+    benchmark(inspect_image_bytes, data)
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from synthetic import synthetic_area_totals, synthetic_water_usage
+from water_datasets import DATASETS
+
+
+def read_dataset(spec, path=None):
+    # The uncached read that water_datasets.load_dataset does once per file version
+    return pd.read_csv(path or spec["path"], dtype=spec["dtype"], usecols=spec.get("usecols"))
+
+
+@pytest.mark.parametrize("name", ["metric", "choropleth", "reservoir", "water_usage"])
+def test_load_dataset_csv(benchmark, name):
+    frame = benchmark(read_dataset, DATASETS[name])
+    assert len(frame)
+
+
+def test_load_dataset_cached(benchmark):
+    from water_datasets import load_dataset
+
+    load_dataset("water_usage")
+    benchmark(load_dataset, "water_usage")
+
+
+@pytest.fixture(scope="module")
+def large_water_usage_csv(tmp_path_factory):
+    # 1,000 years of monthly area rows: 48,000 rows, about 2.5 MB
+    path = tmp_path_factory.mktemp("water") / "water_data.csv"
+    synthetic_water_usage(1_000).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="module")
+def large_area_totals_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp("water") / "V_Choropleth_Data.csv"
+    synthetic_area_totals(10_000).to_csv(path, index=False)
+    return path
+
+
+def test_load_large_water_usage_csv(benchmark, large_water_usage_csv):
+    frame = benchmark(read_dataset, DATASETS["water_usage"], large_water_usage_csv)
+    assert len(frame) == 48_000
+
+
+def test_load_large_area_totals_csv(benchmark, large_area_totals_csv):
+    spec = {"path": large_area_totals_csv, "dtype": {"Area": "string", **DATASETS["choropleth"]["dtype"]}}
+    frame = benchmark(read_dataset, spec)
+    assert len(frame) == 10_000
+
+
+@pytest.fixture(scope="module")
+def large_water_usage(large_water_usage_csv):
+    return read_dataset(DATASETS["water_usage"], large_water_usage_csv)
+
+
+def test_monthly_average_groupby(benchmark, large_water_usage):
+    # The per-month average of the forecasting section, straight from pandas
+    averages = benchmark(lambda: large_water_usage.groupby("Month", observed=True)["Avg_Usage_Litre"].mean())
+    assert len(averages) == 12
+
+
+def test_month_area_groupby(benchmark, large_water_usage):
+    totals = benchmark(lambda: large_water_usage.groupby(["Month", "Area"], observed=True)["Avg_Usage_Litre"]
+                       .sum().unstack())
+    assert totals.shape == (12, 4)
+
+
+def test_usage_rollup_build(benchmark, large_water_usage):
+    from usage_rollup import UsageRollup
+
+    def build():
+        rollup = UsageRollup()
+        rollup.add_usage_frame(large_water_usage)
+        return rollup
+
+    rollup = benchmark(build)
+    assert rollup.monthly_average("January") > 0
+
+
+def test_area_usage_chart_spec(benchmark):
+    from water_charts import _chart_specs, area_usage_chart_spec
+    from water_datasets import dataset_version, load_choropleth_data
+
+    area_totals = load_choropleth_data()
+    version = dataset_version("choropleth")
+
+    def build():
+        _chart_specs.clear()
+        return area_usage_chart_spec("May", area_totals, version)
+
+    benchmark(build)
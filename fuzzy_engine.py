@@ -0,0 +1,347 @@
+import threading
+
+import numpy as np
+
+from fuzzy_model import DEFAULT_INPUTS, create_fuzzy_system
+
+# Rows per defuzzification chunk; keeps the upsampled grids cache-sized
+BATCH_CHUNK_SIZE = 2048
+
+
+class CompiledFuzzyEngine:
+    """
+    Flat NumPy evaluation plan for a scikit-fuzzy control system.
+
+    The antecedent membership functions, the rule graph and the consequent
+    terms are read once from a ``ControlSystemSimulation`` and turned into
+    plain arrays plus a postfix rule program. Evaluation only touches those
+    read-only arrays, so one engine can be shared by every session and thread.
+
+    Scores follow the same Mamdani steps as ``ControlSystemSimulation.compute``:
+    interpolated fuzzification with inputs clipped to the universe, min/max for
+    AND/OR, min implication, max accumulation and centroid defuzzification over
+    the consequent universe upsampled at the cut points.
+
+    Besides ``evaluate`` and ``evaluate_batch``, the compiled plan is public
+    for scorers built on top of it such as FuzzyLookupTable: the properties
+    below describe it, and ``input_columns``, ``activations`` and
+    ``defuzzify`` run the evaluation one step at a time.
+    """
+
+    def __init__(self, fuzzy_system):
+        control_system = fuzzy_system.ctrl
+
+        # Antecedent universes and the membership arrays of every term
+        self.input_names = []
+        self._universes = []
+        self._term_columns = {}
+        self._term_sources = []
+        for antecedent in control_system.antecedents:
+            index = len(self.input_names)
+            self.input_names.append(antecedent.label)
+            self._universes.append(np.asarray(antecedent.universe, dtype=np.float64))
+            for label, term in antecedent.terms.items():
+                self._term_columns[(antecedent.label, label)] = len(self._term_sources)
+                self._term_sources.append((index, np.asarray(term.mf, dtype=np.float64)))
+
+        consequents = list(control_system.consequents)
+        if len(consequents) != 1:
+            raise ValueError("Only single-output fuzzy systems can be compiled.")
+        consequent = consequents[0]
+        if consequent.defuzzify_method != 'centroid':
+            raise ValueError("Only centroid defuzzification can be compiled.")
+        self.output_name = consequent.label
+
+        # Consequent universe, term membership arrays and their monotone runs
+        self._output_universe = np.asarray(consequent.universe, dtype=np.float64)
+        self._output_labels = list(consequent.terms.keys())
+        self._output_mfs = [np.asarray(consequent.terms[label].mf, dtype=np.float64)
+                            for label in self._output_labels]
+        self._output_runs = [self._monotone_runs(mf) for mf in self._output_mfs]
+
+        # Each rule becomes a postfix program over the term columns
+        self._rules = []
+        for rule in control_system.rules:
+            program = []
+            self._compile_term(rule.antecedent, program)
+            targets = []
+            for weighted_term in rule.consequent:
+                term = weighted_term.term
+                targets.append((self._output_labels.index(term.label), weighted_term.weight))
+            self._rules.append((program, targets))
+
+    def _compile_term(self, term, program):
+        # Already loaded by create_fuzzy_system; kept local so importing this module stays cheap
+        from skfuzzy.control.term import Term, TermAggregate
+
+        if isinstance(term, TermAggregate):
+            self._compile_term(term.term1, program)
+            if term.kind == 'not':
+                program.append(('not', None))
+            else:
+                self._compile_term(term.term2, program)
+                program.append((term.kind, None))
+        elif isinstance(term, Term):
+            program.append(('load', self._term_columns[(term.parent.label, term.label)]))
+        else:
+            raise ValueError("Unsupported rule antecedent: %r" % (term,))
+
+    def _monotone_runs(self, mf):
+        # Split a sampled membership function into non-decreasing and
+        # non-increasing stretches so a cut level can be inverted per stretch.
+        runs = []
+        start = 0
+        direction = 0
+        for i in range(1, len(mf)):
+            step = np.sign(mf[i] - mf[i - 1])
+            if step == 0 or direction == 0 or step == direction:
+                direction = direction or step
+                continue
+            runs.append((start, i))
+            start = i - 1
+            direction = step
+        runs.append((start, len(mf)))
+
+        universe = self._output_universe
+        prepared = []
+        for begin, end in runs:
+            levels = mf[begin:end]
+            points = universe[begin:end]
+            if levels[-1] < levels[0]:
+                levels = levels[::-1]
+                points = points[::-1]
+            prepared.append((levels, points))
+        return prepared
+
+    @property
+    def input_universes(self):
+        """
+        dict: Universe array of every antecedent, keyed by input name in input_names order.
+        """
+        return dict(zip(self.input_names, self._universes))
+
+    @property
+    def term_memberships(self):
+        """
+        list: (input index, membership array over that input's universe) of every
+        antecedent term, indexed by the term columns the rule programs load.
+        """
+        return self._term_sources
+
+    @property
+    def rule_programs(self):
+        """
+        list: One (program, targets) pair per rule. The program is a postfix list of
+        ('load', term column), ('not', None), ('and', None) and ('or', None)
+        steps; targets lists the (output term index, weight) pairs it activates.
+        """
+        return self._rules
+
+    @property
+    def output_universe(self):
+        """
+        np.ndarray: Universe of the consequent.
+        """
+        return self._output_universe
+
+    @property
+    def output_terms(self):
+        """
+        dict: Membership array of every consequent term, keyed by label in output term index order.
+        """
+        return dict(zip(self._output_labels, self._output_mfs))
+
+    def input_columns(self, inputs):
+        """
+        Reads one clipped float column per antecedent, filling omitted DEFAULT_INPUTS.
+
+        Parameters:
+        - inputs: A DataFrame, structured array or mapping with one column per antecedent.
+
+        Returns:
+        - list: One 1-D array per name in input_names (length 1 for defaulted inputs).
+        """
+        # Structured arrays expose their columns through dtype.names
+        available = getattr(getattr(inputs, 'dtype', None), 'names', None)
+        if available is None:
+            available = inputs.keys()
+
+        columns = []
+        for name, universe in zip(self.input_names, self._universes):
+            if name in available:
+                values = np.asarray(inputs[name], dtype=np.float64).ravel()
+            elif name in DEFAULT_INPUTS:
+                values = np.array([DEFAULT_INPUTS[name]], dtype=np.float64)
+            else:
+                raise ValueError("All antecedents must have input values!")
+            columns.append(np.clip(values, universe[0], universe[-1]))
+        return columns
+
+    def activations(self, columns):
+        """
+        Runs the rule programs over fuzzified input columns.
+
+        Parameters:
+        - columns: Output of input_columns, broadcast to a common length or not.
+
+        Returns:
+        - list: Activation array of every output term, None for terms no rule targets.
+        """
+        memberships = [np.interp(columns[index], self._universes[index], mf)
+                       for index, mf in self._term_sources]
+
+        activations = [None] * len(self._output_labels)
+        for program, targets in self._rules:
+            stack = []
+            for op, column in program:
+                if op == 'load':
+                    stack.append(memberships[column])
+                elif op == 'not':
+                    stack.append(1.0 - stack.pop())
+                else:
+                    right = stack.pop()
+                    left = stack.pop()
+                    stack.append(np.fmin(left, right) if op == 'and' else np.fmax(left, right))
+            firing = stack.pop()
+            for output_index, weight in targets:
+                value = firing * weight
+                current = activations[output_index]
+                activations[output_index] = value if current is None else np.fmax(current, value)
+        return activations
+
+    def defuzzify(self, activations, size):
+        """
+        Centroid of the consequent terms clipped at their activations.
+
+        Parameters:
+        - activations: One activation per output term (scalar or array of size, or None if not fired).
+        - size: Number of rows to score.
+
+        Returns:
+        - np.ndarray: One score per row, NaN where every activation is zero.
+        """
+        universe = self._output_universe
+        fired = [(index, np.broadcast_to(np.asarray(cut, dtype=np.float64), (size,)))
+                 for index, cut in enumerate(activations) if cut is not None]
+
+        # Upsample the universe with the points where each term meets its cut
+        extra = [np.interp(cut, levels, points)
+                 for index, cut in fired
+                 for levels, points in self._output_runs[index]]
+        grid = np.broadcast_to(universe, (size, len(universe)))
+        if extra:
+            grid = np.concatenate([grid, np.stack(extra, axis=1)], axis=1)
+            grid.sort(axis=1)
+
+        # Clip each term at its activation and accumulate with max
+        output_mf = np.zeros(grid.shape, dtype=np.float64)
+        for index, cut in fired:
+            clipped = np.interp(grid, universe, self._output_mfs[index])
+            np.minimum(clipped, cut[:, None], out=clipped)
+            np.maximum(output_mf, clipped, out=output_mf)
+
+        # Exact centroid of the piecewise linear output membership
+        x1, x2 = grid[:, :-1], grid[:, 1:]
+        y1, y2 = output_mf[:, :-1], output_mf[:, 1:]
+        width = x2 - x1
+        area = 0.5 * width * (y1 + y2)
+        moment = area * x1 + width * width * (y1 + 2.0 * y2) / 6.0
+        total_area = area.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = moment.sum(axis=1) / total_area
+        scores[total_area <= 0] = np.nan
+        return scores
+
+    def evaluate(self, inputs):
+        """
+        Calculates the landslide risk score for one set of inputs.
+
+        Parameters:
+        - inputs: A dictionary of input values, as passed to calculate_landslide_risk.
+
+        Returns:
+        - float: The defuzzified risk score.
+        """
+        for key in inputs:
+            if key not in self.input_names:
+                raise ValueError("Unexpected input: " + key)
+        columns = self.input_columns(inputs)
+        score = self.defuzzify(self.activations(columns), 1)[0]
+        if np.isnan(score):
+            raise ValueError("Crisp output cannot be calculated, likely because the "
+                             "system is too sparse.")
+        return float(score)
+
+    def evaluate_batch(self, inputs):
+        """
+        Calculates landslide risk scores for many sites at once.
+
+        Parameters:
+        - inputs: A DataFrame, structured array or mapping with one column per
+          antecedent. Extra columns are ignored.
+
+        Returns:
+        - np.ndarray: One risk score per row, NaN where no rule fires.
+        """
+        columns = np.broadcast_arrays(*self.input_columns(inputs))
+        size = columns[0].shape[0]
+        activations = self.activations(columns)
+
+        scores = np.empty(size, dtype=np.float64)
+        for start in range(0, size, BATCH_CHUNK_SIZE):
+            stop = min(start + BATCH_CHUNK_SIZE, size)
+            chunk = [None if cut is None else cut[start:stop] for cut in activations]
+            scores[start:stop] = self.defuzzify(chunk, stop - start)
+        return scores
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_fuzzy_engine():
+    """
+    Returns the process-wide compiled landslide engine, building it on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = CompiledFuzzyEngine(create_fuzzy_system())
+    return _engine
+
+
+def calculate_landslide_risk_batch(inputs):
+    """
+    Vectorized counterpart of calculate_landslide_risk for many slope sites.
+
+    Parameters:
+    - inputs: A DataFrame or structured array with columns named after the
+      fuzzy inputs (rainfall, soil_moisture, slope_steepness, ...).
+
+    Returns:
+    - np.ndarray: The calculated landslide risk score of every row.
+    """
+    return get_fuzzy_engine().evaluate_batch(inputs)
+
+
+if __name__ == "__main__":
+    # Compare the compiled engine against the scikit-fuzzy simulation
+    from fuzzy_model import calculate_landslide_risk
+
+    rng = np.random.default_rng(0)
+    engine = get_fuzzy_engine()
+    fuzzy_system = create_fuzzy_system()
+    batch = {name: rng.uniform(universe[0], universe[-1], 500)
+             for name, universe in engine.input_universes.items()}
+    batch_scores = calculate_landslide_risk_batch(batch)
+    worst = 0.0
+    for row in range(500):
+        inputs = {name: float(values[row]) for name, values in batch.items()}
+        try:
+            expected = calculate_landslide_risk(fuzzy_system, inputs)
+        except ValueError:
+            continue
+        worst = max(worst, abs(engine.evaluate(inputs) - expected),
+                    abs(batch_scores[row] - expected))
+    print(f"Maximum deviation from scikit-fuzzy: {worst:.3e}")
@@ -0,0 +1,285 @@
+import hashlib
+import itertools
+import os
+import threading
+from bisect import bisect_right
+
+import numpy as np
+
+from fuzzy_engine import BATCH_CHUNK_SIZE, get_fuzzy_engine
+from fuzzy_model import DEFAULT_INPUTS
+
+LOOKUP_TABLE_DIR = os.path.join(".cache", "fuzzy_lookup")
+
+# Grid points per activation axis. They sit at (i / (levels - 1))**2, dense near 0,
+# where the centroid changes fastest relative to the activations.
+ACTIVATION_LEVELS = 65
+
+
+def _breakpoints(universe, mf):
+    # Sampled membership functions are piecewise linear; keep only the corners
+    slope = np.diff(mf) / np.diff(universe)
+    corners = np.flatnonzero(~np.isclose(slope[1:], slope[:-1])) + 1
+    keep = np.r_[0, corners, len(universe) - 1]
+    return universe[keep].tolist(), mf[keep].tolist()
+
+
+def _interpolate(xs, ys, x):
+    # np.interp for one float over a short breakpoint list
+    if x <= xs[0]:
+        return ys[0]
+    if x >= xs[-1]:
+        return ys[-1]
+    i = bisect_right(xs, x) - 1
+    return ys[i] + (ys[i + 1] - ys[i]) * (x - xs[i]) / (xs[i + 1] - xs[i])
+
+
+def activation_nodes(levels):
+    return np.linspace(0.0, 1.0, levels) ** 2
+
+
+class FuzzyLookupTable:
+    """
+    Precomputed response surface of a compiled fuzzy engine.
+
+    The defuzzified score depends on the inputs only through the activation
+    of each consequent term (safe, moderate, high for the landslide model),
+    and that final centroid step is the expensive part of every evaluation.
+    The centroid is therefore tabulated once over a grid of activations,
+    saved as ``.npy`` and memory-mapped; scoring fuzzifies the inputs exactly
+    with breakpoint-compressed membership functions, runs the rule program
+    and reads the table with multilinear interpolation.
+
+    Activations inside the grid cell at the origin, where the centroid is not
+    continuous, are defuzzified exactly instead. ``evaluate`` and
+    ``evaluate_batch`` match CompiledFuzzyEngine, so either can be used to
+    score. Run this module to report the interpolation error.
+    """
+
+    def __init__(self, engine, table):
+        self.engine = engine
+        self.table = table
+        self.input_names = engine.input_names
+        self.levels = table.shape[0]
+        self.nodes = activation_nodes(self.levels)
+        self._node_list = self.nodes.tolist()
+        self._flat = np.asarray(table).reshape(-1)
+        self._strides = [self.levels ** (table.ndim - 1 - axis) for axis in range(table.ndim)]
+
+        # Scalar evaluation plan: breakpoints of every term the rules read
+        self._rules = engine.rule_programs
+        self._term_count = len(engine.term_memberships)
+        universes = list(engine.input_universes.values())
+        used = sorted({column for program, _ in self._rules for op, column in program if op == 'load'})
+        self._terms = []
+        for column in used:
+            index, mf = engine.term_memberships[column]
+            self._terms.append((column, index, *_breakpoints(universes[index], mf)))
+        self._corners = list(itertools.product((0, 1), repeat=table.ndim))
+
+    @classmethod
+    def build(cls, engine, levels=ACTIVATION_LEVELS):
+        """
+        Tabulates the engine's defuzzified output over a levels^n grid of term activations.
+        """
+        nodes = activation_nodes(levels)
+        n_outputs = len(engine.output_terms)
+        grid = [axis.ravel() for axis in np.meshgrid(*[nodes] * n_outputs, indexing='ij')]
+        size = grid[0].size
+        table = np.empty(size, dtype=np.float64)
+        for start in range(0, size, BATCH_CHUNK_SIZE):
+            stop = min(start + BATCH_CHUNK_SIZE, size)
+            table[start:stop] = engine.defuzzify([axis[start:stop] for axis in grid], stop - start)
+        return table.reshape((levels,) * n_outputs)
+
+    def _scalar_activations(self, inputs):
+        values = []
+        for name in self.input_names:
+            if name in inputs:
+                value = float(inputs[name])
+            elif name in DEFAULT_INPUTS:
+                value = float(DEFAULT_INPUTS[name])
+            else:
+                raise ValueError("All antecedents must have input values!")
+            values.append(value)
+        memberships = [0.0] * self._term_count
+        for column, index, xs, ys in self._terms:
+            memberships[column] = _interpolate(xs, ys, values[index])
+
+        activations = [0.0] * self.table.ndim
+        for program, targets in self._rules:
+            stack = []
+            for op, column in program:
+                if op == 'load':
+                    stack.append(memberships[column])
+                elif op == 'not':
+                    stack.append(1.0 - stack.pop())
+                else:
+                    right = stack.pop()
+                    left = stack.pop()
+                    stack.append(min(left, right) if op == 'and' else max(left, right))
+            firing = stack.pop()
+            for output_index, weight in targets:
+                activations[output_index] = max(activations[output_index], firing * weight)
+        return activations
+
+    def evaluate(self, inputs):
+        """
+        Calculates the risk score for one set of inputs from the table.
+
+        Parameters:
+        - inputs: A dictionary of input values, as passed to calculate_landslide_risk.
+
+        Returns:
+        - float: The interpolated risk score.
+        """
+        for key in inputs:
+            if key not in self.input_names:
+                raise ValueError("Unexpected input: " + key)
+        activations = self._scalar_activations(inputs)
+        nodes = self._node_list
+        if max(activations) < nodes[1]:
+            return self.engine.evaluate(inputs)
+
+        offset = 0
+        fractions = []
+        for activation, stride in zip(activations, self._strides):
+            cell = min(int(activation ** 0.5 * (self.levels - 1)), self.levels - 2)
+            offset += cell * stride
+            fractions.append((activation - nodes[cell]) / (nodes[cell + 1] - nodes[cell]))
+
+        score = 0.0
+        for corner in self._corners:
+            weight = 1.0
+            index = offset
+            for bit, fraction, stride in zip(corner, fractions, self._strides):
+                weight *= fraction if bit else 1.0 - fraction
+                index += bit * stride
+            if weight:
+                score += weight * self._flat[index]
+        return float(score)
+
+    def evaluate_batch(self, inputs):
+        """
+        Calculates risk scores for many rows at once from the table.
+
+        Parameters:
+        - inputs: A DataFrame, structured array or mapping with one column per antecedent.
+
+        Returns:
+        - np.ndarray: One risk score per row, NaN where no rule fires.
+        """
+        engine = self.engine
+        columns = np.broadcast_arrays(*engine.input_columns(inputs))
+        size = columns[0].shape[0]
+        activations = [np.zeros(size) if cut is None else np.broadcast_to(cut, (size,))
+                       for cut in engine.activations(columns)]
+
+        offset = np.zeros(size, dtype=np.int64)
+        fractions = []
+        for activation, stride in zip(activations, self._strides):
+            cell = np.minimum((np.sqrt(activation) * (self.levels - 1)).astype(np.int64), self.levels - 2)
+            offset += cell * stride
+            fractions.append((activation - self.nodes[cell]) / (self.nodes[cell + 1] - self.nodes[cell]))
+
+        scores = np.zeros(size)
+        for corner in self._corners:
+            weight = np.ones(size)
+            index = offset.copy()
+            for bit, fraction, stride in zip(corner, fractions, self._strides):
+                weight *= fraction if bit else 1.0 - fraction
+                index += bit * stride
+            scores += weight * np.nan_to_num(self._flat[index])
+
+        # The cell at the origin holds the undefined all-zero corner; defuzzify it exactly
+        near_origin = np.flatnonzero(np.max(activations, axis=0) < self.nodes[1])
+        if near_origin.size:
+            scores[near_origin] = engine.defuzzify([cut[near_origin] for cut in activations], near_origin.size)
+        return scores
+
+
+def _table_key(engine, levels):
+    # Only the consequent shapes the table; rules and antecedents can change freely
+    digest = hashlib.sha256(str(levels).encode())
+    digest.update(np.ascontiguousarray(engine.output_universe).tobytes())
+    for label, mf in engine.output_terms.items():
+        digest.update(label.encode())
+        digest.update(np.ascontiguousarray(mf).tobytes())
+    return digest.hexdigest()
+
+
+def load_or_build_lookup(engine=None, levels=ACTIVATION_LEVELS, cache_dir=LOOKUP_TABLE_DIR):
+    """
+    Memory-maps the lookup table for the engine's consequent, building and saving it first if needed.
+    """
+    engine = engine or get_fuzzy_engine()
+    path = os.path.join(cache_dir, f"centroid-{levels}-{_table_key(engine, levels)[:16]}.npy")
+    if not os.path.exists(path):
+        table = FuzzyLookupTable.build(engine, levels)
+        os.makedirs(cache_dir, exist_ok=True)
+        scratch = path + f".{os.getpid()}.tmp.npy"
+        np.save(scratch, table)
+        os.replace(scratch, path)
+    return FuzzyLookupTable(engine, np.load(path, mmap_mode='r'))
+
+
+_lookup = None
+_lookup_lock = threading.Lock()
+
+
+def get_fuzzy_lookup():
+    """
+    Returns the process-wide lookup table for the landslide engine, building it on first use.
+    """
+    global _lookup
+    if _lookup is None:
+        with _lookup_lock:
+            if _lookup is None:
+                _lookup = load_or_build_lookup()
+    return _lookup
+
+
+if __name__ == "__main__":
+    # Report the lookup table's interpolation error against calculate_landslide_risk
+    import time
+
+    from fuzzy_model import calculate_landslide_risk, create_fuzzy_system
+
+    rng = np.random.default_rng(0)
+    started = time.perf_counter()
+    lookup = get_fuzzy_lookup()
+    print(f"Loaded {lookup.levels}^{lookup.table.ndim} table in {time.perf_counter() - started:.2f} s")
+    engine = lookup.engine
+
+    # Against scikit-fuzzy itself on random inputs
+    fuzzy_system = create_fuzzy_system()
+    worst = 0.0
+    evaluated = 0
+    for _ in range(2000):
+        inputs = {name: float(rng.uniform(universe[0], universe[-1]))
+                  for name, universe in engine.input_universes.items()}
+        try:
+            expected = calculate_landslide_risk(fuzzy_system, inputs)
+        except ValueError:
+            continue
+        worst = max(worst, abs(lookup.evaluate(inputs) - expected))
+        evaluated += 1
+    print(f"Maximum error against calculate_landslide_risk ({evaluated} inputs): {worst:.3e}")
+
+    # Against the exact compiled engine over many more inputs
+    batch = {name: rng.uniform(universe[0], universe[-1], 200_000)
+             for name, universe in engine.input_universes.items()}
+    error = np.abs(lookup.evaluate_batch(batch) - engine.evaluate_batch(batch))
+    print(f"Maximum / mean error against the exact engine ({error.size:,} inputs): "
+          f"{np.nanmax(error):.3e} / {np.nanmean(error):.3e}")
+
+    inputs = {name: float(values[0]) for name, values in batch.items()}
+    started = time.perf_counter()
+    for _ in range(10_000):
+        lookup.evaluate(inputs)
+    lookup_us = (time.perf_counter() - started) / 10_000 * 1e6
+    started = time.perf_counter()
+    for _ in range(1_000):
+        engine.evaluate(inputs)
+    engine_us = (time.perf_counter() - started) / 1_000 * 1e6
+    print(f"Single evaluation: {lookup_us:.1f} us from the table, {engine_us:.1f} us exact")
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Stabilization measure inputs may be omitted: they default to none installed or detected
+DEFAULT_INPUTS = {'soil_nailing': 0, 'slope_netting': 0, 'gabion_wall': 0, 'rubble_wall': 0}
+
+def create_fuzzy_system():
+    # scikit-fuzzy pulls in matplotlib and scipy (about a second), so it is only
+    # imported once a fuzzy system is actually built
+    import skfuzzy as fuzz
+    from skfuzzy import control as ctrl
+
+    # Antecedent/Consequent objects hold universe variables and membership functions
+    rainfall = ctrl.Antecedent(np.arange(0, 1001, 1), 'rainfall')
+    soil_moisture = ctrl.Antecedent(np.arange(0, 101, 1), 'soil_moisture')
+    slope_steepness = ctrl.Antecedent(np.arange(0, 101, 1), 'slope_steepness')
+    human_activity = ctrl.Antecedent(np.arange(0, 101, 1), 'human_activity')
+    historical_landslides = ctrl.Antecedent(np.arange(0, 101, 1), 'historical_landslides')
+    drainage_system = ctrl.Antecedent(np.arange(0, 101, 1), 'drainage_system')
+    vegetated_surface = ctrl.Antecedent(np.arange(0, 101, 1), 'vegetated_surface')
+    soil_nailing = ctrl.Antecedent(np.arange(0, 101, 1), 'soil_nailing')
+    slope_netting = ctrl.Antecedent(np.arange(0, 101, 1), 'slope_netting')
+    gabion_wall = ctrl.Antecedent(np.arange(0, 101, 1), 'gabion_wall')
+    rubble_wall = ctrl.Antecedent(np.arange(0, 101, 1), 'rubble_wall')
+    soil_type = ctrl.Antecedent(np.arange(0, 6, 1), 'soil_type')
+    slope_nature = ctrl.Antecedent(np.arange(0, 101, 1), 'slope_nature')
+    
+    landslide_risk = ctrl.Consequent(np.arange(0, 101, 1), 'landslide_risk')
+    
+    # Auto-membership function population
+    rainfall.automf(3)
+    soil_moisture.automf(3)
+    slope_steepness.automf(3)
+    human_activity.automf(3)
+    historical_landslides.automf(3)
+    drainage_system.automf(3)
+    vegetated_surface.automf(3)
+    soil_nailing.automf(3)
+    slope_netting.automf(3)
+    gabion_wall.automf(3)
+    rubble_wall.automf(3)
+    
+    # Custom membership functions
+    soil_type['clay'] = fuzz.trimf(soil_type.universe, [0, 0, 1])
+    soil_type['sand'] = fuzz.trimf(soil_type.universe, [1, 1, 2])
+    soil_type['loam'] = fuzz.trimf(soil_type.universe, [2, 2, 3])
+    soil_type['peat'] = fuzz.trimf(soil_type.universe, [3, 3, 4])
+    soil_type['chalk'] = fuzz.trimf(soil_type.universe, [4, 4, 5])
+    soil_type['silt'] = fuzz.trimf(soil_type.universe, [5, 5, 5])
+    
+    slope_nature['natural'] = fuzz.trimf(slope_nature.universe, [0, 0, 50])
+    slope_nature['engineered'] = fuzz.trimf(slope_nature.universe, [50, 100, 100])
+    
+    landslide_risk['safe'] = fuzz.trimf(landslide_risk.universe, [0, 0, 30])
+    landslide_risk['moderate'] = fuzz.trimf(landslide_risk.universe, [20, 50, 80])
+    landslide_risk['high'] = fuzz.trimf(landslide_risk.universe, [70, 100, 100])
+    
+    # Rules definition
+    rules = [
+        ctrl.Rule(antecedent=((rainfall['poor'] & soil_moisture['poor']) |
+                              (slope_steepness['poor'] & vegetated_surface['good']) |
+                              (human_activity['good'] & historical_landslides['good'])),
+                  consequent=landslide_risk['high']),
+        ctrl.Rule(antecedent=((rainfall['average'] & drainage_system['average']) |
+                              (soil_type['clay'] & slope_nature['natural'])),
+                  consequent=landslide_risk['moderate']),
+        ctrl.Rule(antecedent=((rainfall['good'] & soil_moisture['good']) |
+                              (vegetated_surface['poor'] & slope_steepness['good'])),
+                  consequent=landslide_risk['safe'])
+    ]
+
+    # Slope stabilization lowers the risk: any measure rated 'good' (from 50, fully at 100) activates
+    # 'safe', as favourable weather and ground cover do above. The rule does not fire while every
+    # measure is below 50, so a site without measures scores exactly as under the three rules above
+    rules.append(ctrl.Rule(antecedent=(soil_nailing['good'] | slope_netting['good'] |
+                                       gabion_wall['good'] | rubble_wall['good']),
+                           consequent=landslide_risk['safe']))
+    
+    # Control System Creation and Simulation
+    landslide_ctrl = ctrl.ControlSystem(rules)
+    landslide_simulation = ctrl.ControlSystemSimulation(landslide_ctrl)
+    
+    return landslide_simulation
+
+def calculate_landslide_risk(fuzzy_system, inputs):
+    """
+    Calculates landslide risk using the provided fuzzy system and inputs.
+    
+    Parameters:
+    - fuzzy_system: The fuzzy control system simulation instance.
+    - inputs: A dictionary of input values for the fuzzy system. Inputs in
+      DEFAULT_INPUTS may be left out.
+
+    Returns:
+    - float: The calculated landslide risk score.
+    """
+    for key, value in {**DEFAULT_INPUTS, **inputs}.items():
+        fuzzy_system.input[key] = value
+    fuzzy_system.compute()
+    return fuzzy_system.output['landslide_risk']
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+PENANG_GEOJSON_PATH = "Penang.geojson"
+GEO_CACHE_DIR = os.path.join(".cache", "geo")
+
+# Target number of polygon edges per latitude band of the index
+EDGES_PER_BAND = 8
+
+
+def load_geojson_polygons(path=PENANG_GEOJSON_PATH):
+    """
+    Flattens the (Multi)Polygon features of a geojson file into arrays.
+
+    Parameters:
+    - path: Path to the geojson file.
+
+    Returns:
+    - dict: ``coords`` (float64, shape (n, 2) lon/lat vertices), ``ring_offsets``
+      (int64, start of every ring in ``coords`` plus a final end offset),
+      ``ring_feature`` (int32, owning feature of every ring) and ``properties``
+      (DataFrame with one row of properties per feature).
+    """
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+
+    rings = []
+    ring_feature = []
+    properties = []
+    for feature_id, feature in enumerate(collection["features"]):
+        properties.append(feature.get("properties") or {})
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"]
+        if geometry["type"] == "Polygon":
+            polygons = [polygons]
+        for polygon in polygons:
+            for ring in polygon:
+                rings.append(np.asarray(ring, dtype=np.float64)[:, :2])
+                ring_feature.append(feature_id)
+
+    ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+    ring_offsets[1:] = np.cumsum([len(ring) for ring in rings])
+    return {
+        "coords": np.concatenate(rings) if rings else np.empty((0, 2)),
+        "ring_offsets": ring_offsets,
+        "ring_feature": np.asarray(ring_feature, dtype=np.int32),
+        "properties": pd.DataFrame(properties),
+    }
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_polygon_cache(polygons, target):
+    # Build in a scratch directory and rename, so readers never see a partial cache
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+    scratch = tempfile.mkdtemp(dir=parent)
+    for name in ("coords", "ring_offsets", "ring_feature"):
+        np.save(os.path.join(scratch, name + ".npy"), np.ascontiguousarray(polygons[name]))
+
+    # Properties are stored column by column; text becomes fixed-width unicode
+    columns = []
+    for position, column in enumerate(polygons["properties"].columns):
+        values = polygons["properties"][column].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        np.save(os.path.join(scratch, f"property_{position}.npy"), values, allow_pickle=False)
+        columns.append(column)
+    with open(os.path.join(scratch, "columns.json"), "w", encoding="utf-8") as f:
+        json.dump(columns, f)
+
+    try:
+        os.rename(scratch, target)
+    except OSError:
+        # Another process published the same cache first
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def load_polygon_cache(path=PENANG_GEOJSON_PATH, cache_dir=GEO_CACHE_DIR):
+    """
+    Loads geojson polygons through a preparsed, memory-mapped binary cache.
+
+    The first call for a given file content parses the geojson and writes flat
+    ``.npy`` arrays under ``cache_dir/<name>-<sha256>``. Later calls, from any
+    rerun or worker process, map those files read-only so the vertex data is
+    shared through the page cache instead of being rebuilt as Python lists.
+    Editing the source file changes its hash and therefore the cache entry;
+    older entries for the same file are removed.
+
+    Returns:
+    - dict: Same layout as load_geojson_polygons, with read-only memory-mapped
+      arrays and the per-feature properties as a columnar DataFrame.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    target = os.path.join(cache_dir, f"{stem}-{_file_sha256(path)}")
+    if not os.path.isdir(target):
+        _write_polygon_cache(load_geojson_polygons(path), target)
+        for entry in os.listdir(cache_dir):
+            stale = os.path.join(cache_dir, entry)
+            if entry.startswith(stem + "-") and stale != target:
+                shutil.rmtree(stale, ignore_errors=True)
+
+    polygons = {name: np.load(os.path.join(target, name + ".npy"), mmap_mode="r")
+                for name in ("coords", "ring_offsets", "ring_feature")}
+    with open(os.path.join(target, "columns.json"), encoding="utf-8") as f:
+        columns = json.load(f)
+    polygons["properties"] = pd.DataFrame({
+        column: np.load(os.path.join(target, f"property_{position}.npy"), mmap_mode="r")
+        for position, column in enumerate(columns)
+    })
+    return polygons
+
+
+class PolygonIndex:
+    """
+    Grid-bucket index answering "which feature contains this point".
+
+    Every polygon edge is bucketed into the latitude bands it spans. A lookup
+    only casts its ray against the edges of its own band, so the cost per point
+    depends on the local edge density rather than on the number of polygons.
+    Rings of the same feature are combined with even-odd parity, which handles
+    multipolygons and holes.
+    """
+
+    def __init__(self, coords, ring_offsets, ring_feature, properties=None):
+        self.properties = properties if properties is not None else pd.DataFrame()
+        self.n_features = int(ring_feature.max()) + 1 if len(ring_feature) else 0
+
+        # Build the edge list (x1, y1) -> (x2, y2) of every ring
+        starts, ends, owners = [], [], []
+        for ring, (begin, end) in enumerate(zip(ring_offsets[:-1], ring_offsets[1:])):
+            ring_coords = coords[begin:end]
+            if len(ring_coords) < 2:
+                continue
+            starts.append(ring_coords)
+            ends.append(np.roll(ring_coords, -1, axis=0))
+            owners.append(np.full(len(ring_coords), ring_feature[ring], dtype=np.int32))
+        starts = np.concatenate(starts)
+        ends = np.concatenate(ends)
+        owners = np.concatenate(owners)
+
+        # Horizontal edges never cross a horizontal ray
+        keep = starts[:, 1] != ends[:, 1]
+        self._x1, self._y1 = starts[keep, 0], starts[keep, 1]
+        self._x2, self._y2 = ends[keep, 0], ends[keep, 1]
+        self._owner = owners[keep]
+
+        self.bounds = (coords[:, 0].min(), coords[:, 1].min(),
+                       coords[:, 0].max(), coords[:, 1].max())
+
+        # Bucket edges into latitude bands (CSR layout)
+        self._n_bands = max(1, len(self._owner) // EDGES_PER_BAND)
+        self._y_min = self.bounds[1]
+        self._band_height = (self.bounds[3] - self.bounds[1]) / self._n_bands or 1.0
+        low = self._band_of(np.minimum(self._y1, self._y2))
+        high = self._band_of(np.maximum(self._y1, self._y2))
+        spans = high - low + 1
+        edge_ids = np.repeat(np.arange(len(self._owner)), spans)
+        bands = np.repeat(low, spans) + (np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans))
+        order = np.argsort(bands, kind="stable")
+        self._band_edges = edge_ids[order]
+        self._band_offsets = np.searchsorted(bands[order], np.arange(self._n_bands + 1))
+
+    @classmethod
+    def from_geojson(cls, path=PENANG_GEOJSON_PATH):
+        polygons = load_polygon_cache(path)
+        return cls(polygons["coords"], polygons["ring_offsets"],
+                   polygons["ring_feature"], polygons["properties"])
+
+    def _band_of(self, y):
+        band = np.floor((np.asarray(y) - self._y_min) / self._band_height).astype(np.int64)
+        return np.clip(band, 0, self._n_bands - 1)
+
+    def locate(self, lon, lat):
+        """
+        Finds the feature containing each point.
+
+        Parameters:
+        - lon, lat: Arrays of point coordinates (same shape).
+
+        Returns:
+        - np.ndarray: Feature index per point, -1 where no feature contains it.
+        """
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        flat_lon, flat_lat = lon.ravel(), lat.ravel()
+        result = np.full(flat_lon.shape, -1, dtype=np.int32)
+
+        x_min, y_min, x_max, y_max = self.bounds
+        inside_bounds = ((flat_lon >= x_min) & (flat_lon <= x_max) &
+                         (flat_lat >= y_min) & (flat_lat <= y_max))
+        candidates = np.flatnonzero(inside_bounds)
+        if len(candidates) == 0:
+            return result.reshape(lon.shape)
+
+        # Visit points band by band so each band's edges are gathered once
+        point_bands = self._band_of(flat_lat[candidates])
+        order = np.argsort(point_bands, kind="stable")
+        candidates, point_bands = candidates[order], point_bands[order]
+        splits = np.flatnonzero(np.diff(point_bands)) + 1
+        for group in np.split(np.arange(len(candidates)), splits):
+            band = point_bands[group[0]]
+            edges = self._band_edges[self._band_offsets[band]:self._band_offsets[band + 1]]
+            if len(edges) == 0:
+                continue
+            points = candidates[group]
+            result[points] = self._locate_in_band(flat_lon[points], flat_lat[points], edges)
+        return result.reshape(lon.shape)
+
+    def _locate_in_band(self, px, py, edges):
+        x1, y1 = self._x1[edges], self._y1[edges]
+        x2, y2 = self._x2[edges], self._y2[edges]
+        owners, local_owner = np.unique(self._owner[edges], return_inverse=True)
+
+        # Even-odd ray casting towards +x, for every point against every band edge
+        py_col = py[:, None]
+        straddles = (y1 > py_col) != (y2 > py_col)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_cross = x1 + (py_col - y1) * (x2 - x1) / (y2 - y1)
+        crossings = straddles & (px[:, None] < x_cross)
+
+        # Parity of crossings per feature
+        membership = np.zeros((len(edges), len(owners)), dtype=np.float32)
+        membership[np.arange(len(edges)), local_owner] = 1.0
+        inside = (crossings.astype(np.float32) @ membership).astype(np.int64) % 2 == 1
+        return np.where(inside.any(axis=1), owners[inside.argmax(axis=1)], -1)
+
+
+_penang_index = None
+_penang_index_lock = threading.Lock()
+
+
+def get_penang_index():
+    """
+    Returns the process-wide index of the Penang parliament constituencies.
+    """
+    global _penang_index
+    if _penang_index is None:
+        with _penang_index_lock:
+            if _penang_index is None:
+                _penang_index = PolygonIndex.from_geojson(PENANG_GEOJSON_PATH)
+    return _penang_index
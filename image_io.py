@@ -0,0 +1,78 @@
+import io
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# cv2.imdecode flags for decoding at 1/1, 1/2, 1/4 and 1/8 of the stored resolution
+REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+JPEG_QUALITY = 90
+
+
+def decode_image(data, reduce=1):
+    """
+    Decodes JPEG/PNG bytes straight from the upload buffer into a BGR image.
+
+    The bytes are wrapped with np.frombuffer, so no copy of the encoded data
+    is made; the decoder writes one contiguous uint8 array.
+
+    Parameters:
+    - data: Encoded image (bytes, bytearray or memoryview).
+    - reduce: Decode at 1/1, 1/2, 1/4 or 1/8 resolution; JPEGs are then
+      scaled inside the decoder, which is much cheaper than a full decode.
+
+    Returns:
+    - np.ndarray: (height, width, 3) uint8 image in BGR order.
+    """
+    buffer = np.frombuffer(memoryview(data), dtype=np.uint8)
+    image_bgr = cv2.imdecode(buffer, REDUCED_DECODE_FLAGS[reduce])
+    if image_bgr is None:
+        raise ValueError("Cannot decode the image data")
+    return image_bgr
+
+
+def encode_jpeg(image_bgr, quality=JPEG_QUALITY):
+    """
+    Encodes a BGR image as JPEG bytes.
+    """
+    ok, encoded = cv2.imencode(".jpg", image_bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Cannot encode the image as JPEG")
+    return encoded.tobytes()
+
+
+def image_size(data):
+    """
+    Reads (width, height) from the image header without decoding the pixels.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+def preview_reduction(data, preview_side, max_detection_side=1600):
+    """
+    Picks the coarsest reduced decode that still serves a preview of ``preview_side`` pixels.
+
+    The factor never goes beyond the pyramid level detect_and_annotate would
+    work on at full resolution. The decoder's own downscaling keeps more edge
+    detail than that pyramid, so annotations on a reduced decode are close to
+    but not identical with the full-size ones.
+
+    Returns:
+    - int: 1, 2, 4 or 8, for decode_image's ``reduce``.
+    """
+    longest = max(image_size(data))
+    detection_scale = 1
+    while longest // detection_scale > max_detection_side:
+        detection_scale *= 2
+    reduce = 1
+    while (reduce * 2 in REDUCED_DECODE_FLAGS and reduce * 2 <= detection_scale
+           and longest // (reduce * 2) >= preview_side):
+        reduce *= 2
+    return reduce
@@ -1,51 +1,214 @@
 import cv2
+import numpy as np
+
+# Slope stabilization measures scored by the detector, as named in the fuzzy model
+PROTECTION_MEASURES = ['soil_nailing', 'slope_netting', 'gabion_wall', 'rubble_wall']
+
+MEASURE_CAPTIONS = {
+    'soil_nailing': "soil nailing",
+    'slope_netting': "slope netting",
+    'gabion_wall': "gabion wall",
+    'rubble_wall': "rubble wall",
+}
+
+ORIENTATION_BINS = 18
+
+
+def contour_statistics(contours):
+    """
+    Computes area, perimeter and bounding-box size of every contour in one pass over their points.
+
+    Parameters:
+    - contours: Contours as returned by cv2.findContours.
+
+    Returns:
+    - dict: Per-contour arrays ``area``, ``perimeter``, ``box_area``, plus
+      ``orientation_histogram``, the length-weighted histogram of edge
+      segment directions (modulo 180 degrees) over all contours.
+    """
+    lengths = np.fromiter((len(contour) for contour in contours), dtype=np.int64, count=len(contours))
+    points = np.concatenate(contours).reshape(-1, 2).astype(np.float64)
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+
+    # Index of the next point of each contour, wrapping around to close it
+    following = np.arange(1, len(points) + 1)
+    following[starts + lengths - 1] = starts
+    x, y = points[:, 0], points[:, 1]
+    dx, dy = x[following] - x, y[following] - y
+    segment = np.hypot(dx, dy)
+
+    # Shoelace area and perimeter, as cv2.contourArea and cv2.arcLength compute them
+    area = np.abs(np.add.reduceat(x * y[following] - x[following] * y, starts)) / 2
+    perimeter = np.add.reduceat(segment, starts)
+    box_area = ((np.maximum.reduceat(x, starts) - np.minimum.reduceat(x, starts) + 1) *
+                (np.maximum.reduceat(y, starts) - np.minimum.reduceat(y, starts) + 1))
+
+    angle = np.arctan2(dy, dx) % np.pi
+    orientation_bin = np.minimum((angle / np.pi * ORIENTATION_BINS).astype(np.int64), ORIENTATION_BINS - 1)
+    orientation_histogram = np.bincount(orientation_bin, segment, ORIENTATION_BINS)
+    return {"area": area, "perimeter": perimeter, "box_area": box_area,
+            "orientation_histogram": orientation_histogram}
+
+
+def _regularity(values):
+    # 1 for identical sizes, falling towards 0 as the spread grows
+    if len(values) < 2:
+        return 0.0
+    return float(1 / (1 + np.std(values) / np.mean(values)))
+
+
+def protection_scores(statistics, edge_pixels, image_area):
+    """
+    Scores how strongly the edge structure suggests each slope stabilization measure.
+
+    Every score combines contour coverage (how much of the frame the matching
+    shapes account for) with structure regularity (how uniform they are):
+
+    - soil_nailing: many small, round, evenly sized nail heads
+    - slope_netting: dense edges running in two dominant directions (mesh)
+    - gabion_wall: evenly sized, box-filling rectangular baskets
+    - rubble_wall: closely packed, irregular polygonal stones
+
+    Parameters:
+    - statistics: Output of contour_statistics.
+    - edge_pixels: Number of edge pixels in the edge map.
+    - image_area: Pixel count of the edge map.
+
+    Returns:
+    - dict: Confidence from 0 to 100 for every name in PROTECTION_MEASURES.
+    """
+    area = statistics["area"]
+    perimeter = np.maximum(statistics["perimeter"], 1e-9)
+    fill = area / statistics["box_area"]
+    circularity = np.clip(4 * np.pi * area / perimeter ** 2, 0, 1)
+    significant = area >= max(16.0, image_area * 1e-5)
+
+    # A disc fills about pi/4 of its bounding box; a box-shaped basket nearly all of it
+    nails = (significant & (circularity > 0.85) & (fill >= 0.65) & (fill < 0.85)
+             & (area < image_area * 0.01))
+    baskets = significant & (fill >= 0.85) & (area >= image_area * 0.001) & (area < image_area * 0.1)
+    stones = (significant & (fill >= 0.45) & (fill < 0.75) & (circularity >= 0.45) & (circularity <= 0.85)
+              & (area >= image_area * 0.0005))
+
+    nail_score = min(1.0, nails.sum() / 10) * _regularity(area[nails])
+    basket_score = min(1.0, area[baskets].sum() / image_area / 0.3) * _regularity(area[baskets])
+    # Rubble stones vary in size, which also keeps identical mesh cells out of this score
+    stone_spread = np.std(area[stones]) / np.mean(area[stones]) if stones.sum() >= 2 else 0.0
+    stone_score = (min(1.0, area[stones].sum() / image_area / 0.15) * min(1.0, stones.sum() / 8)
+                   * min(1.0, stone_spread / 0.15))
+
+    # A mesh puts most of its edge length into two directions; a uniform spread scores 0
+    histogram = statistics["orientation_histogram"]
+    total = histogram.sum()
+    if total > 0:
+        share = np.sort(histogram)[-2:].sum() / total
+        uniform_share = 2 / ORIENTATION_BINS
+        orientation_regularity = max(0.0, (share - uniform_share) / (1 - uniform_share))
+    else:
+        orientation_regularity = 0.0
+    netting_score = min(1.0, edge_pixels / image_area / 0.1) * orientation_regularity
+
+    scores = [nail_score, netting_score, basket_score, stone_score]
+    return {measure: round(100 * float(score), 1) for measure, score in zip(PROTECTION_MEASURES, scores)}
+
+
+def detect_slope_protection(image_np, blur_kernel_size=(5, 5), canny_threshold1=100, canny_threshold2=200, contour_size_threshold=50, max_annotations=5, max_detection_side=1600, out=None, color_order="RGB"):
+    """
+    Annotates likely slope protection structures and scores each stabilization measure.
+
+    The scores come from the same edge map and contour list as the
+    annotations, so they add no extra pass over the image.
+
+    Parameters:
+    - image_np: RGB (or BGR, see color_order) uint8 image.
+    - out: Buffer to draw into; defaults to image_np itself.
+    - The remaining parameters are as for detect_and_annotate.
+
+    Returns:
+    - tuple: (annotated image, dict of protection_scores).
+    """
+    # Annotations are drawn into `out`; by default that is the input image itself
+    if out is None:
+        out = image_np
+    elif out is not image_np:
+        np.copyto(out, image_np)
+
+    # Detect on a pyramid level no larger than max_detection_side; circles are scaled back up.
+    # The first halving averages 2x2 blocks of the colour image so the grayscale conversion
+    # only touches a quarter of the pixels; further levels are Gaussian pyramid steps.
+    scale = 1
+    height, width = image_np.shape[:2]
+    if max(height, width) > max_detection_side:
+        reduced = cv2.resize(image_np, (width // 2, height // 2), interpolation=cv2.INTER_LINEAR)
+        scale = 2
+    else:
+        reduced = image_np
+
+    # Convert the image to grayscale; OpenCV-decoded images arrive in BGR order
+    gray = cv2.cvtColor(reduced, cv2.COLOR_BGR2GRAY if color_order == "BGR" else cv2.COLOR_RGB2GRAY)
+    while max(gray.shape[:2]) > max_detection_side:
+        gray = cv2.pyrDown(gray)
+        scale *= 2
 
-def detect_and_annotate(image_np, blur_kernel_size=(5, 5), canny_threshold1=100, canny_threshold2=200, contour_size_threshold=50, max_annotations=5):
-    # Convert the image to grayscale
-    gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
-    
     # Apply Gaussian blur to reduce noise
     blurred = cv2.GaussianBlur(gray, blur_kernel_size, 0)
 
     # Use Canny Edge Detection to highlight edges
     edges = cv2.Canny(blurred, canny_threshold1, canny_threshold2)
 
-    # Find contours from the edged image
-    contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    # Find the outer contours from the edged image
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
     if not contours:
         print("No contours found.")
-        return image_np
+        return out, {measure: 0.0 for measure in PROTECTION_MEASURES}
 
-    # Sort contours by area and keep the largest ones
-    contours = sorted(contours, key=cv2.contourArea, reverse=True)[:max_annotations]
+    # Shape statistics of every contour feed both the scores and the annotation ranking
+    statistics = contour_statistics(contours)
+    scores = protection_scores(statistics, cv2.countNonZero(edges), edges.size)
+    caption = MEASURE_CAPTIONS[max(scores, key=scores.get)]
+
+    # Keep only the largest contours: partial selection, then sort the few survivors
+    areas = statistics["area"]
+    if len(contours) > max_annotations:
+        largest = np.argpartition(areas, -max_annotations)[-max_annotations:]
+    else:
+        largest = np.arange(len(contours))
+    largest = largest[np.argsort(-areas[largest], kind="stable")]
 
     # Process each significant contour and annotate if it meets the size threshold
     annotated_count = 0
-    for contour in contours:
-        (x, y), radius = cv2.minEnclosingCircle(contour)
-        center = (int(x), int(y))
-        radius = int(radius)
-        
+    for index in largest:
+        # The enclosing circle of the convex hull is the same circle, found without
+        # the slow worst case of minEnclosingCircle on long edge traces
+        (x, y), radius = cv2.minEnclosingCircle(cv2.convexHull(contours[index]))
+        center = (int(x * scale), int(y * scale))
+        radius = int(radius * scale)
+
         if radius > contour_size_threshold:
             # Draw a circle around the contour in red color
-            cv2.circle(image_np, center, radius, (0, 0, 255), 2)
-            
-            # Write text annotation beside the circle
-            text = "Risk decreased due to soil nailing"
+            cv2.circle(out, center, radius, (0, 0, 255), 2)
+
+            # Write text annotation beside the circle, naming the most likely measure
+            text = f"Risk decreased due to {caption}"
             text_size, _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
             text_width, text_height = text_size
-            
+
             # Ensure the text is within image boundaries
-            text_x = min(center[0] + radius + 10, image_np.shape[1] - text_width)
-            text_y = max(min(center[1] + text_height // 2, image_np.shape[0] - text_height // 2), text_height)
-            
-            cv2.putText(image_np, text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 32, 20), 2)
-            
+            text_x = min(center[0] + radius + 10, out.shape[1] - text_width)
+            text_y = max(min(center[1] + text_height // 2, out.shape[0] - text_height // 2), text_height)
+
+            cv2.putText(out, text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 32, 20), 2)
+
             annotated_count += 1
             if annotated_count >= max_annotations:
                 break
 
-    return image_np
+    return out, scores
 
 
+def detect_and_annotate(image_np, blur_kernel_size=(5, 5), canny_threshold1=100, canny_threshold2=200, contour_size_threshold=50, max_annotations=5, max_detection_side=1600, out=None, color_order="RGB"):
+    annotated, _ = detect_slope_protection(image_np, blur_kernel_size, canny_threshold1, canny_threshold2,
+                                           contour_size_threshold, max_annotations, max_detection_side, out,
+                                           color_order)
+    return annotated
@@ -0,0 +1,244 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+SPAN_EXPORT_DIR = os.path.join(".cache", "spans")
+
+# Set to show the profile panel on every page (or open a page with ?profile=1)
+PROFILE_ENV_VAR = "HYDRODATAHUB_PROFILE"
+
+# Histogram bucket upper bounds in seconds, Prometheus style; a final +Inf bucket is implied
+SPAN_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Minimum time between automatic exports at the end of a rerun
+EXPORT_INTERVAL_SECONDS = 30
+
+
+class SpanHistogram:
+    """
+    Duration histogram of one named span.
+    """
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(SPAN_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds):
+        self.bucket_counts[bisect.bisect_left(SPAN_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+    def quantile(self, q):
+        """
+        Estimates a quantile by linear interpolation inside its bucket, like Prometheus' histogram_quantile.
+        """
+        if self.count == 0:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = SPAN_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = SPAN_BUCKETS[index] if index < len(SPAN_BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def as_dict(self):
+        return {"count": self.count, "sum": self.total, "max": self.max, "last": self.last,
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95),
+                "buckets": dict(zip([*map(str, SPAN_BUCKETS), "+Inf"], self.bucket_counts))}
+
+
+class SpanRecorder:
+    """
+    Thread-safe collection of span histograms, keyed by span name.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = SpanHistogram()
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """
+        Returns a dict of span name -> SpanHistogram.as_dict(), sorted by name.
+        """
+        with self._lock:
+            return {name: self._histograms[name].as_dict() for name in sorted(self._histograms)}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def to_json(self):
+        return json.dumps({"started": self.started, "exported": time.time(), "spans": self.snapshot()}, indent=2)
+
+    def to_prometheus(self, metric="hydrodatahub_span_seconds"):
+        """
+        Renders every histogram in the Prometheus text exposition format.
+        """
+        lines = [f"# HELP {metric} Duration of named app stages.", f"# TYPE {metric} histogram"]
+        for name, histogram in self.snapshot().items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, bucket_count in histogram["buckets"].items():
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {histogram["sum"]!r}')
+            lines.append(f'{metric}_count{{span="{label}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+_last_export = 0.0
+
+
+def get_span_recorder():
+    """
+    Returns the process-wide span recorder.
+    """
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = SpanRecorder()
+    return _recorder
+
+
+def get_session_span_recorder():
+    """
+    Returns the span recorder of the current Streamlit session, or None outside a Streamlit script run.
+    """
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    if get_script_run_ctx() is None:
+        return None
+    if "_span_recorder" not in st.session_state:
+        st.session_state["_span_recorder"] = SpanRecorder()
+    return st.session_state["_span_recorder"]
+
+
+def record_span(name, seconds):
+    """
+    Adds one duration to the process-wide and the session histograms of a span.
+    """
+    get_span_recorder().observe(name, seconds)
+    session_recorder = get_session_span_recorder()
+    if session_recorder is not None:
+        session_recorder.observe(name, seconds)
+
+
+@contextmanager
+def span(name):
+    """
+    Times the enclosed block as the named span, e.g. ``with span("landslide.compute"):``.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def export_spans(directory=SPAN_EXPORT_DIR, recorder=None):
+    """
+    Writes the recorder's histograms to ``spans.json`` and ``spans.prom`` in ``directory``.
+
+    Parameters:
+    - directory: Output folder, e.g. the textfile collector folder of a Prometheus node exporter.
+    - recorder: SpanRecorder to export (default: the process-wide recorder).
+
+    Returns:
+    - list: Paths of the written files.
+    """
+    recorder = recorder or get_span_recorder()
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for file_name, content in (("spans.json", recorder.to_json()), ("spans.prom", recorder.to_prometheus())):
+        path = os.path.join(directory, file_name)
+        scratch = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(scratch, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(scratch, path)
+        paths.append(path)
+    return paths
+
+
+def finish_rerun(page, started):
+    """
+    Records a whole page rerun as the span ``<page>.rerun`` and exports the
+    process-wide histograms at most every EXPORT_INTERVAL_SECONDS.
+
+    Parameters:
+    - page: Span name prefix of the page, e.g. "landslide".
+    - started: time.perf_counter() at the top of the page script.
+    """
+    global _last_export
+    record_span(f"{page}.rerun", time.perf_counter() - started)
+    if time.time() - _last_export >= EXPORT_INTERVAL_SECONDS:
+        _last_export = time.time()
+        try:
+            export_spans()
+        except OSError:
+            pass
+
+
+def profiling_enabled():
+    """
+    True when PROFILE_ENV_VAR is set or the page URL has ?profile=1.
+    """
+    import streamlit as st
+
+    return bool(os.environ.get(PROFILE_ENV_VAR)) or st.query_params.get("profile") == "1"
+
+
+def render_span_panel():
+    """
+    Shows span histograms of this session and process in the sidebar when profiling is enabled.
+    """
+    if not profiling_enabled():
+        return
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Performance Profile", expanded=True):
+        scope = st.radio("Spans Recorded In:", ("This Session", "This Process"), horizontal=True)
+        recorder = get_session_span_recorder() if scope == "This Session" else get_span_recorder()
+        snapshot = recorder.snapshot() if recorder is not None else {}
+        if not snapshot:
+            st.caption("No spans recorded yet.")
+            return
+        table = pd.DataFrame([
+            {"Span": name, "Count": histogram["count"], "Last (ms)": histogram["last"] * 1000,
+             "Mean (ms)": histogram["sum"] / histogram["count"] * 1000, "P50 (ms)": histogram["p50"] * 1000,
+             "P95 (ms)": histogram["p95"] * 1000, "Max (ms)": histogram["max"] * 1000}
+            for name, histogram in snapshot.items()
+        ])
+        st.dataframe(table, hide_index=True, column_config={
+            column: st.column_config.NumberColumn(format="%.1f") for column in table.columns[2:]
+        })
+        col_json, col_prometheus = st.columns(2)
+        col_json.download_button("JSON", recorder.to_json(), file_name="spans.json", mime="application/json")
+        col_prometheus.download_button("Prometheus", recorder.to_prometheus(), file_name="spans.prom",
+                                       mime="text/plain")
+        if st.button("Export to " + SPAN_EXPORT_DIR):
+            st.caption("Wrote " + ", ".join(export_spans()))
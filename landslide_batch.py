@@ -0,0 +1,257 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_lookup import get_fuzzy_lookup
+from fuzzy_model import DEFAULT_INPUTS
+from landslide_scoring import FUZZY_INPUTS, encode_sites, risk_categories
+
+CHUNK_ROWS = 50_000
+
+# Columns appended to every scored site
+SCORE_DTYPES = {"risk_score": "float64", "risk_category": "string"}
+
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _passthrough_dtypes(path):
+    # Types of the non-input columns, copied unchanged to the output. CSV has no
+    # types, so they stay text rather than whatever each chunk happens to parse as
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        schema = pq.ParquetFile(path).schema_arrow
+        return {field.name: pd.ArrowDtype(field.type) for field in schema if field.name not in FUZZY_INPUTS}
+    columns = pd.read_csv(path, nrows=0).columns
+    return {name: "string" for name in columns if name not in FUZZY_INPUTS}
+
+
+def scored_site_dtypes(path):
+    """
+    Fixes the columns and types of the scored output before any chunk is read.
+
+    Every fuzzy input is a float64 column holding the value the model scored
+    (form labels mapped to numbers, omitted stabilization measures at their
+    defaults); other columns keep their Parquet type, or stay text for CSV
+    input; risk_score and risk_category come last.
+
+    Parameters:
+    - path: .csv or .parquet file of site records.
+
+    Returns:
+    - dict: Output column name -> pandas dtype, in output order.
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        columns = pq.ParquetFile(path).schema_arrow.names
+    else:
+        columns = list(pd.read_csv(path, nrows=0).columns)
+    missing = [name for name in FUZZY_INPUTS if name not in columns and name not in DEFAULT_INPUTS]
+    if missing:
+        raise ValueError(f"Site records have no '{missing[0]}' column.")
+
+    passthrough = _passthrough_dtypes(path)
+    dtypes = {name: passthrough.get(name, "float64") for name in columns}
+    dtypes.update({name: "float64" for name in FUZZY_INPUTS if name not in dtypes})
+    dtypes.update(SCORE_DTYPES)
+    return dtypes
+
+
+def read_site_chunks(path, chunk_rows=CHUNK_ROWS):
+    """
+    Streams a CSV or Parquet file of site records in chunks.
+
+    Returns:
+    - tuple: (generator of DataFrames, total row count or None when unknown).
+    """
+    if _is_parquet(path):
+        # Parquet support comes with pyarrow, which pandas also uses for it
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        chunks = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunk_rows))
+        return chunks, parquet_file.metadata.num_rows
+    return pd.read_csv(path, chunksize=chunk_rows, dtype=_passthrough_dtypes(path)), None
+
+
+class ScoredSiteWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file as they arrive.
+
+    Every chunk is converted to the column types fixed up front (see
+    scored_site_dtypes), so a later chunk whose columns pandas parsed
+    differently, e.g. integers that pick up a missing value, is still
+    written. The file is always created, header-only when nothing was written.
+    """
+
+    def __init__(self, path, dtypes):
+        self.path = path
+        self.dtypes = dtypes
+        self._parquet_writer = None
+        self._header_written = False
+
+    def _conform(self, chunk):
+        return chunk.reindex(columns=list(self.dtypes)).astype(self.dtypes)
+
+    def write(self, chunk):
+        chunk = self._conform(chunk)
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode="a" if self._header_written else "w", header=not self._header_written,
+                         index=False)
+            self._header_written = True
+
+    def close(self):
+        if self._parquet_writer is None and not self._header_written:
+            self.write(pd.DataFrame())
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_site_chunk(sites, use_lookup_table=False):
+    """
+    Scores one chunk of site records.
+
+    Parameters:
+    - sites: DataFrame of site records (see landslide_scoring.encode_sites).
+    - use_lookup_table: Score from the fuzzy lookup table instead of the exact engine.
+
+    Returns:
+    - pd.DataFrame: The records with every fuzzy input as the value scored and
+      risk_score and risk_category appended; rows with a missing value or
+      unknown label get no score.
+    """
+    inputs, valid = encode_sites(sites)
+    engine = get_fuzzy_lookup() if use_lookup_table else get_fuzzy_engine()
+    risk_score = np.full(len(sites), np.nan)
+    if valid.any():
+        risk_score[valid] = engine.evaluate_batch({name: values[valid] for name, values in inputs.items()})
+    scored = sites.copy()
+    for name in FUZZY_INPUTS:
+        scored[name] = inputs[name] if name in inputs else float(DEFAULT_INPUTS[name])
+    scored["risk_score"] = risk_score
+    scored["risk_category"] = risk_categories(risk_score)
+    return scored
+
+
+def score_site_file(input_path, output_path, chunk_rows=CHUNK_ROWS, workers=None, use_lookup_table=False,
+                    progress=None):
+    """
+    Scores a CSV or Parquet file of site records chunk by chunk across a process pool.
+
+    At most two chunks per worker are in flight and finished chunks are
+    written in input order as soon as they are ready, so memory use depends
+    on chunk_rows and workers, not on the file size.
+
+    Parameters:
+    - input_path, output_path: .csv or .parquet files.
+    - chunk_rows: Rows per chunk.
+    - workers: Number of processes (default: number of CPUs; 1 scores in this process).
+    - use_lookup_table: Score from the fuzzy lookup table instead of the exact engine.
+    - progress: Called after every chunk with (rows done, total rows or None, seconds elapsed).
+
+    Returns:
+    - dict: ``rows``, ``unscored`` (rows without a score), ``seconds`` and the
+      row count per risk category.
+    """
+    workers = workers or os.cpu_count() or 1
+    dtypes = scored_site_dtypes(input_path)
+    chunks, total_rows = read_site_chunks(input_path, chunk_rows)
+    writer = ScoredSiteWriter(output_path, dtypes)
+    summary = {"rows": 0, "unscored": 0, "Safe": 0, "Moderate": 0, "High": 0}
+    started = time.perf_counter()
+
+    def finish(scored):
+        writer.write(scored)
+        summary["rows"] += len(scored)
+        summary["unscored"] += int(scored["risk_score"].isna().sum())
+        for category, count in scored["risk_category"].value_counts().items():
+            if category:
+                summary[category] += int(count)
+        if progress is not None:
+            progress(summary["rows"], total_rows, time.perf_counter() - started)
+
+    try:
+        if workers == 1:
+            for sites in chunks:
+                finish(score_site_chunk(sites, use_lookup_table))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for sites in chunks:
+                    pending.append(executor.submit(score_site_chunk, sites, use_lookup_table))
+                    if len(pending) >= 2 * workers:
+                        finish(pending.popleft().result())
+                while pending:
+                    finish(pending.popleft().result())
+    finally:
+        writer.close()
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def _report_progress(rows, total_rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    done = f"{rows:,}/{total_rows:,} ({rows / total_rows:.0%})" if total_rows else f"{rows:,}"
+    # Redraw one line on a terminal; cron logs get a line per chunk
+    if sys.stderr.isatty():
+        print(f"\rScored {done} sites, {rate:,.0f} sites/s, {elapsed:.1f} s", end="", file=sys.stderr, flush=True)
+    else:
+        print(f"Scored {done} sites, {rate:,.0f} sites/s, {elapsed:.1f} s", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a CSV or Parquet file of slope sites with the landslide fuzzy model.",
+        epilog="Site columns are named after the fuzzy inputs (rainfall, soil_moisture, slope_steepness, "
+               "human_activity, historical_landslides, soil_type, drainage_system, vegetated_surface, "
+               "slope_nature and optionally soil_nailing, slope_netting, gabion_wall, rubble_wall) and hold "
+               "numbers or the landslide page's form options. Other columns are copied to the output.")
+    parser.add_argument("input", help="Site records, .csv or .parquet")
+    parser.add_argument("output", help="Scored sites, .csv or .parquet")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--lookup", action="store_true", help="Score from the fuzzy lookup table")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = score_site_file(args.input, args.output, args.chunk_rows, args.workers, args.lookup,
+                                  progress=None if args.quiet else _report_progress)
+    except (OSError, ValueError) as error:
+        print(f"landslide_batch: {error}", file=sys.stderr)
+        return 1
+    except ImportError as error:
+        # pyarrow is only imported for .parquet files
+        if not (error.name or "").startswith("pyarrow"):
+            raise
+        print("landslide_batch: Parquet needs pyarrow (pip install pyarrow)", file=sys.stderr)
+        return 1
+    if not args.quiet and sys.stderr.isatty():
+        print(file=sys.stderr)
+    print(f"Scored {summary['rows']:,} sites in {summary['seconds']:.1f} s "
+          f"({summary['rows'] / max(summary['seconds'], 1e-9):,.0f} sites/s): "
+          f"{summary['Safe']:,} Safe, {summary['Moderate']:,} Moderate, {summary['High']:,} High, "
+          f"{summary['unscored']:,} unscored")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from fuzzy_model import DEFAULT_INPUTS
+
+# Form options of the landslide page and the fuzzy input value each one stands for
+HUMAN_ACTIVITY_LEVELS = {'Absent': 0, 'Present': 100}
+VEGETATION_COVERAGE_LEVELS = {
+    '0-10%': 5, '11-20%': 15, '21-30%': 25,
+    '31-40%': 35, '41-50%': 45, '51-60%': 55,
+    '61-70%': 65, '71-80%': 75, '81-90%': 85,
+    '91-100%': 95
+}
+DRAINAGE_CONDITIONS = {'Clogged': 25, 'Requires Maintenance': 50, 'In Good Condition': 75}
+HISTORICAL_LANDSLIDE_PRESENCE = {'Yes': 100, 'No': 0}
+SLOPE_NATURE_LEVELS = {'Natural': 0, 'Engineered': 100}
+SLOPE_STABILIZATION_MEASURES = {
+    'Soil Nails': 100,
+    'Erosion Control Netting': 100,
+    'Gabion Walls': 100,
+    'Rubble Masonry Walls': 100
+}
+SOIL_TYPES = {'Clay': 0, 'Sand': 1, 'Loam': 2, 'Peat': 3, 'Chalk': 4, 'Silt': 5}
+SLOPE_STEEPNESS_LEVELS = {
+    '0-4.9 (Very Gentle)': 5,
+    '5-9.9 (Gentle)': 10,
+    '10-14.9 (Moderate)': 15,
+    '15-19.9 (Steep)': 20,
+    '20-24.9 (Very Steep)': 25,
+    '25-29.9 (Extremely Steep)': 30,
+    '>=30 (Precipitous)': 35
+}
+
+# Fuzzy inputs that may also be given as form option labels
+INPUT_LABELS = {
+    'human_activity': HUMAN_ACTIVITY_LEVELS,
+    'vegetated_surface': VEGETATION_COVERAGE_LEVELS,
+    'drainage_system': DRAINAGE_CONDITIONS,
+    'historical_landslides': HISTORICAL_LANDSLIDE_PRESENCE,
+    'slope_nature': SLOPE_NATURE_LEVELS,
+    'soil_type': SOIL_TYPES,
+    'slope_steepness': SLOPE_STEEPNESS_LEVELS,
+}
+
+# Stabilization measure inputs and their form checkboxes; True/False mean installed or not
+MEASURE_LABELS = {
+    'soil_nailing': 'Soil Nails',
+    'slope_netting': 'Erosion Control Netting',
+    'gabion_wall': 'Gabion Walls',
+    'rubble_wall': 'Rubble Masonry Walls',
+}
+MEASURE_INPUTS = list(MEASURE_LABELS)
+
+FUZZY_INPUTS = ['rainfall', 'soil_moisture', 'slope_steepness', 'human_activity', 'historical_landslides',
+                'soil_type', 'drainage_system', 'vegetated_surface', 'slope_nature'] + MEASURE_INPUTS
+
+# Upper bounds of the "Safe" and "Moderate" risk categories
+SAFE_RISK_THRESHOLD = 30
+HIGH_RISK_THRESHOLD = 70
+
+
+def convert_slope_steepness_to_numerical(slope_steepness_category):
+    return SLOPE_STEEPNESS_LEVELS[slope_steepness_category]
+
+
+def map_risk_to_category(risk_score):
+    if risk_score <= SAFE_RISK_THRESHOLD:
+        return "Safe"
+    elif SAFE_RISK_THRESHOLD < risk_score <= HIGH_RISK_THRESHOLD:
+        return "Moderate"
+    else:
+        return "High"
+
+
+def risk_categories(risk_scores):
+    """
+    Vectorized map_risk_to_category; rows without a score get an empty category.
+    """
+    risk_scores = np.asarray(risk_scores, dtype=np.float64)
+    return np.select([np.isnan(risk_scores), risk_scores <= SAFE_RISK_THRESHOLD,
+                      risk_scores <= HIGH_RISK_THRESHOLD], ["", "Safe", "Moderate"], "High")
+
+
+def encode_site(values):
+    """
+    Turns one site's form values into fuzzy inputs.
+
+    Parameters:
+    - values: Dictionary keyed by fuzzy input name. Each value is a number or,
+      for the inputs in INPUT_LABELS, the form option label; stabilization
+      measures may be True/False.
+
+    Returns:
+    - dict: Numeric fuzzy inputs, ready for calculate_landslide_risk.
+    """
+    inputs = {}
+    for name, value in values.items():
+        if isinstance(value, str) and name in INPUT_LABELS:
+            value = INPUT_LABELS[name][value]
+        elif isinstance(value, (bool, np.bool_)) and name in MEASURE_INPUTS:
+            value = SLOPE_STABILIZATION_MEASURES[MEASURE_LABELS[name]] if value else 0
+        inputs[name] = value
+    return inputs
+
+
+def encode_sites(sites):
+    """
+    Turns a table of site records into fuzzy input columns.
+
+    Columns are named after the fuzzy inputs and hold numbers, form option
+    labels (see INPUT_LABELS) or, for stabilization measures, booleans.
+    Missing measure columns and missing values in measure columns default to
+    not installed.
+
+    Parameters:
+    - sites: DataFrame of site records; other columns are ignored.
+
+    Returns:
+    - tuple: (dict of float arrays, one per fuzzy input; boolean array that is
+      False for rows with a missing value or an unknown label).
+    """
+    inputs = {}
+    valid = np.ones(len(sites), dtype=bool)
+    for name in FUZZY_INPUTS:
+        if name not in sites.columns:
+            if name in DEFAULT_INPUTS:
+                continue
+            raise ValueError(f"Site records have no '{name}' column.")
+        column = sites[name]
+        installed = SLOPE_STABILIZATION_MEASURES[MEASURE_LABELS[name]] if name in MEASURE_INPUTS else None
+        if pd.api.types.is_bool_dtype(column) and installed is not None:
+            values = column.to_numpy(dtype=np.float64) * installed
+        elif pd.api.types.is_numeric_dtype(column):
+            values = column.to_numpy(dtype=np.float64)
+        else:
+            # Labels and numbers may be mixed in a text column
+            labels = INPUT_LABELS.get(name, {})
+            if installed is not None:
+                labels = {'True': installed, 'False': 0, 'Yes': installed, 'No': 0}
+            text = column.astype(str).str.strip()
+            values = text.map(labels).astype(np.float64)
+            values = values.fillna(pd.to_numeric(text, errors='coerce')).to_numpy()
+        if name in DEFAULT_INPUTS:
+            # An empty measure cell means none recorded, not an unscorable site
+            values = np.where(column.isna().to_numpy(), float(DEFAULT_INPUTS[name]), values)
+        valid &= ~np.isnan(values)
+        inputs[name] = values
+    return inputs, valid
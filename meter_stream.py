@@ -0,0 +1,317 @@
+import io
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from water_datasets import AREA_DTYPE
+
+AREAS = list(AREA_DTYPE.categories)
+
+READING_FIELDS = ["flow", "pressure", "temperature", "acoustic"]
+
+# One meter reading; area is the position of the area name in AREAS and flow
+# is the volume in litres since the meter's previous reading
+READING_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("area", "i2"),
+    ("flow", "f4"),
+    ("pressure", "f4"),
+    ("temperature", "f4"),
+    ("acoustic", "f4"),
+])
+
+# Text sources send one "timestamp,area,flow,pressure,temperature,acoustic" line per reading
+LINE_COLUMNS = ["timestamp", "area"] + READING_FIELDS
+
+
+def parse_reading_lines(lines):
+    """
+    Parses newline-delimited reading records into a READING_DTYPE array.
+
+    Records whose area is not one of AREAS are dropped.
+    """
+    if not lines:
+        return np.empty(0, dtype=READING_DTYPE)
+    frame = pd.read_csv(io.StringIO("".join(lines)), header=None, names=LINE_COLUMNS,
+                        dtype={"area": "string"})
+    area = pd.Categorical(frame["area"], categories=AREAS).codes
+    batch = np.empty(len(frame), dtype=READING_DTYPE)
+    batch["timestamp"] = frame["timestamp"].to_numpy()
+    batch["area"] = area
+    for field in READING_FIELDS:
+        batch[field] = frame[field].to_numpy()
+    return batch[area >= 0]
+
+
+def simulate_readings(meters_per_area=250, interval=1.0, seed=None, realtime=True,
+                      leak_rate=0.0, leak_ticks=120, start_time=None):
+    """
+    Built-in meter feed: yields one batch per tick with a reading from every meter.
+
+    Parameters:
+    - meters_per_area: Number of simulated meters in each area.
+    - interval: Seconds between ticks.
+    - seed: Random seed for reproducible feeds.
+    - realtime: Sleep between ticks; turn off to generate as fast as possible.
+    - leak_rate: Chance per tick that a leak starts in a random area.
+    - leak_ticks: How many ticks a simulated leak lasts.
+    - start_time: Epoch seconds of the first reading, now by default.
+    """
+    rng = np.random.default_rng(seed)
+    n = meters_per_area * len(AREAS)
+    area = np.repeat(np.arange(len(AREAS), dtype=np.int16), meters_per_area)
+    base_flow = rng.uniform(5, 40, n).astype(np.float32)
+    leak_remaining = np.zeros(len(AREAS), dtype=np.int64)
+    timestamp = time.time() if start_time is None else start_time
+    while True:
+        if rng.random() < leak_rate:
+            leak_remaining[rng.integers(len(AREAS))] = leak_ticks
+        leaking = (leak_remaining > 0)[area]
+        leak_remaining = np.maximum(leak_remaining - 1, 0)
+
+        batch = np.empty(n, dtype=READING_DTYPE)
+        batch["timestamp"] = timestamp
+        batch["area"] = area
+        batch["flow"] = base_flow * rng.normal(1.0, 0.05, n) * np.where(leaking, 1.5, 1.0)
+        batch["pressure"] = rng.normal(3.0, 0.1, n) - np.where(leaking, 0.3, 0.0)
+        batch["temperature"] = rng.normal(27.0, 0.5, n) - np.where(leaking, 1.5, 0.0)
+        batch["acoustic"] = rng.gamma(2.0, 5.0, n) + np.where(leaking, 15.0, 0.0)
+        yield batch
+        timestamp += interval
+        if realtime:
+            time.sleep(max(0.0, timestamp - time.time()))
+
+
+def tail_reading_file(path, poll_interval=0.5, max_lines=50_000):
+    """
+    Follows a growing text file of reading lines, like ``tail -f``.
+
+    Yields parsed batches of at most ``max_lines`` readings as lines are appended.
+    """
+    with open(path, encoding="utf-8") as f:
+        f.seek(0, os.SEEK_END)
+        pending = ""
+        while True:
+            lines = f.readlines(max_lines * 64)
+            if not lines:
+                time.sleep(poll_interval)
+                continue
+            lines[0] = pending + lines[0]
+            pending = "" if lines[-1].endswith("\n") else lines.pop()
+            yield parse_reading_lines(lines)
+
+
+def socket_readings(host="127.0.0.1", port=9950, recv_size=1 << 20):
+    """
+    Listens on a local TCP port and yields a batch per received chunk of lines.
+
+    Meters (or a gateway) connect and stream reading lines; one client is
+    served at a time.
+    """
+    with socket.create_server((host, port)) as server:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                pending = b""
+                while True:
+                    chunk = connection.recv(recv_size)
+                    if not chunk:
+                        break
+                    chunk = pending + chunk
+                    cut = chunk.rfind(b"\n") + 1
+                    pending = chunk[cut:]
+                    if cut:
+                        yield parse_reading_lines(chunk[:cut].decode("utf-8").splitlines(keepends=True))
+
+
+class ReadingRingBuffer:
+    """
+    Fixed-capacity buffer of the most recent readings.
+
+    Batches are copied into a preallocated structured array, overwriting the
+    oldest readings once full, so memory use does not grow with uptime.
+    """
+
+    def __init__(self, capacity=1_000_000):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=READING_DTYPE)
+        self._next = 0
+        self.total = 0
+
+    def append(self, batch):
+        # Count every reading received, including those a batch larger than the buffer pushes straight out
+        self.total += len(batch)
+        if len(batch) > self.capacity:
+            batch = batch[-self.capacity:]
+        first = min(len(batch), self.capacity - self._next)
+        self._data[self._next:self._next + first] = batch[:first]
+        self._data[:len(batch) - first] = batch[first:]
+        self._next = (self._next + len(batch)) % self.capacity
+
+    def latest(self, n=None):
+        """
+        Returns a copy of the newest ``n`` readings (all buffered ones by default), oldest first.
+        """
+        size = min(self.total, self.capacity)
+        n = size if n is None else min(n, size)
+        index = (self._next - n + np.arange(n)) % self.capacity
+        return self._data[index]
+
+
+class RollingAreaAggregates:
+    """
+    Per-area count, sum, sum of squares and maximum of every reading field
+    over a sliding time window.
+
+    The window is split into fixed-width time buckets held in a circular
+    array. Each batch is folded into its buckets with ``np.bincount`` and
+    buckets that fall out of the window are zeroed, so the cost per batch is
+    proportional to the batch, not to the window.
+    """
+
+    def __init__(self, window_seconds=3600, bucket_seconds=60):
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = max(1, int(np.ceil(window_seconds / bucket_seconds)))
+        shape = (self.n_buckets, len(AREAS))
+        self._count = np.zeros(shape, dtype=np.int64)
+        self._sum = np.zeros(shape + (len(READING_FIELDS),), dtype=np.float64)
+        self._sum_sq = np.zeros_like(self._sum)
+        self._max = np.full_like(self._sum, -np.inf)
+        self._newest_bucket = None
+
+    def _advance(self, bucket):
+        # Clear the slots of buckets that have just left the window
+        if self._newest_bucket is None:
+            self._newest_bucket = bucket
+            return
+        if bucket <= self._newest_bucket:
+            return
+        expired = min(bucket - self._newest_bucket, self.n_buckets)
+        slots = (self._newest_bucket + 1 + np.arange(expired)) % self.n_buckets
+        self._count[slots] = 0
+        self._sum[slots] = 0.0
+        self._sum_sq[slots] = 0.0
+        self._max[slots] = -np.inf
+        self._newest_bucket = bucket
+
+    def update(self, batch):
+        if len(batch) == 0:
+            return
+        buckets = np.floor(batch["timestamp"] / self.bucket_seconds).astype(np.int64)
+        self._advance(int(buckets.max()))
+
+        # Readings older than the window are ignored
+        recent = buckets > self._newest_bucket - self.n_buckets
+        buckets, batch = buckets[recent], batch[recent]
+        cells = (buckets % self.n_buckets) * len(AREAS) + batch["area"]
+        size = self.n_buckets * len(AREAS)
+
+        self._count += np.bincount(cells, minlength=size).reshape(self._count.shape)
+        for i, field in enumerate(READING_FIELDS):
+            values = batch[field].astype(np.float64)
+            self._sum[..., i] += np.bincount(cells, values, size).reshape(self._count.shape)
+            self._sum_sq[..., i] += np.bincount(cells, values * values, size).reshape(self._count.shape)
+            np.maximum.at(self._max.reshape(-1), cells * len(READING_FIELDS) + i, values)
+
+    def snapshot(self):
+        """
+        Returns the window aggregates as a DataFrame with one row per area.
+        """
+        count = self._count.sum(axis=0)
+        total = self._sum.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count[:, None]
+            variance = self._sum_sq.sum(axis=0) / count[:, None] - mean * mean
+        frame = pd.DataFrame({"Area": AREAS, "Readings": count})
+        for i, field in enumerate(READING_FIELDS):
+            frame[f"Mean {field.title()}"] = mean[:, i]
+            frame[f"Std {field.title()}"] = np.sqrt(np.maximum(variance[:, i], 0.0))
+            frame[f"Max {field.title()}"] = np.where(count > 0, self._max.max(axis=0)[:, i], np.nan)
+        frame["Total Flow"] = total[:, READING_FIELDS.index("flow")]
+        return frame
+
+
+class MeterPipeline:
+    """
+    Ingests reading batches from a source into a ring buffer and rolling
+    per-area aggregates, optionally on a background thread.
+    """
+
+    def __init__(self, capacity=1_000_000, window_seconds=3600, bucket_seconds=60):
+        self.buffer = ReadingRingBuffer(capacity)
+        self.aggregates = RollingAreaAggregates(window_seconds, bucket_seconds)
+        self._consumers = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add_consumer(self, consumer):
+        """
+        Registers a callable that receives every ingested batch, under the pipeline lock.
+        """
+        self._consumers.append(consumer)
+
+    def ingest(self, batch):
+        with self._lock:
+            self.buffer.append(batch)
+            self.aggregates.update(batch)
+            for consumer in self._consumers:
+                consumer(batch)
+
+    def run(self, source):
+        for batch in source:
+            self.ingest(batch)
+
+    def start(self, source):
+        """
+        Consumes ``source`` on a daemon thread; does nothing if already running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run, args=(source,), daemon=True)
+            self._thread.start()
+
+    def snapshot(self):
+        with self._lock:
+            return self.aggregates.snapshot()
+
+    def latest_readings(self, n=1000):
+        with self._lock:
+            return pd.DataFrame(self.buffer.latest(n))
+
+    @property
+    def total_readings(self):
+        return self.buffer.total
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_meter_pipeline():
+    """
+    Returns the process-wide pipeline, fed by the built-in simulator on first use.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                pipeline = MeterPipeline()
+                pipeline.start(simulate_readings(leak_rate=0.005))
+                _pipeline = pipeline
+    return _pipeline
+
+
+if __name__ == "__main__":
+    # Measure ingestion throughput with an unthrottled simulator
+    pipeline = MeterPipeline()
+    source = simulate_readings(meters_per_area=2500, realtime=False, seed=0)
+    batches = [next(source) for _ in range(100)]
+    started = time.perf_counter()
+    for batch in batches:
+        pipeline.ingest(batch)
+    elapsed = time.perf_counter() - started
+    print(f"Ingested {pipeline.total_readings:,} readings at "
+          f"{pipeline.total_readings / elapsed:,.0f} readings/s")
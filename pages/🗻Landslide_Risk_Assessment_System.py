@@ -1,18 +1,34 @@
 # Standard library imports
 import base64
-import io
+import datetime
+import time
+import zipfile
+
+# Rerun timing starts before the third party imports, which dominate a cold start
+rerun_started = time.perf_counter()
 
 # Third party imports
 import numpy as np
 import pandas as pd
-from PIL import Image
-import pydeck as pdk
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
 import streamlit as st
 
-# Local application imports
-from image_processing import detect_and_annotate
+# Local application imports; pydeck and the OpenCV/PIL image pipeline are imported
+# where they are first needed so the form paints without them (warmup.py preloads them)
+from assessment_store import INPUT_COLUMNS, get_assessment_store, latest_per_site
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_lookup import get_fuzzy_lookup
+from geo_index import get_penang_index
+from instrumentation import finish_rerun, record_span, render_span_panel, span
+from landslide_scoring import MEASURE_INPUTS, encode_site, map_risk_to_category
+from rainfall_simulation import SeasonPeaks, load_rainfall_csv, simulate_season, synthetic_rainfall
+from risk_surface import (REGIONAL_INPUTS, SITE_INFLUENCE_M, build_grid, compute_risk_surface, grid_cell_size_m,
+                          site_input_grids)
+from sensitivity import sweep_inputs, tornado_table
+from uncertainty import MONTE_CARLO_SAMPLES, sample_risk_scores, summarize_risk_scores
+from warmup import start_warmup
+
+record_span("landslide.imports", time.perf_counter() - rerun_started)
+start_warmup()
 
 # Set page configuration with the globe emoji as the page icon
 st.set_page_config(
@@ -59,96 +75,6 @@ def static_risk_analysis():
     """
     return analysis_text
 
-def create_fuzzy_system():
-    # Antecedent/Consequent objects hold universe variables and membership functions
-    rainfall = ctrl.Antecedent(np.arange(0, 1001, 1), 'rainfall')
-    soil_moisture = ctrl.Antecedent(np.arange(0, 101, 1), 'soil_moisture')
-    slope_steepness = ctrl.Antecedent(np.arange(0, 101, 1), 'slope_steepness')
-    human_activity = ctrl.Antecedent(np.arange(0, 101, 1), 'human_activity')
-    historical_landslides = ctrl.Antecedent(np.arange(0, 101, 1), 'historical_landslides')
-    drainage_system = ctrl.Antecedent(np.arange(0, 101, 1), 'drainage_system')
-    vegetated_surface = ctrl.Antecedent(np.arange(0, 101, 1), 'vegetated_surface')
-    soil_nailing = ctrl.Antecedent(np.arange(0, 101, 1), 'soil_nailing')
-    slope_netting = ctrl.Antecedent(np.arange(0, 101, 1), 'slope_netting')
-    gabion_wall = ctrl.Antecedent(np.arange(0, 101, 1), 'gabion_wall')
-    rubble_wall = ctrl.Antecedent(np.arange(0, 101, 1), 'rubble_wall')
-    soil_type = ctrl.Antecedent(np.arange(0, 6, 1), 'soil_type')
-    slope_nature = ctrl.Antecedent(np.arange(0, 101, 1), 'slope_nature')
-    
-    landslide_risk = ctrl.Consequent(np.arange(0, 101, 1), 'landslide_risk')
-    
-    # Auto-membership function population
-    rainfall.automf(3)
-    soil_moisture.automf(3)
-    slope_steepness.automf(3)
-    human_activity.automf(3)
-    historical_landslides.automf(3)
-    drainage_system.automf(3)
-    vegetated_surface.automf(3)
-    soil_nailing.automf(3)
-    slope_netting.automf(3)
-    gabion_wall.automf(3)
-    rubble_wall.automf(3)
-    
-    # Custom membership functions
-    soil_type['clay'] = fuzz.trimf(soil_type.universe, [0, 0, 1])
-    soil_type['sand'] = fuzz.trimf(soil_type.universe, [1, 1, 2])
-    soil_type['loam'] = fuzz.trimf(soil_type.universe, [2, 2, 3])
-    soil_type['peat'] = fuzz.trimf(soil_type.universe, [3, 3, 4])
-    soil_type['chalk'] = fuzz.trimf(soil_type.universe, [4, 4, 5])
-    soil_type['silt'] = fuzz.trimf(soil_type.universe, [5, 5, 5])
-    
-    slope_nature['natural'] = fuzz.trimf(slope_nature.universe, [0, 0, 50])
-    slope_nature['engineered'] = fuzz.trimf(slope_nature.universe, [50, 100, 100])
-    
-    landslide_risk['safe'] = fuzz.trimf(landslide_risk.universe, [0, 0, 30])
-    landslide_risk['moderate'] = fuzz.trimf(landslide_risk.universe, [20, 50, 80])
-    landslide_risk['high'] = fuzz.trimf(landslide_risk.universe, [70, 100, 100])
-    
-    # Rules definition
-    rules = [
-        ctrl.Rule(antecedent=((rainfall['poor'] & soil_moisture['poor']) |
-                              (slope_steepness['poor'] & vegetated_surface['good']) |
-                              (human_activity['good'] & historical_landslides['good'])),
-                  consequent=landslide_risk['high']),
-        ctrl.Rule(antecedent=((rainfall['average'] & drainage_system['average']) |
-                              (soil_type['clay'] & slope_nature['natural'])),
-                  consequent=landslide_risk['moderate']),
-        ctrl.Rule(antecedent=((rainfall['good'] & soil_moisture['good']) |
-                              (vegetated_surface['poor'] & slope_steepness['good'])),
-                  consequent=landslide_risk['safe'])
-    ]
-    
-    # Control System Creation and Simulation
-    landslide_ctrl = ctrl.ControlSystem(rules)
-    landslide_simulation = ctrl.ControlSystemSimulation(landslide_ctrl)
-    
-    return landslide_simulation
-
-def calculate_landslide_risk(fuzzy_system, inputs):
-    """
-    Calculates landslide risk using the provided fuzzy system and inputs.
-    
-    Parameters:
-    - fuzzy_system: The fuzzy control system simulation instance.
-    - inputs: A dictionary of input values for the fuzzy system.
-
-    Returns:
-    - float: The calculated landslide risk score.
-    """
-    for key, value in inputs.items():
-        fuzzy_system.input[key] = value
-    fuzzy_system.compute()
-    return fuzzy_system.output['landslide_risk']
-
-def map_risk_to_category(risk_score):
-    if risk_score <= 30:
-        return "Safe"
-    elif 30 < risk_score <= 70:
-        return "Moderate"
-    else:
-        return "High"
-    
 def get_risk_color(risk_category):
     if risk_category == "Safe":
         return "#32CD32"  # LimeGreen
@@ -159,7 +85,13 @@ def get_risk_color(risk_category):
     else:
         return "#FF0000"  # Red
 
+def get_risk_rgba(risk_category, alpha=160):
+    # pydeck colour of a risk category, matching get_risk_color
+    color = get_risk_color(risk_category)
+    return [int(color[i:i + 2], 16) for i in (1, 3, 5)] + [alpha]
+
 st.title("Landslide Risk Assessment System ⚒️")
+record_span("landslide.first_paint", time.perf_counter() - rerun_started)
 
 # Sidebar setup
 with st.sidebar:
@@ -168,6 +100,11 @@ with st.sidebar:
         "This app uses a fuzzy logic system to assess landslide risk based on input parameters. "
         "Adjust the parameters and click 'Calculate Risk' to see the results on the map."
     )
+    use_lookup_table = st.toggle(
+        "Fast scoring from lookup table",
+        help="Score from a precomputed, memory-mapped response surface of the fuzzy model "
+             "instead of evaluating it exactly. Run `python fuzzy_lookup.py` for its error report."
+    )
     st.markdown("---")
     st.write("This application is for authorized use only.")
     st.markdown("Copyright © Make Water OK Malaysia")
@@ -308,56 +245,114 @@ with st.form("risk_assessment_form"):
         help="Information on past landslides can help evaluate the risk of recurrence."
     )
 
+    st.markdown("#### Uncertainty Analysis")
+    col_uncertainty, col_samples = st.columns(2)
+    with col_uncertainty:
+        estimate_uncertainty = st.checkbox(
+            "Estimate Uncertainty Bands", value=True,
+            help="Resample rainfall, soil moisture, slope, vegetation and drainage around the entered values "
+                 "and report the spread of the risk score."
+        )
+        parallel_uncertainty = st.checkbox(
+            "Run Samples in Parallel Across CPU Cores",
+            help="Worth it for large sample counts; small runs are faster in a single process. "
+                 "The first parallel run starts the worker processes, later runs reuse them."
+        )
+    with col_samples:
+        uncertainty_samples = st.number_input(
+            "Number of Samples:", min_value=1000, max_value=1_000_000, value=MONTE_CARLO_SAMPLES, step=1000
+        )
+
+    st.markdown("#### GIS Map Mode")
+    col_mode, col_resolution = st.columns(2)
+    with col_mode:
+        map_mode = st.radio(
+            "Map Display:",
+            ('Assessment Point', 'Penang Risk Surface'),
+            help="Show only the assessed location, or score a grid over every Penang constituency."
+        )
+    with col_resolution:
+        surface_resolution = st.slider(
+            "Risk Surface Grid Resolution (cells per side):",
+            min_value=50, max_value=400, value=150, step=50,
+            help="Number of grid cells along each side of the Penang extent in risk surface mode."
+        )
+    col_history, col_window = st.columns(2)
+    with col_history:
+        show_past_assessments = st.checkbox(
+            "Show Past Assessments on Map", value=True,
+            help="Every calculated assessment is recorded; overlay the earlier ones, coloured by risk level."
+        )
+    with col_window:
+        history_days = st.slider(
+            "Past Assessment Window (days):",
+            min_value=7, max_value=365, value=90,
+            help="Show assessments made up to this many days before the assessment date."
+        )
+
+    st.markdown("#### Season Simulation")
+    col_simulation, col_rainfall_record = st.columns(2)
+    with col_simulation:
+        run_season_simulation = st.checkbox(
+            "Simulate Daily Rainfall Over a Season",
+            help="Step soil moisture and risk day by day for every recorded slope on the map, "
+                 "starting from each slope's latest assessment."
+        )
+        season_days = st.slider(
+            "Synthetic Season Length (days):",
+            min_value=30, max_value=365, value=92,
+            help="Length of the synthetic rainfall series used when no rainfall record is uploaded."
+        )
+    with col_rainfall_record:
+        rainfall_record = st.file_uploader(
+            "Daily Rainfall Record (CSV with a date column and rainfall in mm):", type=['csv'],
+            help="Leave empty to simulate rainfall following Penang's monthly averages from the assessment date."
+        )
+
     submit_button = st.form_submit_button("Calculate Risk")
 
 if submit_button:
-    human_activity_levels = {'Absent': 0, 'Present': 100}
-    vegetation_coverage_levels = {
-        '0-10%': 5, '11-20%': 15, '21-30%': 25,
-        '31-40%': 35, '41-50%': 45, '51-60%': 55,
-        '61-70%': 65, '71-80%': 75, '81-90%': 85,
-        '91-100%': 95
-    }
-    drainage_conditions = {'Clogged': 25, 'Requires Maintenance': 50, 'In Good Condition': 75}
-    historical_landslide_presence = {'Yes': 100, 'No': 0}
-    slope_nature_levels = {'Natural': 0, 'Engineered': 100}
-    slope_stabilization_measures = {
-        'Soil Nails': 100,
-        'Erosion Control Netting': 100,
-        'Gabion Walls': 100,
-        'Rubble Masonry Walls': 100
-    }
-    soil_types = {'Clay': 0, 'Sand': 1, 'Loam': 2, 'Peat': 3, 'Chalk': 4, 'Silt': 5}
-
-    def convert_slope_steepness_to_numerical(slope_steepness_category):
-        slope_steepness_mapping = {
-            '0-4.9 (Very Gentle)': 5,
-            '5-9.9 (Gentle)': 10,
-            '10-14.9 (Moderate)': 15,
-            '15-19.9 (Steep)': 20,
-            '20-24.9 (Very Steep)': 25,
-            '25-29.9 (Extremely Steep)': 30,
-            '>=30 (Precipitous)': 35
-        }
-        return slope_steepness_mapping[slope_steepness_category]
-
-    inputs = {
+    import pydeck as pdk
+
+    # Form values go through the same encoding as the batch CLI (landslide_batch.py)
+    inputs = encode_site({
         'rainfall': expected_rainfall,
         'soil_moisture': level_of_soil_moisture,
-        'slope_steepness': convert_slope_steepness_to_numerical(slope_steepness_selection),
-        'human_activity': human_activity_levels[presence_of_human_activity],
-        'historical_landslides': historical_landslide_presence[historical_landslide_occurrences],
-        'soil_type': soil_types[selection_of_soil_type],
-        'drainage_system': drainage_conditions[drainage_system_condition],
-        'vegetated_surface': vegetation_coverage_levels[coverage_of_vegetation],
-        'slope_nature': slope_nature_levels[slope_nature]
-    }
-
-    fuzzy_system = create_fuzzy_system()
-    risk_score = calculate_landslide_risk(fuzzy_system, inputs)
+        'slope_steepness': slope_steepness_selection,
+        'human_activity': presence_of_human_activity,
+        'historical_landslides': historical_landslide_occurrences,
+        'soil_type': selection_of_soil_type,
+        'drainage_system': drainage_system_condition,
+        'vegetated_surface': coverage_of_vegetation,
+        'slope_nature': slope_nature,
+        'soil_nailing': installed_soil_nail,
+        'slope_netting': installed_netting,
+        'gabion_wall': installed_gabion,
+        'rubble_wall': installed_rubble,
+    })
+
+    # Stabilization measures: the stronger of the form checkbox and the photo's detection confidence
+    slope_photo = st.session_state.get("slope_photo")
+    detected_measures = {}
+    if slope_photo is not None:
+        from annotation_cache import annotate_upload
+
+        with span("landslide.image_annotate"):
+            detected_measures = annotate_upload(slope_photo.getvalue())[1]
+    for measure in MEASURE_INPUTS:
+        inputs[measure] = max(inputs[measure], detected_measures.get(measure, 0))
+
+    with span("landslide.fuzzy_build"):
+        fuzzy_engine = get_fuzzy_lookup() if use_lookup_table else get_fuzzy_engine()
+    with span("landslide.compute"):
+        risk_score = fuzzy_engine.evaluate(inputs)
     risk_category = map_risk_to_category(risk_score)
     risk_color = get_risk_color(risk_category)
 
+    with span("landslide.assessment_record"):
+        assessment_store = get_assessment_store()
+        assessment_store.record(assessment_date, latitude, longitude, inputs, risk_score, risk_category)
+
     st.markdown(f"""
     <div style='background-color:#f0f2f6; padding:20px; border-radius:12px; border: 4px solid {risk_color}; margin-bottom: 20px; text-align:center;'>
         <h2 style='color:{risk_color}; font-size: 24px; font-family: Arial, sans-serif;'>
@@ -367,7 +362,77 @@ if submit_button:
     """, unsafe_allow_html=True)
 
     st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
-    
+
+    # Monte Carlo uncertainty: all samples scored as one batch (or one batch per process)
+    if estimate_uncertainty:
+        with st.expander("Uncertainty Bands 🎲", expanded=True):
+            with span("landslide.uncertainty"):
+                sample_scores = sample_risk_scores(inputs, n_samples=uncertainty_samples, engine=fuzzy_engine,
+                                                   workers=0 if parallel_uncertainty else 1)
+                uncertainty_summary = summarize_risk_scores(sample_scores)
+            col_p5, col_p50, col_p95, col_high = st.columns(4)
+            col_p5.metric("P5 Risk Score", f"{uncertainty_summary['p5']:.2f}%")
+            col_p50.metric("Median Risk Score", f"{uncertainty_summary['p50']:.2f}%")
+            col_p95.metric("P95 Risk Score", f"{uncertainty_summary['p95']:.2f}%")
+            col_high.metric("Probability of High Risk", f"{uncertainty_summary['p_high']:.1%}")
+            score_counts, _ = np.histogram(sample_scores[~np.isnan(sample_scores)], bins=50, range=(0, 100))
+            st.bar_chart(pd.DataFrame({"Risk Score": np.arange(1, 100, 2), "Samples": score_counts}),
+                         x="Risk Score", y="Samples")
+            st.caption(f"{uncertainty_summary['samples']:,} of {uncertainty_samples:,} samples scored.")
+
+    # What-if sensitivity: every input swept on its own, scored in one batch
+    with st.expander("What-if Sensitivity Analysis 🌪️", expanded=True):
+        with span("landslide.sensitivity"):
+            sweep = sweep_inputs(inputs, engine=fuzzy_engine)
+            sweep["input"] = sweep["input"].str.replace("_", " ").str.title()
+            tornado = tornado_table(sweep, risk_score).reset_index()
+
+        st.markdown("#### Risk Score Range per Input")
+        st.vega_lite_chart(tornado, {
+            "layer": [
+                {
+                    "mark": {"type": "bar", "color": "#FFA500"},
+                    "encoding": {
+                        "y": {"field": "input", "type": "nominal", "sort": None, "title": None},
+                        "x": {"field": "min_score", "type": "quantitative", "title": "Landslide Risk Score",
+                              "scale": {"domain": [0, 100]}},
+                        "x2": {"field": "max_score"},
+                        "tooltip": [
+                            {"field": "input", "title": "Input"},
+                            {"field": "min_score", "title": "Lowest score", "format": ".2f"},
+                            {"field": "min_value", "title": "at value"},
+                            {"field": "max_score", "title": "Highest score", "format": ".2f"},
+                            {"field": "max_value", "title": "at value"},
+                        ],
+                    },
+                },
+                {
+                    "mark": {"type": "rule", "color": risk_color, "strokeWidth": 2},
+                    "encoding": {"x": {"datum": risk_score}},
+                },
+            ],
+        }, use_container_width=True)
+
+        st.markdown("#### Risk Score Response Curves")
+        st.vega_lite_chart(sweep, {
+            "facet": {"field": "input", "type": "nominal", "title": None,
+                      "sort": tornado["input"].tolist()},
+            "columns": 4,
+            "spec": {
+                "width": 160,
+                "height": 110,
+                "mark": {"type": "line", "color": "#FF4500"},
+                "encoding": {
+                    "x": {"field": "value", "type": "quantitative", "title": None},
+                    "y": {"field": "risk_score", "type": "quantitative", "title": "Risk",
+                          "scale": {"domain": [0, 100]}},
+                },
+            },
+            "resolve": {"scale": {"x": "independent"}},
+        })
+        st.caption(f"Each input swept across its range with the others held at the assessed values "
+                   f"({len(sweep)} scenarios).")
+
     map_data = pd.DataFrame({
         'lat': [latitude],
         'lon': [longitude],
@@ -389,25 +454,161 @@ if submit_button:
         get_color='[200, 30, 0, 160]' if risk_category == 'High' else '[30, 200, 0, 160]',
         get_radius=100,
     )
+    layers = [risk_layer]
+
+    if map_mode == 'Penang Risk Surface':
+        penang_index = get_penang_index()
+        # Each cell takes the slope inputs of the nearest stored assessment and this form's weather;
+        # the form alone would give every cell the same score
+        with span("landslide.risk_surface"):
+            surface_sites = latest_per_site(assessment_store.query_bounds(penang_index.bounds))
+            grid_lon, grid_lat = build_grid(penang_index.bounds, surface_resolution, surface_resolution)
+            surface_inputs = {**inputs, **site_input_grids(
+                surface_sites, grid_lon, grid_lat, [name for name in INPUT_COLUMNS if name not in REGIONAL_INPUTS])}
+            surface_data = compute_risk_surface(surface_inputs, n_lon=surface_resolution, n_lat=surface_resolution,
+                                                index=penang_index, engine=fuzzy_engine)
+        min_lon, min_lat, max_lon, max_lat = penang_index.bounds
+        view_state = pdk.ViewState(
+            latitude=(min_lat + max_lat) / 2,
+            longitude=(min_lon + max_lon) / 2,
+            zoom=10,
+            pitch=50,
+        )
+        surface_layer = pdk.Layer(
+            "GridLayer",
+            data=surface_data,
+            get_position='[lon, lat]',
+            get_color_weight='risk_score',
+            color_aggregation='MEAN',
+            get_elevation_weight='risk_score',
+            elevation_aggregation='MEAN',
+            elevation_scale=4,
+            cell_size=grid_cell_size_m(penang_index, surface_resolution, surface_resolution),
+            extruded=True,
+            pickable=True,
+        )
+        layers = [surface_layer, risk_layer] if len(surface_data) else [risk_layer]
+
+    # Earlier assessments come from the store's R*Tree, limited to the map extent and time window
+    if show_past_assessments:
+        window_start = assessment_date - datetime.timedelta(days=history_days)
+        if map_mode == 'Penang Risk Surface':
+            past_assessments = assessment_store.query_bounds(penang_index.bounds, window_start, assessment_date)
+        else:
+            past_assessments = assessment_store.query_radius(latitude, longitude, 20_000, window_start,
+                                                             assessment_date)
+        past_assessments["color"] = past_assessments["risk_category"].map(get_risk_rgba)
+        past_layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=past_assessments[["lon", "lat", "color"]],
+            get_position='[lon, lat]',
+            get_fill_color='color',
+            get_radius=60,
+        )
+        layers.insert(len(layers) - 1, past_layer)
 
     st.title("GIS Mapping for Landslide Risk Assessment 🗺️")
     
-    st.pydeck_chart(pdk.Deck(
-        map_style='mapbox://styles/mapbox/light-v9',
-        initial_view_state=view_state,
-        layers=[risk_layer],
-    ))
-    
+    with span("landslide.plot_render"):
+        st.pydeck_chart(pdk.Deck(
+            map_style='mapbox://styles/mapbox/light-v9',
+            initial_view_state=view_state,
+            layers=layers,
+        ))
+    if map_mode == 'Penang Risk Surface':
+        if len(surface_data):
+            st.caption(f"Risk surface from {len(surface_sites)} assessed slopes: cells within "
+                       f"{SITE_INFLUENCE_M / 1000:g} km of a slope take its recorded conditions with this form's "
+                       f"rainfall and soil moisture; other cells are not scored.")
+        else:
+            st.info("No assessed slopes lie inside Penang yet, so there is no risk surface to draw. "
+                    "Record assessments across the island to build one up.")
+    if show_past_assessments:
+        st.caption(f"{len(past_assessments)} assessments in the {history_days} days up to {assessment_date:%d %b %Y}.")
+
+    site_trend = assessment_store.site_trend(latitude, longitude)
+    if len(site_trend) > 1:
+        st.markdown("#### Risk Trend for This Slope")
+        st.line_chart(site_trend, x="assessment_date", y="risk_score")
+    else:
+        st.caption("This is the first recorded assessment of this slope.")
+
+    if run_season_simulation:
+        st.title("Season Simulation 🌧️")
+        try:
+            if rainfall_record is not None:
+                season_rainfall = load_rainfall_csv(rainfall_record)
+            else:
+                season_rainfall = synthetic_rainfall(assessment_date, days=season_days)
+        except (ValueError, pd.errors.ParserError) as error:
+            st.error(f"Could not read the rainfall record: {error}")
+            season_rainfall = None
+
+        season_sites = None
+        if season_rainfall is not None and len(season_rainfall):
+            # Every slope on the map starts from its latest recorded assessment
+            if map_mode == 'Penang Risk Surface':
+                season_sites = assessment_store.query_bounds(penang_index.bounds)
+            else:
+                season_sites = assessment_store.query_radius(latitude, longitude, 20_000)
+            season_sites = latest_per_site(season_sites)
+
+        if season_sites is not None and not season_sites.empty:
+            site_inputs = {name: season_sites[name].to_numpy(dtype=np.float64) for name in INPUT_COLUMNS}
+
+            # Results stream in day by day; only the daily summary and running peaks are kept
+            progress = st.progress(0.0)
+            daily_chart = st.empty()
+            season_peaks = SeasonPeaks(len(season_sites))
+            daily_summary = []
+            season_started = time.perf_counter()
+            season_days_simulated = simulate_season(season_rainfall, site_inputs, engine=fuzzy_engine)
+            for date, soil_moisture, site_scores in season_days_simulated:
+                season_peaks.update(date, site_scores)
+                daily_summary.append({
+                    "date": date,
+                    "Rainfall (mm)": season_rainfall[date],
+                    "Mean Soil Moisture (%)": soil_moisture.mean(),
+                    "Highest Risk Score": np.fmax.reduce(site_scores),
+                })
+                if season_peaks.days % 7 == 0 or season_peaks.days == len(season_rainfall):
+                    daily_chart.line_chart(pd.DataFrame(daily_summary).set_index("date"))
+                progress.progress(season_peaks.days / len(season_rainfall),
+                                  text=f"Simulated {season_peaks.days}/{len(season_rainfall)} days")
+            record_span("landslide.season_simulation", time.perf_counter() - season_started)
+
+            season_summary = pd.concat([season_sites[["lat", "lon", "assessment_date", "risk_score"]],
+                                        season_peaks.to_frame()], axis=1)
+            st.markdown("#### Peak Risk per Slope")
+            st.dataframe(season_summary.sort_values("peak_risk_score", ascending=False), hide_index=True,
+                         column_config={
+                             "assessment_date": "Last Assessed",
+                             "risk_score": st.column_config.NumberColumn("Assessed Risk", format="%.2f"),
+                             "peak_risk_score": st.column_config.NumberColumn("Peak Risk", format="%.2f"),
+                             "peak_date": st.column_config.DateColumn("Peak Risk Date"),
+                         })
+            st.caption(f"{len(season_sites)} slopes over {len(season_rainfall)} days "
+                       f"({season_rainfall.sum():.0f} mm of rain).")
+        elif season_sites is not None:
+            st.info("No assessed slopes lie in the mapped area, so there is nothing to simulate. "
+                    "Record assessments inside Penang, or switch to the assessment point map.")
+        elif season_rainfall is not None:
+            st.warning("The rainfall record has no days to simulate.")
+
 st.title("Upload an Image For Visual Inspection 📸")
 
-uploaded_file = st.file_uploader("Choose an image...", type=['jpg', 'jpeg', 'png'])
+uploaded_file = st.file_uploader("Choose an image...", type=['jpg', 'jpeg', 'png'], key="slope_photo",
+                                 help="Detected slope protection measures also count towards the risk score.")
 
 if uploaded_file is not None:
+    from annotation_cache import annotate_upload
+
     bytes_data = uploaded_file.getvalue()
-    image_np = np.array(Image.open(io.BytesIO(bytes_data)))
-    annotated_image_np = detect_and_annotate(image_np)
-    annotated_image = Image.fromarray(annotated_image_np.astype('uint8'), 'RGB')
+    with span("landslide.image_annotate"):
+        annotated_image, protection_scores = annotate_upload(bytes_data)
     st.image(annotated_image, caption='Processed Image with Annotation', use_column_width=True)
+    st.caption("Detection confidence: " + ", ".join(
+        f"{measure.replace('_', ' ').title()} {score:.0f}%" for measure, score in protection_scores.items()))
     st.success("A Landslide Risk Analysis Report is generated.")
     
     with st.expander("View Landslide Risk Analysis Report 📄", expanded=False):
@@ -417,4 +618,48 @@ if uploaded_file is not None:
         st.download_button(label="Download Report", 
                            data=risk_analysis_text,
                            file_name="Landslide_Risk_Analysis_Report.txt",
-                           mime="text/plain")
\ No newline at end of file
+                           mime="text/plain")
+
+st.title("Batch Visual Inspection 🗂️")
+
+batch_files = st.file_uploader("Choose site photos or zip archives...", type=['jpg', 'jpeg', 'png', 'zip'],
+                               accept_multiple_files=True)
+batch_path = st.text_input("Or enter a folder or zip archive path on the server")
+fast_previews = st.checkbox("Fast previews (reduced-resolution decode, approximate annotations)")
+
+if st.button("Run Batch Inspection"):
+    from batch_inspection import inspect_images, iter_image_sources, iter_uploaded_sources
+
+    def open_batch_sources():
+        return iter_image_sources(batch_path) if batch_path else iter_uploaded_sources(batch_files)
+
+    # Count the photos first, then stream them: each zip archive is only open while its members are read
+    try:
+        batch_total = sum(1 for _ in open_batch_sources())
+    except (OSError, ValueError, zipfile.BadZipFile) as error:
+        st.error(f"Could not open the photos: {error}")
+        batch_total = None
+
+    if batch_total:
+        # Results are shown as they complete; previews keep the page light for hundreds of photos
+        progress = st.progress(0.0)
+        result_columns = st.columns(3)
+        failures = 0
+        batch_started = time.perf_counter()
+        batch_results = inspect_images(open_batch_sources(), preview_side=640, reduced_decode=fast_previews)
+        for done, (name, annotated_image_np, error) in enumerate(batch_results, 1):
+            column = result_columns[(done - 1) % len(result_columns)]
+            if error is None:
+                column.image(annotated_image_np, caption=name, channels="BGR", use_column_width=True)
+            else:
+                failures += 1
+                column.error(f"{name}: {error}")
+            progress.progress(min(done / batch_total, 1.0), text=f"Inspected {done}/{batch_total} photos")
+        record_span("landslide.batch_inspection", time.perf_counter() - batch_started)
+        st.success(f"Inspected {batch_total - failures} photos"
+                   + (f"; {failures} could not be read." if failures else "."))
+    elif batch_total is not None:
+        st.warning("No photos to inspect.")
+
+finish_rerun("landslide", rerun_started)
+render_span_panel()
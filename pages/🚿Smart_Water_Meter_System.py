@@ -1,14 +1,30 @@
+import time
+
+# Rerun timing starts before the third party imports, which dominate a cold start
+rerun_started = time.perf_counter()
+
 import streamlit as st
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from streamlit_image_comparison import image_comparison
+
+from leak_detector import get_leak_detector
+from meter_stream import get_meter_pipeline
+from reading_store import get_reading_store
+from usage_forecast import get_usage_forecaster, usage_forecaster_error
+from usage_rollup import get_supply_rollup, get_usage_rollup, rollup_from_area_totals
+from instrumentation import finish_rerun, record_span, render_span_panel, span
+from warmup import start_warmup
+from water_charts import area_usage_chart_spec
+from water_datasets import (MONTH_ORDER, dataset_version, load_choropleth_data, load_compare_data, load_metric_data,
+                            load_reservoir_data)
+
+record_span("water.imports", time.perf_counter() - rerun_started)
+start_warmup()
 
 # Set page configuration
 st.set_page_config(page_title="Smart Water Meter System", page_icon="🚿", layout='centered', initial_sidebar_state='expanded')
 
 # Title and description of the app
 st.title("Smart Water Management Dashboard")
+record_span("water.first_paint", time.perf_counter() - rerun_started)
 st.write("---")  # Horizontal rule for visual separation
 
 # Sidebar setup
@@ -48,13 +64,35 @@ with st.sidebar:
             </ul>
         </div>
     """, unsafe_allow_html=True)
+    st.markdown("---")
+    usage_data_source = st.radio(
+        "Water Usage Data Source:",
+        ('Monthly Reports', 'Meter Reading Store'),
+        help="Read area usage and supply/demand from the 2023 monthly reports or from stored per-meter readings."
+    )
 
 # Load datasets
-V_Metric_Data = pd.read_csv('V_Metric_Data.csv')
-V_Choropleth_Data = pd.read_csv('V_Choropleth_Data.csv')
-V_Reservoir_Data = pd.read_csv('V_Reservoir_Data.csv')
-V_Compare_Data = pd.read_csv('V_Compare_Data.csv')
-data = pd.read_csv('water_data.csv')
+with span("water.data_load"):
+    V_Metric_Data = load_metric_data()
+    V_Choropleth_Data = load_choropleth_data()
+    Choropleth_Version = ("reports", dataset_version("choropleth"))
+    V_Reservoir_Data = load_reservoir_data()
+    Supply_Rollup = get_supply_rollup()
+    # The monthly reports carry their own risk label
+    Supply_Risk = load_compare_data()["Risk Assessment"].iloc[0]
+    Usage_Rollup = get_usage_rollup()
+
+if usage_data_source == 'Meter Reading Store':
+    with span("water.reading_store"):
+        reading_store = get_reading_store()
+        store_area_totals = reading_store.monthly_area_totals(2023)
+    if store_area_totals.empty:
+        st.warning("The meter reading store has no readings for 2023 yet; showing the monthly reports instead.")
+    else:
+        V_Choropleth_Data = store_area_totals
+        Choropleth_Version = ("reading_store", reading_store.version())
+        Supply_Rollup = rollup_from_area_totals(store_area_totals)
+        Supply_Risk = f"{Supply_Rollup.risk_assessment()}, provisional"
 
 def V_Metric_Data_Function(selected_month, dataset):
     container = st.container()
@@ -78,9 +116,12 @@ def V_Metric_Data_Function(selected_month, dataset):
             st.metric("Avg Humidity💧", f"{avg_humidity} %", f"{avg_humidity_delta}% from last month", delta_color="normal")
 
 def Area_Map():
+    # Imported on first use so the page can paint before the component loads
+    from streamlit_image_comparison import image_comparison
+
     with st.container():
         st.markdown("<h3 style='text-align: center;'>Area Map of Penang Hill Biosphere Reserve</h3>", unsafe_allow_html=True)
-        image_comparison(img1="slide2.png", img2="slide1.png", width=670)
+        image_comparison(img1="slide2.png", img2="slide1.png", width=670, in_memory=True)
     
     with st.expander("Map Legend"):
         st.markdown("""
@@ -121,34 +162,20 @@ def Area_Map():
         </div>
         """, unsafe_allow_html=True)
 
-def Combined(selected_month, choropleth_data, reservoir_data):
+def Combined(selected_month, choropleth_data, reservoir_data, choropleth_version):
     container = st.container()
     with container:
         col1, col2 = st.columns((5, 5))
 
     with col1:
         st.markdown('### Area Water Usage')
-        choropleth_data.set_index('Area', inplace=True)
-        selected_month_data_choropleth = choropleth_data[[selected_month]].sort_values(by=selected_month)
-
-        plt.style.use('ggplot')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.barh(selected_month_data_choropleth.index, selected_month_data_choropleth[selected_month])
-        ax.set_xlabel('Water Usage (Litre)', fontsize=22, fontweight='bold')
-        ax.set_title('Water Usage For Selected Month', fontsize=22, fontweight='bold')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['bottom'].set_color('#DDDDDD')
-        ax.spines['left'].set_color('#DDDDDD')
-        ax.tick_params(axis='y', which='major', labelsize=22)
-        ax.tick_params(axis='x', which='major', labelsize=22)
-        for bar in bars:
-            ax.text(bar.get_width(), bar.get_y() + bar.get_height() / 2, f' {bar.get_width():.0f} L', va='center', ha='left', fontsize=10)
-        st.pyplot(fig)
+        # Native chart from a spec cached per (month, data version) and shared across sessions
+        st.vega_lite_chart(area_usage_chart_spec(selected_month, choropleth_data, choropleth_version),
+                           use_container_width=True)
             
     with col2:
         st.markdown('### Reservoir Water Level')
-        reservoir_data.set_index("Reservoir", inplace=True)
+        reservoir_data = reservoir_data.set_index("Reservoir")
         selected_month_data_reservoir = reservoir_data[selected_month]
         st.data_editor(selected_month_data_reservoir,
                        column_config={
@@ -176,7 +203,7 @@ def Combined(selected_month, choropleth_data, reservoir_data):
     "based on consumption rates, aiding in informed decisions on allocation and conservation.\n\n"
 )
 
-def display_supply_demand_ratio(selected_month, dataset):
+def display_supply_demand_ratio(selected_month, supply_rollup, supply_risk):
     st.title('Water Supply/Demand Ratio')
     st.markdown(f"""
         <style>
@@ -206,13 +233,12 @@ def display_supply_demand_ratio(selected_month, dataset):
     """, unsafe_allow_html=True)
     
     st.write("")
-    for index, row in dataset.iterrows():
-        component = row['Component']
-        supply_percentage = row[f'{selected_month} % of Max Demand']
-        supply = row[selected_month]
-        st.markdown(f"**{component}**")
-        st.progress(supply_percentage / 100)
-        st.caption(f"{supply:,.0f} L - {supply_percentage:.2f}% of highest recorded demand ({row['Risk Assessment']})")
+    component = "Penang Hill (Area N, Area E, Area S, Area W)"
+    supply_percentage = supply_rollup.percent_of_max(selected_month)
+    supply = supply_rollup.monthly_total(selected_month)
+    st.markdown(f"**{component}**")
+    st.progress(supply_percentage / 100)
+    st.caption(f"{supply:,.0f} L - {supply_percentage:.2f}% of highest recorded demand ({supply_risk})")
     st.write("---")
 
 def Leakage_Info_Function():
@@ -223,17 +249,17 @@ def Leakage_Info_Function():
             ⚠️Alert Warning⚠️
         </h3>
         """, unsafe_allow_html=True)
-        Leakage_Data = pd.DataFrame(
-            {"Area": [["Area E"], ["Area W"], ["Area N"], ["Area S"]],
-             "Abnormalities": [["4/4"], ["2/4"], ["0/4"], ["0/4"]],
-             "Indicators": [
-                ["🚨 Unusual Water Usage", "🚨 Acoustic Leak Detection", "🚨 Abnormal Water Temperature", "🚨 Abnormal Water Pressure"],
-                ["🚨 Abnormal Water Temperature", "🚨 Abnormal Water Pressure"], ["All Good!"], ["All Good!"]],})
+        leak_detector = get_leak_detector()
+        Leakage_Data = leak_detector.abnormality_table()
 
         st.data_editor(Leakage_Data, 
                        column_config={"Leakage": st.column_config.ListColumn("Abnormality",)},
                        width=670,
                        hide_index=True)
+        detector_stats = leak_detector.stats()
+        st.caption(f"Live detection over {detector_stats['readings']:,} readings · "
+                   f"{detector_stats['throughput']:,.0f} readings/s · "
+                   f"latency {detector_stats['latency'] * 1000:.0f} ms")
     
     with st.popover("4 Signs of Water Leakage", help=None, disabled=False, use_container_width=True):
         st.markdown("🚨 Unusual Water Usage : ***Keep an eye on unexpected increases or decreases in water consumption.***")
@@ -241,43 +267,83 @@ def Leakage_Info_Function():
         st.markdown("🚨 Abnormal Water Temperature : ***Look out for unusual changes in water temperature.***")
         st.markdown("🚨 Abnormal Water Pressure : ***Detect sudden and unexplained changes in water pressure.***")
 
+def Live_Meter_Feed_Function():
+    st.markdown("""
+    <h3 style="text-align: center;">
+        📡Live Meter Feed📡
+    </h3>
+    """, unsafe_allow_html=True)
+    pipeline = get_meter_pipeline()
+    live_data = pipeline.snapshot()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Readings Received", f"{pipeline.total_readings:,}")
+    with col2:
+        st.metric("Water Used in Last Hour", f"{live_data['Total Flow'].sum():,.0f} L")
+
+    st.dataframe(live_data[["Area", "Readings", "Mean Flow", "Mean Pressure", "Mean Temperature", "Max Acoustic"]],
+                 column_config={
+                     "Mean Flow": st.column_config.NumberColumn("Mean Flow per Reading (L)", format="%.1f"),
+                     "Mean Pressure": st.column_config.NumberColumn("Mean Pressure (bar)", format="%.2f"),
+                     "Mean Temperature": st.column_config.NumberColumn("Mean Temperature (°C)", format="%.1f"),
+                     "Max Acoustic": st.column_config.NumberColumn("Peak Acoustic Level (dB)", format="%.1f"),
+                 },
+                 width=670,
+                 hide_index=True)
+    st.button("Refresh Live Data")
+    st.write("---")
+
 # Display the current year
 st.markdown("### 📅 Year: 2023")
 
 # Month selection
 option = st.selectbox(
     "Select a Month to Display",
-    ("January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December")
+    MONTH_ORDER
 )
 
 # Call functions for visualization
 if __name__ == "__main__":
     V_Metric_Data_Function(option, V_Metric_Data)
-    Area_Map()
-    Combined(option, V_Choropleth_Data, V_Reservoir_Data)
-    display_supply_demand_ratio(option, V_Compare_Data)
+    with span("water.area_map"):
+        Area_Map()
+    with span("water.plot_render"):
+        Combined(option, V_Choropleth_Data, V_Reservoir_Data, Choropleth_Version)
+    display_supply_demand_ratio(option, Supply_Rollup, Supply_Risk)
     Leakage_Info_Function()
+    Live_Meter_Feed_Function()
 
 # Title for the Forecasting section
 st.title("Monthly Water Watch")
 
-# Ensure the 'Month' column is a categorical type with a defined order
-month_order = ["January", "February", "March", "April", "May", "June", 
-               "July", "August", "September", "October", "November", "December"]
-data['Month'] = pd.Categorical(data['Month'], categories=month_order, ordered=True)
-
-# Calculate the monthly average water usage
-monthly_avg = data.groupby('Month')['Avg_Usage_Litre'].mean().reset_index()
-
 # User input: select a month
-selected_month = st.selectbox("Select a Month to Display Forecasting and Advice", monthly_avg['Month'])
+selected_month = st.selectbox("Select a Month to Display Forecasting and Advice", MONTH_ORDER)
 
-# Find the average for the selected month
-selected_month_avg = monthly_avg[monthly_avg['Month'] == selected_month]['Avg_Usage_Litre'].iloc[0]
+# Look up the average for the selected month in the usage rollup
+selected_month_avg = Usage_Rollup.monthly_average(selected_month)
 
 # Display the average water usage
 st.markdown(f"For {selected_month}, the historical average water usage is <span style='color: black; font-weight: bold;'>{selected_month_avg:,.0f} litres</span>.", unsafe_allow_html=True)
 
+# Per-area forecast from the fitted usage models (fitted in the background on first use)
+usage_forecaster = get_usage_forecaster()
+forecaster_error = usage_forecaster_error()
+if forecaster_error is not None:
+    st.warning(f"⚠️ The usage forecasting model could not be prepared ({forecaster_error}). It is retried once water_data.csv changes.")
+elif usage_forecaster is None:
+    st.caption("⏳ The usage forecasting model is being prepared. Refresh shortly for per-area forecasts.")
+else:
+    with span("water.forecast"):
+        usage_forecast = usage_forecaster.forecast_month(selected_month)
+    st.markdown(f"The forecasting model expects <span style='color: black; font-weight: bold;'>{usage_forecast['Forecast_Usage_Litre'].sum():,.0f} litres</span> across all areas in {selected_month}.", unsafe_allow_html=True)
+    st.dataframe(usage_forecast,
+                 column_config={
+                     "Forecast_Usage_Litre": st.column_config.NumberColumn("Forecast Usage (Litre)", format="%.0f"),
+                 },
+                 width=670,
+                 hide_index=True)
+
 # Provide recommendations based on the average
 if selected_month == "January":
     st.success(f"🎉 Warning: Expect increased water consumption in {selected_month} due to the Chinese New Year Festival. Implement water-saving tactics and monitor usage closely to manage the surge.")
@@ -293,3 +359,6 @@ elif selected_month_avg > 2000000:
     st.warning(f"🔍 Note: Moderate water usage expected in {selected_month}. It's a good time to check for any inefficiencies in water use.")
 else:
     st.info(f"💧 Low water usage expected in {selected_month}. This is typically a lower demand period.")
+
+finish_rerun("water", rerun_started)
+render_span_panel()
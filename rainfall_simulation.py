@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from fuzzy_engine import get_fuzzy_engine
+
+# Average monthly rainfall (mm) at Penang, January to December
+PENANG_MONTHLY_RAINFALL_MM = [70, 90, 150, 230, 220, 170, 190, 240, 340, 400, 260, 130]
+
+# Bucket water balance of the slope soil column
+SOIL_STORAGE_MM = 200.0        # Water held by the soil column at 100% soil moisture
+EVAPOTRANSPIRATION_MM = 4.0    # Daily loss to evaporation and plant uptake
+DRAINAGE_RATE = 0.05           # Fraction of the stored water draining away per day
+
+# The fuzzy model's rainfall input is a three-month total
+RAINFALL_WINDOW_DAYS = 90
+
+
+def synthetic_rainfall(start_date, days=92, seed=None, monthly_rainfall_mm=PENANG_MONTHLY_RAINFALL_MM):
+    """
+    Generates a daily rainfall series following Penang's monthly climatology.
+
+    Wet days occur more often in wetter months and their amounts are gamma
+    distributed, so every month's expected total matches monthly_rainfall_mm.
+
+    Parameters:
+    - start_date: First day of the series.
+    - days: Length of the series.
+    - seed: Random seed.
+    - monthly_rainfall_mm: Average rainfall of each calendar month.
+
+    Returns:
+    - pd.Series: Rainfall in mm, indexed by date.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(pd.Timestamp(start_date).normalize(), periods=days, freq="D")
+    daily_mean = np.asarray(monthly_rainfall_mm, dtype=np.float64)[dates.month - 1] / dates.days_in_month
+    wet_probability = np.clip(0.2 + daily_mean / 20, 0.2, 0.8)
+    shape = 0.8
+    amount = rng.gamma(shape, daily_mean / (wet_probability * shape))
+    rainfall = np.where(rng.random(days) < wet_probability, amount, 0.0)
+    return pd.Series(rainfall, index=dates, name="rainfall_mm")
+
+
+def load_rainfall_csv(path_or_buffer, date_column="date", rainfall_column=None):
+    """
+    Reads a rainfall record and totals it per day.
+
+    Parameters:
+    - path_or_buffer: CSV file with a date column and a rainfall column in mm;
+      sub-daily records are summed per day and missing days count as dry.
+    - date_column: Name of the date column.
+    - rainfall_column: Name of the rainfall column (default: the first numeric column).
+
+    Returns:
+    - pd.Series: Rainfall in mm, indexed by date.
+    """
+    data = pd.read_csv(path_or_buffer)
+    if date_column not in data.columns:
+        raise ValueError(f"The rainfall file has no '{date_column}' column.")
+    if rainfall_column is None:
+        numeric = [column for column in data.select_dtypes("number").columns if column != date_column]
+        if not numeric:
+            raise ValueError("The rainfall file has no numeric rainfall column.")
+        rainfall_column = numeric[0]
+    rainfall = pd.Series(data[rainfall_column].to_numpy(dtype=np.float64),
+                         index=pd.to_datetime(data[date_column]), name="rainfall_mm")
+    return rainfall.sort_index().resample("D").sum().clip(lower=0)
+
+
+def simulate_season(rainfall, site_inputs, engine=None, storage_mm=SOIL_STORAGE_MM, antecedent_rainfall_mm=None):
+    """
+    Steps soil moisture and landslide risk of many sites through a rainfall series, one day at a time.
+
+    Each day the rain fills every site's soil bucket, evapotranspiration and
+    drainage empty it, and water beyond storage_mm runs off. The whole set of
+    sites is then scored in one evaluate_batch call with the updated soil
+    moisture and the trailing three-month rainfall. Only the current day is
+    held in memory, so seasons and grids of any size can be simulated.
+
+    Parameters:
+    - rainfall: Daily rainfall in mm, as from synthetic_rainfall or load_rainfall_csv.
+    - site_inputs: Fuzzy inputs keyed by name, each a scalar or an array with
+      one value per site. soil_moisture is the starting moisture; rainfall is
+      ignored and replaced by the series.
+    - engine: Scorer with an evaluate_batch method, the compiled fuzzy engine by default.
+    - storage_mm: Water held by the soil column at 100% soil moisture.
+    - antecedent_rainfall_mm: Rainfall of the RAINFALL_WINDOW_DAYS days before
+      the series starts (default: the series' own average rate).
+
+    Returns:
+    - generator: (date, soil moisture per site, risk score per site) for every day.
+    """
+    engine = engine or get_fuzzy_engine()
+    n_sites = max((np.size(value) for value in site_inputs.values()), default=1)
+    static_inputs = {name: np.broadcast_to(np.asarray(value, dtype=np.float64), (n_sites,))
+                     for name, value in site_inputs.items() if name not in ('rainfall', 'soil_moisture')}
+    initial_moisture = np.asarray(site_inputs.get('soil_moisture', 50), dtype=np.float64)
+    storage = np.broadcast_to(initial_moisture / 100 * storage_mm, (n_sites,)).copy()
+
+    # Trailing rainfall window, primed with the days before the series
+    if antecedent_rainfall_mm is None:
+        antecedent_rainfall_mm = float(rainfall.mean()) * RAINFALL_WINDOW_DAYS if len(rainfall) else 0.0
+    window = np.full(RAINFALL_WINDOW_DAYS, antecedent_rainfall_mm / RAINFALL_WINDOW_DAYS)
+    for day, (date, rain) in enumerate(rainfall.items()):
+        window[day % RAINFALL_WINDOW_DAYS] = rain
+        three_month_rainfall = window.sum()
+
+        # Water balance: rain in, evapotranspiration and drainage out, overflow runs off
+        storage += rain
+        storage -= EVAPOTRANSPIRATION_MM + DRAINAGE_RATE * storage
+        np.clip(storage, 0.0, storage_mm, out=storage)
+        soil_moisture = storage / storage_mm * 100
+
+        scores = engine.evaluate_batch({**static_inputs, 'rainfall': three_month_rainfall,
+                                        'soil_moisture': soil_moisture})
+        yield date, soil_moisture, np.broadcast_to(scores, (n_sites,))
+
+
+class SeasonPeaks:
+    """
+    Running per-site maximum of a streamed simulation.
+
+    Feed it every day of simulate_season with ``update``; ``to_frame`` then
+    holds each site's peak risk score and the first date it was reached.
+    """
+
+    def __init__(self, n_sites):
+        self.peak_risk_score = np.full(n_sites, np.nan)
+        self.peak_date = np.full(n_sites, np.datetime64("NaT"), dtype="datetime64[D]")
+        self.days = 0
+
+    def update(self, date, risk_score):
+        # NaN scores (no rule fired) never replace a peak
+        higher = (risk_score > self.peak_risk_score) | (np.isnan(self.peak_risk_score) & ~np.isnan(risk_score))
+        self.peak_risk_score[higher] = risk_score[higher]
+        self.peak_date[higher] = np.datetime64(pd.Timestamp(date).date(), "D")
+        self.days += 1
+
+    def to_frame(self):
+        return pd.DataFrame({"peak_risk_score": self.peak_risk_score,
+                             "peak_date": pd.to_datetime(self.peak_date)})
+
+
+if __name__ == "__main__":
+    # Simulate a monsoon season over a grid of sites and report throughput
+    import sys
+    import time
+
+    from fuzzy_lookup import get_fuzzy_lookup
+
+    n_sites = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = np.random.default_rng(0)
+    rainfall = synthetic_rainfall("2023-09-01", days=92, seed=0)
+    site_inputs = {
+        'soil_moisture': rng.uniform(20, 80, n_sites),
+        'slope_steepness': rng.choice([5, 10, 15, 20, 25, 30, 35], n_sites),
+        'vegetated_surface': rng.choice(np.arange(5, 100, 10), n_sites),
+        'human_activity': rng.choice([0, 100], n_sites),
+        'historical_landslides': rng.choice([0, 100], n_sites),
+        'drainage_system': rng.choice([25, 50, 75], n_sites),
+        'soil_type': rng.integers(0, 6, n_sites),
+        'slope_nature': rng.choice([0, 100], n_sites),
+    }
+    print(f"Season: {len(rainfall)} days, {rainfall.sum():.0f} mm")
+    for label, engine in (("exact", get_fuzzy_engine()), ("lookup", get_fuzzy_lookup())):
+        peaks = SeasonPeaks(n_sites)
+        started = time.perf_counter()
+        for date, soil_moisture, risk_score in simulate_season(rainfall, site_inputs, engine):
+            peaks.update(date, risk_score)
+        elapsed = time.perf_counter() - started
+        summary = peaks.to_frame()
+        print(f"{label}: {peaks.days} days x {n_sites:,} sites in {elapsed:.2f} s "
+              f"({peaks.days * n_sites / elapsed:,.0f} site-days/s); "
+              f"mean peak {summary['peak_risk_score'].mean():.1f}, "
+              f"most common peak date {summary['peak_date'].mode()[0]:%Y-%m-%d}")
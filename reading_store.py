@@ -0,0 +1,241 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from meter_stream import AREAS, READING_FIELDS
+from water_datasets import MONTH_ORDER
+
+READING_STORE_DIR = "meter_store"
+
+# Partitions and calendar queries use Malaysian time (UTC+8, no daylight saving)
+UTC_OFFSET_SECONDS = 8 * 3600
+DAY_SECONDS = 86400
+
+STORE_COLUMNS = ["timestamp"] + READING_FIELDS
+INDEX_COLUMNS = ["area", "day", "seq", "rows", "t_min", "t_max"] + [f"{field}_sum" for field in READING_FIELDS]
+
+
+def local_day(timestamp):
+    """
+    Days since the epoch in local time for an array of UTC epoch seconds.
+    """
+    return np.floor((np.asarray(timestamp) + UTC_OFFSET_SECONDS) / DAY_SECONDS).astype(np.int64)
+
+
+def month_bounds(year, month):
+    """
+    Returns the [start, end) epoch seconds of a local calendar month.
+    """
+    start = pd.Timestamp(year=year, month=month, day=1)
+    end = start + pd.offsets.MonthBegin(1)
+    return (start.value // 10**9 - UTC_OFFSET_SECONDS, end.value // 10**9 - UTC_OFFSET_SECONDS)
+
+
+class ReadingStore:
+    """
+    Append-only columnar store of meter readings.
+
+    Readings are partitioned by area and local day. Every flushed chunk is a
+    directory ``<root>/<area>/<day>/<seq>/`` holding one ``.npy`` file per
+    column, and a line in ``index.csv`` recording its row count, min/max
+    timestamp and per-field sums. Range queries consult the index first and
+    memory-map only the chunks that overlap the requested interval; monthly
+    totals are answered from the index alone.
+    """
+
+    def __init__(self, root=READING_STORE_DIR, chunk_rows=65536):
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self._index_path = os.path.join(root, "index.csv")
+        self._pending = {}
+        self._index = None
+        self._index_version = None
+        self._next_seq = {}
+        self._lock = threading.Lock()
+
+    def append(self, batch):
+        """
+        Buffers a READING_DTYPE batch; partitions are flushed once they reach ``chunk_rows``.
+        """
+        if len(batch) == 0:
+            return
+        days = local_day(batch["timestamp"])
+        keys = batch["area"].astype(np.int64) * (1 << 32) + days
+        order = np.argsort(keys, kind="stable")
+        keys, days, batch = keys[order], days[order], batch[order]
+        splits = np.flatnonzero(np.diff(keys)) + 1
+        with self._lock:
+            for start, stop in zip(np.r_[0, splits], np.r_[splits, len(keys)]):
+                key = (int(batch["area"][start]), int(days[start]))
+                parts = self._pending.setdefault(key, [])
+                parts.append(batch[start:stop])
+                if sum(len(part) for part in parts) >= self.chunk_rows:
+                    self._write_chunk(key, np.concatenate(self._pending.pop(key)))
+
+    def flush(self):
+        with self._lock:
+            for key in list(self._pending):
+                self._write_chunk(key, np.concatenate(self._pending.pop(key)))
+
+    def _write_chunk(self, key, rows):
+        area, day = key
+        rows = rows[np.argsort(rows["timestamp"], kind="stable")]
+        seq = self._next_seq.get(key)
+        if seq is None:
+            day_dir = self._day_dir(area, day)
+            seq = len(os.listdir(day_dir)) if os.path.isdir(day_dir) else 0
+        self._next_seq[key] = seq + 1
+
+        chunk_dir = self._chunk_dir(area, day, seq)
+        os.makedirs(chunk_dir, exist_ok=True)
+        for column in STORE_COLUMNS:
+            np.save(os.path.join(chunk_dir, column + ".npy"), np.ascontiguousarray(rows[column]))
+
+        # The index line is appended last, so readers only see complete chunks
+        entry = [area, day, seq, len(rows), repr(float(rows["timestamp"][0])), repr(float(rows["timestamp"][-1]))]
+        entry += [repr(float(rows[field].sum(dtype=np.float64))) for field in READING_FIELDS]
+        new_file = not os.path.exists(self._index_path)
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            if new_file:
+                f.write(",".join(INDEX_COLUMNS) + "\n")
+            f.write(",".join(str(value) for value in entry) + "\n")
+
+    def _day_dir(self, area, day):
+        return os.path.join(self.root, AREAS[area].replace(" ", "_"), str(day))
+
+    def _chunk_dir(self, area, day, seq):
+        return os.path.join(self._day_dir(area, day), f"{seq:06d}")
+
+    def index(self):
+        """
+        Returns the chunk index as a DataFrame, re-reading it when the file changes.
+        """
+        if not os.path.exists(self._index_path):
+            return pd.DataFrame(columns=INDEX_COLUMNS)
+        stat = os.stat(self._index_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version != self._index_version:
+            self._index = pd.read_csv(self._index_path)
+            self._index_version = version
+        return self._index
+
+    def version(self):
+        """
+        Returns the (mtime_ns, size) version of the chunk index, or None while the store is empty.
+        """
+        if not os.path.exists(self._index_path):
+            return None
+        stat = os.stat(self._index_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def query(self, area, start, end, columns=STORE_COLUMNS):
+        """
+        Reads the readings of one area with ``start <= timestamp < end``.
+
+        Parameters:
+        - area: Area name, e.g. "Area E".
+        - start, end: Epoch seconds of the half-open interval.
+        - columns: Columns to return.
+
+        Returns:
+        - dict: One array per column, in timestamp order within each chunk.
+        """
+        index = self.index()
+        selected = index[(index["area"] == AREAS.index(area)) &
+                         (index["t_max"] >= start) & (index["t_min"] < end)]
+        parts = {column: [] for column in columns}
+        for chunk in selected.itertuples(index=False):
+            chunk_dir = self._chunk_dir(chunk.area, chunk.day, chunk.seq)
+            timestamp = np.load(os.path.join(chunk_dir, "timestamp.npy"), mmap_mode="r")
+            lo, hi = np.searchsorted(timestamp, [start, end])
+            for column in columns:
+                values = np.load(os.path.join(chunk_dir, column + ".npy"), mmap_mode="r")
+                parts[column].append(np.asarray(values[lo:hi]))
+        return {column: np.concatenate(values) if values else np.empty(0)
+                for column, values in parts.items()}
+
+    def resample(self, area, start, end, field="flow", bucket_seconds=3600, how="sum"):
+        """
+        Aggregates one field of an area into fixed time buckets.
+
+        Example: ``resample("Area E", *month_bounds(2023, 3))`` gives the hourly
+        water usage of Area E in March 2023.
+
+        Returns:
+        - pd.DataFrame: ``time`` (bucket start, local time) and the aggregated ``field``.
+        """
+        data = self.query(area, start, end, ["timestamp", field])
+        n_buckets = int(np.ceil((end - start) / bucket_seconds))
+        bucket = ((data["timestamp"] - start) // bucket_seconds).astype(np.int64)
+        totals = np.bincount(bucket, data[field].astype(np.float64), n_buckets)
+        if how == "mean":
+            counts = np.bincount(bucket, minlength=n_buckets)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                totals = totals / counts
+        elif how != "sum":
+            raise ValueError("how must be 'sum' or 'mean'")
+        times = pd.to_datetime(start + UTC_OFFSET_SECONDS + bucket_seconds * np.arange(n_buckets), unit="s")
+        return pd.DataFrame({"time": times, field: totals})
+
+    def monthly_area_totals(self, year, field="flow"):
+        """
+        Sums a field per area and calendar month of ``year`` from the chunk index.
+
+        Returns:
+        - pd.DataFrame: Same layout as V_Choropleth_Data (Area plus one column
+          per month), or an empty frame when the store has no data for the year.
+        """
+        index = self.index()
+        if index.empty:
+            return pd.DataFrame()
+        dates = pd.to_datetime(index["day"] * DAY_SECONDS, unit="s")
+        in_year = (dates.dt.year == year).to_numpy()
+        if not in_year.any():
+            return pd.DataFrame()
+        totals = (index.loc[in_year, f"{field}_sum"]
+                  .groupby([index.loc[in_year, "area"], dates[in_year].dt.month]).sum()
+                  .unstack(fill_value=0.0)
+                  .reindex(index=range(len(AREAS)), columns=range(1, 13), fill_value=0.0))
+        totals.columns = MONTH_ORDER
+        totals.insert(0, "Area", AREAS)
+        return totals.reset_index(drop=True)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_reading_store():
+    """
+    Returns the process-wide reading store under READING_STORE_DIR.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ReadingStore()
+    return _store
+
+
+if __name__ == "__main__":
+    # Backfill a year of simulated per-minute readings for the dashboard
+    import time
+
+    from meter_stream import simulate_readings
+
+    store = get_reading_store()
+    start, _ = month_bounds(2023, 1)
+    _, end = month_bounds(2023, 12)
+    source = simulate_readings(meters_per_area=4, interval=60, seed=0, realtime=False,
+                               leak_rate=0.001, start_time=start)
+    started = time.perf_counter()
+    for _ in range((end - start) // DAY_SECONDS):
+        store.append(np.concatenate([next(source) for _ in range(DAY_SECONDS // 60)]))
+    store.flush()
+    print(f"Stored a simulated year in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    hourly = store.resample("Area E", *month_bounds(2023, 3))
+    print(f"Area E, March, hourly sum: {len(hourly)} buckets in {time.perf_counter() - started:.3f} s")
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+from assessment_store import local_metres
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_model import DEFAULT_INPUTS
+from geo_index import get_penang_index
+
+# Cells further than this from every stored assessment are left unscored
+SITE_INFLUENCE_M = 2_000
+
+# Inputs describing the weather rather than the slope; one value applies to the whole grid
+REGIONAL_INPUTS = ('rainfall', 'soil_moisture')
+
+
+def build_grid(bounds, n_lon, n_lat):
+    """
+    Returns the cell-centre longitudes and latitudes of a regular grid.
+
+    Parameters:
+    - bounds: (min_lon, min_lat, max_lon, max_lat) extent to cover.
+    - n_lon, n_lat: Number of cells along each axis.
+    """
+    min_lon, min_lat, max_lon, max_lat = bounds
+    lon_step = (max_lon - min_lon) / n_lon
+    lat_step = (max_lat - min_lat) / n_lat
+    lon = min_lon + lon_step * (np.arange(n_lon) + 0.5)
+    lat = min_lat + lat_step * (np.arange(n_lat) + 0.5)
+    return lon, lat
+
+
+def site_input_grids(sites, lon, lat, input_names, max_distance_m=SITE_INFLUENCE_M):
+    """
+    Spreads assessed sites over a grid: every cell takes the inputs of its nearest site.
+
+    The nearest site of every cell comes from one k-d tree query over the
+    sites, bounded at max_distance_m, so the cost grows with
+    cells x log(sites) rather than cells x sites.
+
+    Parameters:
+    - sites: DataFrame with lat, lon and one column per name in input_names,
+      e.g. the latest assessment per slope from assessment_store.latest_per_site.
+    - lon, lat: Cell-centre coordinates along each axis, as from build_grid.
+    - input_names: Site columns to spread.
+    - max_distance_m: Cells further than this from every site get NaN inputs.
+
+    Returns:
+    - dict: One (len(lat), len(lon)) array per input name.
+    """
+    # scipy comes with scikit-fuzzy; imported here so importing this module stays cheap
+    from scipy.spatial import cKDTree
+
+    grid_lon, grid_lat = np.meshgrid(lon, lat)
+    shape = grid_lon.shape
+    if len(sites) == 0:
+        return {name: np.full(shape, np.nan) for name in input_names}
+
+    reference_lat = float(np.mean(lat))
+    tree = cKDTree(local_metres(sites["lat"], sites["lon"], reference_lat))
+    # Cells with no site within max_distance_m get an index of len(sites)
+    _, nearest = tree.query(local_metres(grid_lat.ravel(), grid_lon.ravel(), reference_lat),
+                            distance_upper_bound=max_distance_m)
+    nearest = nearest.reshape(shape)
+    covered = nearest < len(sites)
+
+    grids = {}
+    for name in input_names:
+        values = sites[name].to_numpy(dtype=np.float64)
+        if name in DEFAULT_INPUTS:
+            values = np.where(np.isnan(values), DEFAULT_INPUTS[name], values)
+        grid = np.full(shape, np.nan)
+        grid[covered] = values[nearest[covered]]
+        grids[name] = grid
+    return grids
+
+
+def compute_risk_surface(inputs, n_lon=200, n_lat=200, index=None, engine=None):
+    """
+    Scores every grid cell that falls inside a constituency of the index.
+
+    Parameters:
+    - inputs: Fuzzy inputs keyed by name. Each value is either a scalar applied
+      to every cell or an array of shape (n_lat, n_lon) with per-cell values,
+      NaN for cells to leave out (see site_input_grids).
+    - n_lon, n_lat: Grid resolution over the index extent.
+    - index: PolygonIndex to rasterize, the Penang constituencies by default.
+    - engine: Scorer with an evaluate_batch method, the compiled fuzzy engine by default.
+
+    Returns:
+    - pd.DataFrame: One row per scored cell with lon, lat, KodPar, Parliament
+      and risk_score.
+    """
+    index = index or get_penang_index()
+    lon, lat = build_grid(index.bounds, n_lon, n_lat)
+    grid_lon, grid_lat = np.meshgrid(lon, lat)
+    feature = index.locate(grid_lon, grid_lat)
+    mask = feature >= 0
+    inputs = {name: np.asarray(value, dtype=np.float64) for name, value in inputs.items()}
+    for value in inputs.values():
+        if value.ndim == 2:
+            mask &= ~np.isnan(value)
+
+    cell_inputs = {name: value[mask] if value.ndim == 2 else value for name, value in inputs.items()}
+    risk_score = (engine or get_fuzzy_engine()).evaluate_batch(cell_inputs)
+    if risk_score.size == 1:
+        risk_score = np.full(int(mask.sum()), risk_score[0])
+
+    cell_feature = feature[mask]
+    return pd.DataFrame({
+        "lon": grid_lon[mask],
+        "lat": grid_lat[mask],
+        "KodPar": index.properties["KodPar"].to_numpy()[cell_feature],
+        "Parliament": index.properties["Parliament"].to_numpy()[cell_feature],
+        "risk_score": risk_score,
+    })
+
+
+def grid_cell_size_m(index, n_lon, n_lat):
+    """
+    Approximate edge length in metres of one grid cell, for map rendering.
+    """
+    min_lon, min_lat, max_lon, max_lat = index.bounds
+    mid_lat = np.radians((min_lat + max_lat) / 2)
+    lon_m = (max_lon - min_lon) / n_lon * 111_320 * np.cos(mid_lat)
+    lat_m = (max_lat - min_lat) / n_lat * 110_574
+    return float(max(lon_m, lat_m))
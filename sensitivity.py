@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_model import DEFAULT_INPUTS
+
+# Sample points per swept input; discrete universes with fewer points are swept point by point
+SWEEP_POINTS = 51
+
+
+def _input_universes(engine):
+    # A FuzzyLookupTable scores through the compiled engine it wraps
+    universes = getattr(engine, 'engine', engine).input_universes
+    return list(universes), list(universes.values())
+
+
+def sweep_inputs(inputs, engine=None, points=SWEEP_POINTS):
+    """
+    Sweeps every fuzzy input across its universe while holding the others at ``inputs``.
+
+    All sweeps are stacked into one batch and scored with a single
+    evaluate_batch call, so the full one-at-a-time sensitivity of the model
+    costs about as much as a few single evaluations.
+
+    Parameters:
+    - inputs: Base input values, as passed to calculate_landslide_risk.
+    - engine: Scorer with an evaluate_batch method, the compiled fuzzy engine by default.
+    - points: Sample points per input.
+
+    Returns:
+    - pd.DataFrame: One row per sample with input, value and risk_score
+      (NaN where no rule fires).
+    """
+    engine = engine or get_fuzzy_engine()
+    input_names, universes = _input_universes(engine)
+    base = {**DEFAULT_INPUTS, **inputs}
+    for name in input_names:
+        if name not in base:
+            raise ValueError("All antecedents must have input values!")
+
+    sweeps = [universe if universe.size <= points else np.linspace(universe[0], universe[-1], points)
+              for universe in universes]
+    lengths = [sweep.size for sweep in sweeps]
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    size = int(sum(lengths))
+
+    # Every block of rows holds the base inputs with one column replaced by its sweep
+    batch = {}
+    for name, start, sweep in zip(input_names, starts, sweeps):
+        column = np.full(size, float(base[name]))
+        column[start:start + sweep.size] = sweep
+        batch[name] = column
+
+    return pd.DataFrame({
+        "input": np.repeat(input_names, lengths),
+        "value": np.concatenate(sweeps),
+        "risk_score": engine.evaluate_batch(batch),
+    })
+
+
+def tornado_table(sweep, base_score):
+    """
+    Summarizes a sweep as the risk score range each input can reach on its own.
+
+    Parameters:
+    - sweep: Output of sweep_inputs.
+    - base_score: Risk score of the base inputs.
+
+    Returns:
+    - pd.DataFrame: One row per input, indexed by name and sorted by swing
+      (largest first), with min_score, max_score, the values at which they
+      occur (min_value, max_value), low and high (differences from
+      base_score) and swing.
+    """
+    scored = sweep.dropna(subset=["risk_score"])
+    grouped = scored.groupby("input", sort=False)["risk_score"]
+    lowest = scored.loc[grouped.idxmin()].set_index("input")
+    highest = scored.loc[grouped.idxmax()].set_index("input")
+    table = pd.DataFrame({
+        "min_score": lowest["risk_score"],
+        "max_score": highest["risk_score"],
+        "min_value": lowest["value"],
+        "max_value": highest["value"],
+    })
+    table["low"] = table["min_score"] - base_score
+    table["high"] = table["max_score"] - base_score
+    table["swing"] = table["max_score"] - table["min_score"]
+    return table.sort_values("swing", ascending=False, kind="stable")
+
+
+if __name__ == "__main__":
+    # Time a full sweep over every antecedent
+    import time
+
+    from fuzzy_lookup import get_fuzzy_lookup
+
+    inputs = {'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': 5, 'human_activity': 0,
+              'historical_landslides': 0, 'soil_type': 0, 'drainage_system': 25,
+              'vegetated_surface': 5, 'slope_nature': 0}
+    for label, engine in (("exact", get_fuzzy_engine()), ("lookup", get_fuzzy_lookup())):
+        sweep_inputs(inputs, engine)
+        started = time.perf_counter()
+        for _ in range(20):
+            sweep = sweep_inputs(inputs, engine)
+        elapsed = (time.perf_counter() - started) / 20 * 1000
+        print(f"{label}: {len(sweep)} rows over {sweep['input'].nunique()} inputs in {elapsed:.1f} ms")
+    print(tornado_table(sweep, engine.evaluate(inputs)).round(2))
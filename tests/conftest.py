@@ -0,0 +1,8 @@
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app modules live at the repository root and read their data files relative to it
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
@@ -0,0 +1,76 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+import annotation_cache
+from annotation_cache import AnnotationCache, annotate_upload, annotation_key
+
+
+def upload(seed=0):
+    # A grey slope with a few bright nail heads, encoded as an upload would be
+    image = np.full((200, 200, 3), 120, dtype=np.uint8)
+    rng = np.random.default_rng(seed)
+    for x, y in rng.integers(20, 180, (6, 2)):
+        cv2.circle(image, (int(x), int(y)), 8, (240, 240, 240), -1)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+def test_key_covers_bytes_parameters_and_encoding(monkeypatch):
+    data = upload()
+    key = annotation_key(data)
+    assert annotation_key(data, max_annotations=5) == key
+    assert annotation_key(data, blur_kernel_size=[5, 5]) == key
+    assert annotation_key(data, max_annotations=3) != key
+    assert annotation_key(upload(seed=1)) != key
+    monkeypatch.setattr(annotation_cache, "JPEG_QUALITY", 50)
+    assert annotation_key(data) != key
+
+
+def test_miss_then_hit_with_scores_sidecar(tmp_path):
+    cache = AnnotationCache(root=str(tmp_path))
+    data = upload()
+    encoded, scores = annotate_upload(data, cache=cache)
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 0
+
+    key = annotation_key(data)
+    image_path = tmp_path / key[:2] / f"{key}.jpg"
+    assert image_path.read_bytes() == encoded
+    assert json.loads((tmp_path / key[:2] / f"{key}.json").read_text()) == scores
+
+    assert annotate_upload(data, cache=cache) == (encoded, scores)
+    assert cache.stats() == {"entries": 1, "bytes": len(encoded), "hits": 1, "misses": 1}
+
+    # A new instance rebuilds its index from the directory
+    reopened = AnnotationCache(root=str(tmp_path))
+    assert reopened.get(key) == (encoded, scores)
+
+
+def test_image_without_scores_is_not_indexed(tmp_path):
+    AnnotationCache(root=str(tmp_path)).put("ab" * 32, b"jpeg", {"Soil Nailing": 1.0})
+    os.remove(tmp_path / "ab" / f"{'ab' * 32}.json")
+    cache = AnnotationCache(root=str(tmp_path))
+    assert cache.get("ab" * 32) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_at_the_byte_cap(tmp_path):
+    cache = AnnotationCache(root=str(tmp_path), max_bytes=300)
+    keys = [f"{n:02d}" * 32 for n in range(4)]
+    for key in keys[:3]:
+        cache.put(key, b"x" * 100, {"key": key})
+    assert cache.stats()["bytes"] == 300
+
+    # Using the oldest entry makes the second one the least recently used
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[3], b"x" * 100, {"key": keys[3]})
+    assert cache.get(keys[1]) is None
+    assert not (tmp_path / keys[1][:2] / f"{keys[1]}.jpg").exists()
+    assert not (tmp_path / keys[1][:2] / f"{keys[1]}.json").exists()
+    assert all(cache.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    assert cache.stats()["bytes"] == 300
+
+    # An entry larger than the cap is kept on its own
+    cache.put(keys[1], b"x" * 500, {"key": keys[1]})
+    assert cache.stats() == {"entries": 1, "bytes": 500, "hits": 4, "misses": 1}
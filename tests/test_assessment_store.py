@@ -0,0 +1,88 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from assessment_store import ASSESSMENT_COLUMNS, METRES_PER_DEGREE_LAT, AssessmentStore, haversine_m
+
+FIRST_DAY = datetime.date(2023, 1, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AssessmentStore(str(tmp_path / "assessments.db"))
+
+
+@pytest.fixture
+def filled(store):
+    # 300 assessments scattered over Penang across two years
+    rng = np.random.default_rng(0)
+    records = pd.DataFrame({
+        "assessment_date": [FIRST_DAY + datetime.timedelta(days=int(day)) for day in rng.integers(0, 730, 300)],
+        "lat": rng.uniform(5.25, 5.45, 300),
+        "lon": rng.uniform(100.2, 100.4, 300),
+        "rainfall": rng.uniform(0, 1000, 300),
+    })
+    records["id"] = [store.record(row.assessment_date, row.lat, row.lon, {"rainfall": row.rainfall}, 50.0, "Moderate")
+                     for row in records.itertuples()]
+    return store, records
+
+
+def test_record_stores_inputs_and_ignores_unknown_names(store):
+    first = store.record("2024-03-05", 5.4, 100.3, {"rainfall": 250, "slope_steepness": 30, "colour": 1},
+                         61.5, "Moderate")
+    second = store.record(datetime.datetime(2024, 3, 6, 14, 30), 5.4, 100.3, {}, None, None)
+    assert second > first
+    assert store.count() == 2
+
+    rows = store.query_bounds((100, 5, 101, 6))
+    assert list(rows.columns) == ASSESSMENT_COLUMNS
+    assert list(rows["id"]) == [second, first]
+    latest, earlier = rows.iloc[0], rows.iloc[1]
+    assert latest["assessment_date"] == "2024-03-06"
+    assert pd.isna(latest["rainfall"]) and pd.isna(latest["risk_score"])
+    assert (earlier["rainfall"], earlier["slope_steepness"], earlier["risk_score"]) == (250, 30, 61.5)
+    assert earlier["risk_category"] == "Moderate"
+
+
+def test_query_bounds_matches_a_scan(filled):
+    store, records = filled
+    bounds = (100.25, 5.3, 100.33, 5.38)
+    inside = ((records["lon"] >= bounds[0]) & (records["lon"] <= bounds[2]) &
+              (records["lat"] >= bounds[1]) & (records["lat"] <= bounds[3]))
+    assert set(store.query_bounds(bounds)["id"]) == set(records.loc[inside, "id"])
+
+    start, end = datetime.date(2023, 6, 1), datetime.date(2023, 12, 31)
+    in_window = inside & (records["assessment_date"] >= start) & (records["assessment_date"] <= end)
+    windowed = store.query_bounds(bounds, start, end)
+    assert set(windowed["id"]) == set(records.loc[in_window, "id"])
+    assert 0 < len(windowed) < inside.sum()
+    assert list(windowed["assessment_date"]) == sorted(windowed["assessment_date"], reverse=True)
+
+    open_ended = store.query_bounds(bounds, start_date=start)
+    assert set(open_ended["id"]) == set(records.loc[inside & (records["assessment_date"] >= start), "id"])
+    assert len(store.query_bounds(bounds, limit=3)) == 3
+
+
+def test_query_radius_matches_haversine(filled):
+    store, records = filled
+    lat, lon, radius_m = 5.35, 100.3, 3000
+    distance = haversine_m(lat, lon, records["lat"], records["lon"])
+    near = store.query_radius(lat, lon, radius_m)
+    assert set(near["id"]) == set(records.loc[distance <= radius_m, "id"])
+    assert (near["distance_m"] <= radius_m).all()
+
+    start, end = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+    in_window = (distance <= radius_m) & (records["assessment_date"] >= start)
+    assert set(store.query_radius(lat, lon, radius_m, start, end)["id"]) == set(records.loc[in_window, "id"])
+
+
+def test_site_trend_is_oldest_first_within_the_site_radius(store):
+    offset = 20 / METRES_PER_DEGREE_LAT
+    store.record("2024-05-01", 5.4 + offset, 100.3, {}, 70.0, "High")
+    store.record("2023-05-01", 5.4, 100.3, {}, 40.0, "Moderate")
+    store.record("2024-01-01", 5.4, 100.3, {}, 55.0, "Moderate")
+    store.record("2024-02-01", 5.41, 100.3, {}, 10.0, "Safe")
+    trend = store.site_trend(5.4, 100.3)
+    assert list(trend["risk_score"]) == [40.0, 55.0, 70.0]
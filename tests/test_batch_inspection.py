@@ -0,0 +1,76 @@
+import zipfile
+
+import cv2
+import numpy as np
+import pytest
+
+from batch_inspection import inspect_images, iter_image_sources
+
+
+def png_bytes(seed):
+    image = np.random.default_rng(seed).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+def write_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def test_corrupt_zip_member_fails_only_that_photo(tmp_path):
+    path = tmp_path / "photos.zip"
+    bad = png_bytes(1)
+    write_zip(path, {"a.png": png_bytes(0), "b.png": bad, "c.png": png_bytes(2), "notes.txt": b"x"})
+    # Flip bytes inside b.png's stored data so its CRC check fails on read
+    raw = bytearray(path.read_bytes())
+    offset = raw.index(bad[100:120])
+    raw[offset:offset + 20] = bytes(20)
+    path.write_bytes(bytes(raw))
+
+    results = {name: error for name, image, error in inspect_images(iter_image_sources(str(path)), workers=1)}
+    assert sorted(results) == ["a.png", "b.png", "c.png"]
+    assert results["a.png"] is None and results["c.png"] is None
+    assert results["b.png"].startswith("BadZipFile")
+
+
+def test_zip_sources_share_one_open_archive(tmp_path, monkeypatch):
+    path = tmp_path / "photos.zip"
+    write_zip(path, {f"{index}.png": png_bytes(index) for index in range(5)})
+    opened = []
+    original_init = zipfile.ZipFile.__init__
+
+    def counting_init(self, *args, **kwargs):
+        opened.append(args[0])
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "__init__", counting_init)
+    assert [read() for name, read in iter_image_sources(str(path))] == [png_bytes(index) for index in range(5)]
+    assert len(opened) == 1
+
+
+def test_zip_archive_is_closed_once_its_members_are_used_up(tmp_path):
+    path = tmp_path / "photos.zip"
+    write_zip(path, {f"{index}.png": png_bytes(index) for index in range(2)})
+    sources = iter_image_sources(str(path))
+    name, read = next(sources)
+    assert read() == png_bytes(0)
+    # Closing the generator early closes the archive as well
+    sources.close()
+    with pytest.raises(ValueError, match="closed"):
+        read()
+
+    collected = list(iter_image_sources(str(path)))
+    assert [name for name, read in collected] == ["0.png", "1.png"]
+    with pytest.raises(ValueError, match="closed"):
+        collected[0][1]()
+
+
+def test_unreadable_source_is_reported_per_item():
+    def missing():
+        raise KeyError("There is no item named 'gone.png' in the archive")
+
+    sources = [("gone.png", missing), ("ok.png", lambda: png_bytes(0))]
+    results = {name: error for name, image, error in inspect_images(sources, workers=1)}
+    assert results["ok.png"] is None
+    assert results["gone.png"].startswith("KeyError")
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_model import calculate_landslide_risk, create_fuzzy_system
+
+# The compiled engine replays the scikit-fuzzy computation, so only float rounding may differ
+TOLERANCE = 1e-9
+
+# Input ranges of the fuzzy universes
+INPUT_RANGES = {'rainfall': (0, 1000), 'soil_type': (0, 5)}
+
+
+def random_inputs(engine, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(*INPUT_RANGES.get(name, (0, 100)), n_rows) for name in engine.input_names}
+
+
+def reference_scores(batch, n_rows):
+    fuzzy_system = create_fuzzy_system()
+    expected = np.full(n_rows, np.nan)
+    for row in range(n_rows):
+        try:
+            expected[row] = calculate_landslide_risk(fuzzy_system, {name: float(values[row])
+                                                                    for name, values in batch.items()})
+        except ValueError:
+            pass  # No rule fired
+    return expected
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return get_fuzzy_engine()
+
+
+def test_evaluate_batch_matches_scikit_fuzzy(engine):
+    batch = random_inputs(engine, 300)
+    expected = reference_scores(batch, 300)
+    scores = engine.evaluate_batch(batch)
+    np.testing.assert_array_equal(np.isnan(scores), np.isnan(expected))
+    np.testing.assert_allclose(scores, expected, rtol=0, atol=TOLERANCE)
+
+
+def test_evaluate_matches_scikit_fuzzy(engine):
+    batch = random_inputs(engine, 50, seed=1)
+    expected = reference_scores(batch, 50)
+    for row in range(50):
+        inputs = {name: float(values[row]) for name, values in batch.items()}
+        if np.isnan(expected[row]):
+            with pytest.raises(ValueError):
+                engine.evaluate(inputs)
+        else:
+            assert abs(engine.evaluate(inputs) - expected[row]) <= TOLERANCE
+
+
+def test_form_values_match_scikit_fuzzy(engine):
+    # Every stabilization measure combination on a typical engineered slope
+    fuzzy_system = create_fuzzy_system()
+    site = {'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': 15, 'human_activity': 0,
+            'historical_landslides': 0, 'soil_type': 2, 'drainage_system': 50,
+            'vegetated_surface': 45, 'slope_nature': 100}
+    for mask in range(16):
+        measures = {name: 100 * (mask >> bit & 1)
+                    for bit, name in enumerate(['soil_nailing', 'slope_netting', 'gabion_wall', 'rubble_wall'])}
+        inputs = {**site, **measures}
+        assert abs(engine.evaluate(inputs) - calculate_landslide_risk(fuzzy_system, inputs)) <= TOLERANCE
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_lookup import FuzzyLookupTable, load_or_build_lookup
+
+# Largest interpolation error against the exact engine, in risk score points
+TOLERANCE = 0.25
+
+
+class PublicEngine:
+    # Exposes only the public interface of the compiled engine
+    def __init__(self, engine):
+        self._engine = engine
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(f"{name} is private to CompiledFuzzyEngine")
+        return getattr(self._engine, name)
+
+
+@pytest.fixture(scope="module")
+def lookup(tmp_path_factory):
+    engine = PublicEngine(get_fuzzy_engine())
+    return load_or_build_lookup(engine, levels=33, cache_dir=str(tmp_path_factory.mktemp("lookup")))
+
+
+def random_inputs(engine, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(universe[0], universe[-1], n_rows)
+            for name, universe in engine.input_universes.items()}
+
+
+def test_lookup_batch_matches_engine(lookup):
+    batch = random_inputs(lookup.engine, 5000)
+    expected = lookup.engine.evaluate_batch(batch)
+    scores = lookup.evaluate_batch(batch)
+    np.testing.assert_array_equal(np.isnan(scores), np.isnan(expected))
+    assert np.nanmax(np.abs(scores - expected)) < TOLERANCE
+
+
+def test_lookup_single_matches_batch(lookup):
+    batch = random_inputs(lookup.engine, 200, seed=1)
+    scores = lookup.evaluate_batch(batch)
+    for row in range(200):
+        inputs = {name: float(values[row]) for name, values in batch.items()}
+        if np.isnan(scores[row]):
+            with pytest.raises(ValueError):
+                lookup.evaluate(inputs)
+        else:
+            assert lookup.evaluate(inputs) == pytest.approx(scores[row], abs=1e-9)
+
+
+def test_lookup_cache_reused(lookup, tmp_path):
+    first = load_or_build_lookup(lookup.engine, levels=9, cache_dir=str(tmp_path))
+    second = load_or_build_lookup(lookup.engine, levels=9, cache_dir=str(tmp_path))
+    assert isinstance(second, FuzzyLookupTable)
+    assert len(list(tmp_path.iterdir())) == 1
+    np.testing.assert_array_equal(first.table, second.table)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from fuzzy_model import DEFAULT_INPUTS, calculate_landslide_risk, create_fuzzy_system
+
+# A site that fires the 'high' and 'moderate' rules and none of the 'safe' ones (scores about 63)
+HIGH_RISK_SITE = {'rainfall': 100, 'soil_moisture': 10, 'slope_steepness': 10, 'human_activity': 100,
+                  'historical_landslides': 100, 'soil_type': 0, 'drainage_system': 50,
+                  'vegetated_surface': 80, 'slope_nature': 0}
+
+
+@pytest.fixture(scope="module")
+def fuzzy_system():
+    return create_fuzzy_system()
+
+
+@pytest.fixture(scope="module")
+def condition_rules_only(fuzzy_system):
+    # The model without the stabilization rule, evaluated through scikit-fuzzy directly
+    from skfuzzy import control as ctrl
+
+    rules = [rule for rule in fuzzy_system.ctrl.rules
+             if not {term.parent.label for term in rule.antecedent_terms} & set(DEFAULT_INPUTS)]
+    assert len(rules) == 3
+    simulation = ctrl.ControlSystemSimulation(ctrl.ControlSystem(rules))
+
+    def evaluate(inputs):
+        for name, value in inputs.items():
+            simulation.input[name] = value
+        simulation.compute()
+        return simulation.output['landslide_risk']
+
+    return evaluate
+
+
+def site_conditions(n_sites, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n_sites):
+        yield {'rainfall': rng.uniform(0, 1000), 'soil_moisture': rng.uniform(0, 100),
+               'slope_steepness': rng.uniform(0, 100), 'human_activity': rng.choice([0, 100]),
+               'historical_landslides': rng.choice([0, 100]), 'soil_type': rng.integers(0, 6),
+               'drainage_system': rng.choice([25, 50, 75]), 'vegetated_surface': rng.uniform(0, 100),
+               'slope_nature': rng.choice([0, 100])}
+
+
+def test_sites_without_measures_score_as_before(fuzzy_system, condition_rules_only):
+    for conditions in site_conditions(100):
+        for measure_value in (0, 25, 49):
+            measures = {name: measure_value for name in DEFAULT_INPUTS}
+            assert calculate_landslide_risk(fuzzy_system, {**conditions, **measures}) == \
+                pytest.approx(condition_rules_only(conditions), abs=1e-9)
+
+
+@pytest.mark.parametrize("measure", list(DEFAULT_INPUTS))
+def test_any_good_measure_lowers_the_risk(fuzzy_system, measure):
+    without = calculate_landslide_risk(fuzzy_system, HIGH_RISK_SITE)
+    partly = calculate_landslide_risk(fuzzy_system, {**HIGH_RISK_SITE, measure: 75})
+    fully = calculate_landslide_risk(fuzzy_system, {**HIGH_RISK_SITE, measure: 100})
+    assert fully < partly < without
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from geo_index import PENANG_GEOJSON_PATH, PolygonIndex, load_geojson_polygons, load_polygon_cache
+
+
+def square(x0, y0, size):
+    return [(x0, y0), (x0 + size, y0), (x0 + size, y0 + size), (x0, y0 + size), (x0, y0)]
+
+
+@pytest.fixture(scope="module")
+def small_index():
+    # Feature 0: square with a square hole; feature 1: two separate squares (a multipolygon)
+    rings = [(square(0, 0, 10), 0), (square(4, 4, 2), 0), (square(20, 0, 5), 1), (square(20, 20, 5), 1)]
+    coords = np.concatenate([np.asarray(ring, dtype=np.float64) for ring, _ in rings])
+    ring_offsets = np.r_[0, np.cumsum([len(ring) for ring, _ in rings])]
+    ring_feature = np.asarray([feature for _, feature in rings], dtype=np.int32)
+    return PolygonIndex(coords, ring_offsets, ring_feature, pd.DataFrame({"name": ["holed", "split"]}))
+
+
+def test_locate_polygons_holes_and_multipolygons(small_index):
+    lon = np.array([1.0, 5.0, 9.5, 22.0, 22.0, 22.0, 15.0, -3.0, 100.0])
+    lat = np.array([1.0, 5.0, 9.5, 2.0, 22.0, 12.0, 5.0, 5.0, 100.0])
+    np.testing.assert_array_equal(small_index.locate(lon, lat), [0, -1, 0, 1, 1, -1, -1, -1, -1])
+
+
+def test_locate_keeps_the_input_shape(small_index):
+    lon, lat = np.meshgrid(np.linspace(-1, 26, 7), np.linspace(-1, 26, 5))
+    assert small_index.locate(lon, lat).shape == (5, 7)
+
+
+def even_odd_feature(polygons, x, y):
+    # Brute-force reference: ray casting against every ring of every feature
+    coords, offsets, owners = polygons["coords"], polygons["ring_offsets"], polygons["ring_feature"]
+    parity = {}
+    for ring, (begin, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        x1, y1 = coords[begin:end, 0], coords[begin:end, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        straddles = (y1 > y) != (y2 > y)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            crossings = straddles & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+        parity[owners[ring]] = parity.get(owners[ring], 0) + int(crossings.sum())
+    inside = [feature for feature, count in parity.items() if count % 2]
+    return inside[0] if inside else -1
+
+
+def test_locate_matches_brute_force_on_penang(tmp_path):
+    polygons = load_geojson_polygons(PENANG_GEOJSON_PATH)
+    index = PolygonIndex(polygons["coords"], polygons["ring_offsets"], polygons["ring_feature"],
+                         polygons["properties"])
+    rng = np.random.default_rng(0)
+    x_min, y_min, x_max, y_max = index.bounds
+    lon, lat = rng.uniform(x_min, x_max, 300), rng.uniform(y_min, y_max, 300)
+    expected = [even_odd_feature(polygons, x, y) for x, y in zip(lon, lat)]
+    located = index.locate(lon, lat)
+    np.testing.assert_array_equal(located, expected)
+    assert (located >= 0).sum() > 50
+
+
+def test_polygon_cache_round_trip(tmp_path):
+    parsed = load_geojson_polygons(PENANG_GEOJSON_PATH)
+    cached = load_polygon_cache(PENANG_GEOJSON_PATH, cache_dir=str(tmp_path))
+    for name in ("coords", "ring_offsets", "ring_feature"):
+        np.testing.assert_array_equal(cached[name], parsed[name])
+    assert list(cached["properties"]["KodPar"]) == list(parsed["properties"]["KodPar"].astype(str))
@@ -0,0 +1,115 @@
+import cv2
+import numpy as np
+import pytest
+
+from image_processing import PROTECTION_MEASURES, contour_statistics, detect_slope_protection
+
+SIZE = 600
+
+# A measure counts as recognised when it scores at least this and beats every other measure by MARGIN
+RECOGNISED_SCORE = 80
+MARGIN = 50
+
+# Ground without any structure may score no measure higher than this
+BACKGROUND_SCORE = 15
+
+
+def blank_slope():
+    return np.full((SIZE, SIZE, 3), 120, dtype=np.uint8)
+
+
+def soil_nailing_image():
+    # Evenly spaced nail heads
+    image = blank_slope()
+    for y in range(60, SIZE, 80):
+        for x in range(60, SIZE, 80):
+            cv2.circle(image, (x, y), 12, (240, 240, 240), -1)
+    return image
+
+
+def slope_netting_image():
+    # Diagonal diamond mesh
+    image = blank_slope()
+    for offset in range(-SIZE, SIZE, 30):
+        cv2.line(image, (offset, 0), (offset + SIZE, SIZE), (240, 240, 240), 2)
+        cv2.line(image, (offset + SIZE, 0), (offset, SIZE), (240, 240, 240), 2)
+    return image
+
+
+def gabion_wall_image():
+    # Rows of equal rectangular baskets
+    image = blank_slope()
+    for y in range(10, SIZE - 100, 110):
+        for x in range(10, SIZE - 140, 150):
+            cv2.rectangle(image, (x, y), (x + 130, y + 90), (240, 240, 240), -1)
+    return image
+
+
+def rubble_wall_image(seed=0):
+    # Packed irregular heptagons of varying size
+    rng = np.random.default_rng(seed)
+    image = blank_slope()
+    for y in range(40, SIZE, 75):
+        for x in range(40, SIZE, 75):
+            radius = rng.uniform(15, 35)
+            angles = np.sort(rng.uniform(0, 2 * np.pi, 7))
+            points = np.stack([x + radius * np.cos(angles) * rng.uniform(0.7, 1.0, 7),
+                               y + radius * np.sin(angles) * rng.uniform(0.7, 1.0, 7)], axis=1)
+            cv2.fillPoly(image, [points.astype(np.int32)], (240, 240, 240))
+    return image
+
+
+def textured_ground_image(seed=0):
+    rng = np.random.default_rng(seed)
+    noise = cv2.GaussianBlur(rng.integers(0, 255, (SIZE, SIZE, 3), dtype=np.uint8), (9, 9), 0)
+    return cv2.normalize(noise, None, 0, 255, cv2.NORM_MINMAX)
+
+
+MEASURE_IMAGES = {
+    'soil_nailing': soil_nailing_image,
+    'slope_netting': slope_netting_image,
+    'gabion_wall': gabion_wall_image,
+    'rubble_wall': rubble_wall_image,
+}
+
+
+def test_contour_statistics_match_opencv():
+    rng = np.random.default_rng(0)
+    contours = [rng.integers(0, 500, (n_points, 1, 2)).astype(np.int32) for n_points in (3, 4, 17, 60)]
+    statistics = contour_statistics(contours)
+    for index, contour in enumerate(contours):
+        x, y, width, height = cv2.boundingRect(contour)
+        assert statistics["area"][index] == pytest.approx(cv2.contourArea(contour))
+        assert statistics["perimeter"][index] == pytest.approx(cv2.arcLength(contour, True))
+        assert statistics["box_area"][index] == width * height
+
+
+def test_contour_orientation_histogram_of_rectangle():
+    rectangle = np.array([[[10, 10]], [[110, 10]], [[110, 50]], [[10, 50]]], dtype=np.int32)
+    histogram = contour_statistics([rectangle])["orientation_histogram"]
+    # Horizontal edges land in the first bin, vertical ones in the middle bin
+    assert histogram[0] == pytest.approx(200)
+    assert histogram[len(histogram) // 2] == pytest.approx(80)
+    assert histogram.sum() == pytest.approx(280)
+
+
+@pytest.mark.parametrize("measure", PROTECTION_MEASURES)
+def test_each_measure_recognised_on_its_own_pattern(measure):
+    _, scores = detect_slope_protection(MEASURE_IMAGES[measure]())
+    others = max(score for name, score in scores.items() if name != measure)
+    assert scores[measure] >= RECOGNISED_SCORE
+    assert scores[measure] - others >= MARGIN
+
+
+@pytest.mark.parametrize("make_image", [blank_slope, textured_ground_image])
+def test_unstructured_ground_scores_no_measure(make_image):
+    _, scores = detect_slope_protection(make_image())
+    assert set(scores) == set(PROTECTION_MEASURES)
+    assert all(0 <= score <= BACKGROUND_SCORE for score in scores.values())
+
+
+def test_scores_do_not_depend_on_channel_order():
+    image = gabion_wall_image()
+    _, rgb_scores = detect_slope_protection(image.copy())
+    _, bgr_scores = detect_slope_protection(np.ascontiguousarray(image[..., ::-1]), color_order="BGR")
+    assert rgb_scores == bgr_scores
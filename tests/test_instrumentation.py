@@ -0,0 +1,63 @@
+import math
+
+import pytest
+
+from instrumentation import SPAN_BUCKETS, SpanHistogram, SpanRecorder
+
+
+def test_value_on_a_bound_falls_in_that_bucket():
+    histogram = SpanHistogram()
+    for seconds in (0.001, 0.0010001, 0.0, 30.0, 31.0):
+        histogram.observe(seconds)
+    buckets = histogram.as_dict()["buckets"]
+    # le semantics: a bucket counts observations less than or equal to its bound
+    assert buckets["0.001"] == 2
+    assert buckets["0.0025"] == 1
+    assert buckets["30.0"] == 1
+    assert buckets["+Inf"] == 1
+    assert sum(buckets.values()) == histogram.count == 5
+
+
+def test_quantile_interpolates_inside_the_bucket():
+    histogram = SpanHistogram()
+    assert math.isnan(histogram.quantile(0.5))
+    # Four observations in (0.01, 0.025], four in (0.025, 0.05]
+    for seconds in (0.02, 0.02, 0.02, 0.02, 0.04, 0.04, 0.04, 0.04):
+        histogram.observe(seconds)
+    assert histogram.quantile(0.25) == pytest.approx(0.01 + (0.025 - 0.01) * 2 / 4)
+    assert histogram.quantile(0.5) == pytest.approx(0.025)
+    assert histogram.quantile(0.75) == pytest.approx(0.025 + (0.05 - 0.025) * 2 / 4)
+    # Never beyond the largest observation, even where the bucket bound is higher
+    assert histogram.quantile(1.0) == pytest.approx(0.04)
+
+
+def test_quantile_in_the_open_bucket_uses_the_maximum():
+    histogram = SpanHistogram()
+    histogram.observe(40.0)
+    histogram.observe(60.0)
+    assert histogram.quantile(0.5) == pytest.approx(SPAN_BUCKETS[-1] + (60.0 - SPAN_BUCKETS[-1]) / 2)
+    assert histogram.quantile(0.99) <= 60.0
+
+
+def test_prometheus_buckets_are_cumulative():
+    recorder = SpanRecorder()
+    for seconds in (0.001, 0.003, 0.003, 2.0, 100.0):
+        recorder.observe('page "water"', seconds)
+    lines = recorder.to_prometheus().splitlines()
+
+    assert lines[:2] == ["# HELP hydrodatahub_span_seconds Duration of named app stages.",
+                         "# TYPE hydrodatahub_span_seconds histogram"]
+    buckets = [line for line in lines if line.startswith("hydrodatahub_span_seconds_bucket")]
+    assert len(buckets) == len(SPAN_BUCKETS) + 1
+    counts = {line.split('le="')[1].split('"')[0]: int(line.rsplit(" ", 1)[1]) for line in buckets}
+    assert counts["0.001"] == 1
+    assert counts["0.0025"] == 1
+    assert counts["0.005"] == 3
+    assert counts["2.5"] == 4
+    assert counts["30.0"] == 4
+    assert counts["+Inf"] == 5
+    assert list(counts.values()) == sorted(counts.values())
+    assert buckets[0].startswith('hydrodatahub_span_seconds_bucket{span="page \\"water\\"",le="0.001"}')
+    assert 'hydrodatahub_span_seconds_count{span="page \\"water\\""} 5' in lines
+    sums = [line for line in lines if line.startswith("hydrodatahub_span_seconds_sum")]
+    assert float(sums[0].rsplit(" ", 1)[1]) == pytest.approx(102.007)
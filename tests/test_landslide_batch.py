@@ -0,0 +1,88 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from landslide_batch import main, score_site_file
+from landslide_scoring import FUZZY_INPUTS
+
+SITE = {'site_id': 1, 'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': '10-14.9 (Moderate)',
+        'human_activity': 'Absent', 'historical_landslides': 'No', 'soil_type': 'Loam',
+        'drainage_system': 50, 'vegetated_surface': 45, 'slope_nature': 'Engineered'}
+
+
+def site_records(n_rows):
+    sites = pd.DataFrame([SITE] * n_rows, columns=list(SITE))
+    sites['site_id'] = np.arange(n_rows)
+    sites['rainfall'] = 100 + np.arange(n_rows) * 10
+    return sites
+
+
+@pytest.mark.parametrize("output_name", ["scored.csv", "scored.parquet"])
+def test_later_chunk_with_missing_values_keeps_the_schema(tmp_path, output_name):
+    sites = site_records(20)
+    sites['soil_nailing'] = 0
+    csv_path = tmp_path / "sites.csv"
+    sites.to_csv(csv_path, index=False)
+    # Only the last chunk has gaps, so pandas parses its integer columns as floats
+    text = csv_path.read_text().splitlines()
+    text[-1] = ",".join(["", *text[-1].split(",")[1:-1], ""])
+    csv_path.write_text("\n".join(text) + "\n")
+
+    output_path = tmp_path / output_name
+    summary = score_site_file(str(csv_path), str(output_path), chunk_rows=5, workers=1)
+    scored = pq.read_table(output_path).to_pandas() if output_name.endswith(".parquet") \
+        else pd.read_csv(output_path)
+    assert summary["rows"] == len(scored) == 20
+    assert list(scored.columns) == [*sites.columns, *[name for name in FUZZY_INPUTS if name not in sites],
+                                    'risk_score', 'risk_category']
+    assert scored['risk_score'].notna().all()
+    assert scored['soil_nailing'].iloc[-1] == 0
+
+
+@pytest.mark.parametrize("output_name", ["scored.csv", "scored.parquet"])
+def test_empty_input_writes_empty_output(tmp_path, output_name):
+    csv_path = tmp_path / "sites.csv"
+    site_records(0).to_csv(csv_path, index=False)
+    output_path = tmp_path / output_name
+    summary = score_site_file(str(csv_path), str(output_path), workers=1)
+    assert summary["rows"] == 0
+    if output_name.endswith(".parquet"):
+        table = pq.read_table(output_path)
+        assert table.num_rows == 0
+        assert str(table.schema.field('risk_score').type) == 'double'
+    else:
+        assert pd.read_csv(output_path).columns[-2:].tolist() == ['risk_score', 'risk_category']
+
+
+def test_missing_measure_values_default_to_not_installed(tmp_path):
+    sites = site_records(4)
+    sites['gabion_wall'] = [np.nan, 0.0, np.nan, 100.0]
+    parquet_path = tmp_path / "sites.parquet"
+    sites.to_parquet(parquet_path, index=False)
+    output_path = tmp_path / "scored.parquet"
+    score_site_file(str(parquet_path), str(output_path), workers=1)
+    scored = pd.read_parquet(output_path)
+    assert scored['risk_score'].notna().all()
+    assert scored['gabion_wall'].tolist() == [0.0, 0.0, 0.0, 100.0]
+    assert scored['site_id'].tolist() == [0, 1, 2, 3]
+
+
+def test_missing_input_column_fails_before_writing(tmp_path):
+    csv_path = tmp_path / "sites.csv"
+    site_records(3).drop(columns='rainfall').to_csv(csv_path, index=False)
+    output_path = tmp_path / "scored.csv"
+    with pytest.raises(ValueError, match="rainfall"):
+        score_site_file(str(csv_path), str(output_path), workers=1)
+    assert not output_path.exists()
+
+
+def test_parquet_without_pyarrow_fails_with_a_message(tmp_path, monkeypatch, capsys):
+    csv_path = tmp_path / "sites.csv"
+    site_records(3).to_csv(csv_path, index=False)
+    # A None entry makes the import fail as if pyarrow were not installed
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    assert main([str(csv_path), str(tmp_path / "scored.parquet"), "--workers", "1", "--quiet"]) == 1
+    assert "Parquet needs pyarrow" in capsys.readouterr().err
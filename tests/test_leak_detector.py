@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from leak_detector import INDICATORS, LeakDetector
+from meter_stream import AREAS, simulate_readings
+
+LEAKING_AREA = 1
+
+
+def feed():
+    # A quiet feed still trips the z-scores every few hundred ticks; this seed has no such alarm in 1,000 ticks
+    return simulate_readings(meters_per_area=100, realtime=False, seed=16, start_time=0.0)
+
+
+def with_leak(batch, acoustic_only=False):
+    # The same shifts simulate_readings applies to an area with a leak
+    batch = batch.copy()
+    leaking = batch["area"] == LEAKING_AREA
+    batch["acoustic"][leaking] += 15.0
+    if not acoustic_only:
+        batch["flow"][leaking] *= 1.5
+        batch["pressure"][leaking] -= 0.3
+        batch["temperature"][leaking] -= 1.5
+    return batch
+
+
+def run(detector, source, ticks, leak=None):
+    for _ in range(ticks):
+        batch = next(source)
+        detector.update(batch if leak is None else leak(batch))
+    return float(batch["timestamp"].max())
+
+
+@pytest.fixture
+def warmed_up():
+    detector, source = LeakDetector(), feed()
+    run(detector, source, 60)
+    return detector, source
+
+
+def test_quiet_feed_raises_nothing(warmed_up):
+    detector, _ = warmed_up
+    assert not detector.active_indicators().any()
+    table = detector.abnormality_table()
+    assert list(table.columns) == ["Area", "Abnormalities", "Indicators"]
+    assert all(indicators == ["All Good!"] for indicators in table["Indicators"])
+    assert set(table["Abnormalities"].str[0]) == {"0/4"}
+
+
+def test_leak_raises_every_indicator_of_its_area_and_then_clears(warmed_up):
+    detector, source = warmed_up
+    run(detector, source, 30, leak=with_leak)
+
+    active = detector.active_indicators()
+    assert active[:, LEAKING_AREA].all()
+    assert not np.delete(active, LEAKING_AREA, axis=1).any()
+    table = detector.abnormality_table()
+    assert table.loc[0, "Area"] == [AREAS[LEAKING_AREA]]
+    assert table.loc[0, "Abnormalities"] == ["4/4"]
+    assert table.loc[0, "Indicators"] == INDICATORS
+    assert (table.loc[1:, "Abnormalities"].str[0] == "0/4").all()
+
+    # Baselines settle back once the leak stops and the hold runs out
+    run(detector, source, 900)
+    assert not detector.active_indicators().any()
+
+
+def test_indicator_is_held_for_hold_seconds(warmed_up):
+    detector, source = warmed_up
+    alert_time = run(detector, source, 1, leak=lambda batch: with_leak(batch, acoustic_only=True))
+    assert detector.active_indicators()[1, LEAKING_AREA]
+
+    last = run(detector, source, 299)
+    assert last - alert_time == 299
+    assert detector.active_indicators()[1, LEAKING_AREA]
+    run(detector, source, 2)
+    assert not detector.active_indicators()[1, LEAKING_AREA]
+
+
+def test_pressure_cusum_catches_a_small_sustained_drop(warmed_up):
+    detector, source = warmed_up
+
+    def pressure_drop(batch):
+        batch = batch.copy()
+        batch["pressure"][batch["area"] == LEAKING_AREA] -= 0.05
+        return batch
+
+    run(detector, source, 30, leak=pressure_drop)
+    active = detector.active_indicators()
+    assert active[3, LEAKING_AREA]
+    assert not active[:3].any()
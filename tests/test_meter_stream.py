@@ -0,0 +1,26 @@
+import numpy as np
+
+from meter_stream import READING_DTYPE, ReadingRingBuffer
+
+
+def readings(start, n):
+    batch = np.zeros(n, dtype=READING_DTYPE)
+    batch["flow"] = np.arange(start, start + n)
+    return batch
+
+
+def test_ring_buffer_keeps_newest_readings():
+    buffer = ReadingRingBuffer(capacity=5)
+    buffer.append(readings(0, 3))
+    buffer.append(readings(3, 4))
+    assert buffer.total == 7
+    np.testing.assert_array_equal(buffer.latest()["flow"], [2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(buffer.latest(2)["flow"], [5, 6])
+
+
+def test_ring_buffer_counts_oversized_batch_in_full():
+    buffer = ReadingRingBuffer(capacity=5)
+    buffer.append(readings(0, 2))
+    buffer.append(readings(2, 12))
+    assert buffer.total == 14
+    np.testing.assert_array_equal(buffer.latest()["flow"], [9, 10, 11, 12, 13])
@@ -0,0 +1,96 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rainfall_simulation import (DRAINAGE_RATE, EVAPOTRANSPIRATION_MM, RAINFALL_WINDOW_DAYS, SeasonPeaks,
+                                 load_rainfall_csv, simulate_season)
+
+
+class RecordingEngine:
+    # Scores every site with its soil moisture and keeps the inputs of each day
+    def __init__(self):
+        self.days = []
+
+    def evaluate_batch(self, inputs):
+        self.days.append(inputs)
+        return np.asarray(inputs['soil_moisture'], dtype=np.float64)
+
+
+def daily(values, start="2023-09-01"):
+    return pd.Series(values, index=pd.date_range(start, periods=len(values), freq="D"), dtype=np.float64)
+
+
+def test_soil_bucket_fills_drains_and_overflows():
+    rainfall = daily([10, 0, 500, 0])
+    engine = RecordingEngine()
+    days = list(simulate_season(rainfall, {'soil_moisture': [50, 0], 'slope_steepness': 30},
+                                engine, storage_mm=200))
+
+    storage = np.array([100.0, 0.0])
+    for (date, soil_moisture, scores), rain in zip(days, rainfall):
+        storage = np.clip(storage + rain - EVAPOTRANSPIRATION_MM - DRAINAGE_RATE * (storage + rain), 0, 200)
+        np.testing.assert_allclose(soil_moisture, storage / 2)
+        np.testing.assert_array_equal(scores, soil_moisture)
+    assert days[0][0] == pd.Timestamp("2023-09-01")
+    # The 500 mm day fills both buckets; the water beyond storage runs off
+    np.testing.assert_array_equal(days[2][1], [100, 100])
+    # Static inputs are broadcast to every site
+    np.testing.assert_array_equal(engine.days[0]['slope_steepness'], [30, 30])
+
+
+def test_rainfall_input_is_the_trailing_ninety_days():
+    rainfall = daily(np.full(RAINFALL_WINDOW_DAYS + 10, 2.0))
+    engine = RecordingEngine()
+    for _ in simulate_season(rainfall, {'soil_moisture': 50}, engine, antecedent_rainfall_mm=900):
+        pass
+    totals = np.array([day['rainfall'] for day in engine.days])
+    day = np.arange(len(rainfall))
+    expected = np.where(day < RAINFALL_WINDOW_DAYS, (day + 1) * 2.0 + (RAINFALL_WINDOW_DAYS - 1 - day) * 10.0,
+                        RAINFALL_WINDOW_DAYS * 2.0)
+    np.testing.assert_allclose(totals, expected)
+
+
+def test_antecedent_rainfall_defaults_to_the_series_rate():
+    engine = RecordingEngine()
+    for _ in simulate_season(daily([3, 5]), {'soil_moisture': 50}, engine):
+        pass
+    assert engine.days[0]['rainfall'] == pytest.approx(3 + 89 * 4)
+
+
+def test_season_peaks_keep_the_first_date_of_the_maximum():
+    peaks = SeasonPeaks(3)
+    dates = pd.date_range("2023-09-01", periods=4, freq="D")
+    for date, scores in zip(dates, [[10, np.nan, 5], [30, np.nan, 5], [30, 20, 4], [25, np.nan, 5]]):
+        peaks.update(date, np.asarray(scores, dtype=np.float64))
+    summary = peaks.to_frame()
+    assert peaks.days == 4
+    np.testing.assert_array_equal(summary["peak_risk_score"], [30, 20, 5])
+    assert list(summary["peak_date"]) == [dates[1], dates[2], dates[0]]
+
+
+def test_season_peaks_without_scores():
+    peaks = SeasonPeaks(1)
+    peaks.update("2023-09-01", np.array([np.nan]))
+    summary = peaks.to_frame()
+    assert summary["peak_risk_score"].isna().all() and summary["peak_date"].isna().all()
+
+
+def test_load_rainfall_csv_totals_per_day():
+    csv = io.StringIO("station,date,rain_mm\n"
+                      "A,2023-09-03 06:00,4.5\n"
+                      "A,2023-09-01 06:00,2.0\n"
+                      "A,2023-09-01 18:00,3.0\n"
+                      "A,2023-09-04 12:00,-1\n")
+    rainfall = load_rainfall_csv(csv)
+    assert list(rainfall.index) == list(pd.date_range("2023-09-01", "2023-09-04", freq="D"))
+    np.testing.assert_array_equal(rainfall, [5.0, 0.0, 4.5, 0.0])
+    assert rainfall.name == "rainfall_mm"
+
+
+def test_load_rainfall_csv_rejects_missing_columns():
+    with pytest.raises(ValueError, match="'day'"):
+        load_rainfall_csv(io.StringIO("date,rain\n2023-09-01,1\n"), date_column="day")
+    with pytest.raises(ValueError, match="numeric"):
+        load_rainfall_csv(io.StringIO("date,note\n2023-09-01,wet\n"))
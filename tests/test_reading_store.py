@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from meter_stream import AREAS, READING_DTYPE
+from reading_store import UTC_OFFSET_SECONDS, ReadingStore, month_bounds
+
+
+def half_hourly_readings(start, end, areas=(0, 2)):
+    # One reading per area every 30 minutes with a distinct flow per reading
+    timestamp = np.arange(start, end, 1800.0)
+    batch = np.zeros(len(timestamp) * len(areas), dtype=READING_DTYPE)
+    batch["timestamp"] = np.tile(timestamp, len(areas))
+    batch["area"] = np.repeat(areas, len(timestamp))
+    batch["flow"] = np.arange(len(batch)) % 7 + 1
+    batch["pressure"] = 3.0
+    return batch
+
+
+@pytest.fixture
+def readings():
+    # Two days either side of the February/March boundary in local time
+    march, _ = month_bounds(2023, 3)
+    return half_hourly_readings(march - 2 * 86400, march + 2 * 86400)
+
+
+@pytest.fixture
+def store(tmp_path, readings):
+    store = ReadingStore(root=str(tmp_path / "store"), chunk_rows=20)
+    assert store.version() is None
+    # Shuffled appends in uneven batches still come back in timestamp order
+    shuffled = np.random.default_rng(0).permutation(readings)
+    for batch in np.array_split(shuffled, 5):
+        store.append(batch)
+    store.flush()
+    return store
+
+
+def test_query_returns_the_half_open_interval(store, readings):
+    march, _ = month_bounds(2023, 3)
+    start, end = march - 3600, march + 5400
+    data = store.query("Area S", start, end)
+    expected = readings[(readings["area"] == 2) & (readings["timestamp"] >= start) &
+                        (readings["timestamp"] < end)]
+    assert np.array_equal(np.sort(data["timestamp"]), expected["timestamp"])
+    order = np.argsort(data["timestamp"])
+    np.testing.assert_array_equal(data["flow"][order], expected["flow"])
+    assert len(store.query("Area N", start, end, ["timestamp"])["timestamp"]) == 5
+    assert len(store.query("Area E", start, end)["flow"]) == 0
+
+
+def test_partitions_follow_the_local_day(store):
+    index = store.index()
+    march, _ = month_bounds(2023, 3)
+    march_day = (march + UTC_OFFSET_SECONDS) // 86400
+    first_march = index[(index["area"] == 0) & (index["day"] == march_day)]
+    assert first_march["rows"].sum() == 48
+    assert first_march["t_min"].min() == march
+
+
+def test_resample_matches_pandas(store, readings):
+    start, end = month_bounds(2023, 3)
+    hourly = store.resample("Area N", start, end)
+    assert len(hourly) == 31 * 24
+    assert hourly["time"].iloc[0] == pd.Timestamp("2023-03-01 00:00")
+
+    in_march = readings[(readings["area"] == 0) & (readings["timestamp"] >= start) & (readings["timestamp"] < end)]
+    expected = pd.Series(in_march["flow"].astype(np.float64)).groupby((in_march["timestamp"] - start) // 3600).sum()
+    np.testing.assert_allclose(hourly["flow"].to_numpy()[:len(expected)], expected.to_numpy())
+    assert (hourly["flow"].to_numpy()[len(expected):] == 0).all()
+
+    means = store.resample("Area N", start, end, field="pressure", how="mean")
+    assert (means["pressure"].dropna() == 3.0).all()
+    assert means["pressure"].isna().sum() == len(means) - 48
+    with pytest.raises(ValueError):
+        store.resample("Area N", start, end, how="max")
+
+
+def test_monthly_area_totals_from_the_index(store, readings):
+    totals = store.monthly_area_totals(2023)
+    assert list(totals.columns[:3]) == ["Area", "January", "February"]
+    assert list(totals["Area"]) == AREAS
+    march, _ = month_bounds(2023, 3)
+    for area, name in [(0, "Area N"), (2, "Area S")]:
+        rows = readings[readings["area"] == area]
+        row = totals[totals["Area"] == name].iloc[0]
+        assert row["February"] == rows["flow"][rows["timestamp"] < march].sum()
+        assert row["March"] == rows["flow"][rows["timestamp"] >= march].sum()
+    assert (totals.loc[totals["Area"] == "Area E", "January":].to_numpy() == 0).all()
+    assert store.monthly_area_totals(2022).empty
+
+
+def test_version_changes_with_every_flushed_chunk(store):
+    version = store.version()
+    store.append(half_hourly_readings(*month_bounds(2023, 6), areas=(1,))[:3])
+    assert store.version() == version
+    store.flush()
+    assert store.version() != version
+    assert (store.index()["area"] == 1).any()
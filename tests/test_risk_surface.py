@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assessment_store import METRES_PER_DEGREE_LAT, latest_per_site
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_model import DEFAULT_INPUTS
+from geo_index import PolygonIndex
+from risk_surface import build_grid, compute_risk_surface, site_input_grids
+
+
+def site(site_id, date, lat, lon, slope=50.0):
+    return {"id": site_id, "assessment_date": date, "lat": lat, "lon": lon, "slope_steepness": slope,
+            "soil_nailing": np.nan}
+
+
+def test_latest_per_site_keeps_the_newest_assessment_of_each_slope():
+    # Two visits to one slope a few metres apart, and a separate slope 1 km away
+    offset = 10 / METRES_PER_DEGREE_LAT
+    assessments = pd.DataFrame([
+        site(1, "2024-01-01", 5.40, 100.30, slope=10),
+        site(2, "2024-06-01", 5.40 + offset, 100.30, slope=20),
+        site(3, "2024-03-01", 5.41, 100.30, slope=30),
+    ])
+    latest = latest_per_site(assessments)
+    assert sorted(latest["slope_steepness"]) == [20, 30]
+    assert latest_per_site(assessments.iloc[:0]).empty
+
+
+def test_site_input_grids_takes_the_nearest_site_within_range():
+    sites = pd.DataFrame([site(1, "2024-01-01", 5.40, 100.30, slope=10),
+                          site(2, "2024-01-01", 5.40, 100.31, slope=90)])
+    lon = np.array([100.299, 100.311, 100.40])
+    lat = np.array([5.40, 5.401])
+    grids = site_input_grids(sites, lon, lat, ["slope_steepness", "soil_nailing"])
+
+    assert grids["slope_steepness"].shape == (2, 3)
+    np.testing.assert_array_equal(grids["slope_steepness"][:, :2], [[10, 90], [10, 90]])
+    # 100.40 is about 10 km from either site, beyond SITE_INFLUENCE_M
+    assert np.isnan(grids["slope_steepness"][:, 2]).all()
+    # Missing measures fall back to their defaults in covered cells only
+    np.testing.assert_array_equal(grids["soil_nailing"][:, :2], DEFAULT_INPUTS["soil_nailing"])
+    assert np.isnan(grids["soil_nailing"][:, 2]).all()
+
+
+def test_site_input_grids_distance_cutoff():
+    sites = pd.DataFrame([site(1, "2024-01-01", 5.40, 100.30)])
+    lat = 5.40 + np.array([400, 600]) / METRES_PER_DEGREE_LAT
+    grids = site_input_grids(sites, np.array([100.30]), lat, ["slope_steepness"], max_distance_m=500)
+    np.testing.assert_array_equal(np.isnan(grids["slope_steepness"][:, 0]), [False, True])
+
+
+def test_site_input_grids_without_sites():
+    grids = site_input_grids(pd.DataFrame(columns=["lat", "lon", "slope_steepness"]),
+                             np.arange(3.0), np.arange(2.0), ["slope_steepness"])
+    assert grids["slope_steepness"].shape == (2, 3)
+    assert np.isnan(grids["slope_steepness"]).all()
+
+
+@pytest.fixture(scope="module")
+def two_squares():
+    # Two unit squares side by side: (0..1, 0..1) and (1..2, 0..1)
+    coords = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0],
+                       [1, 0], [2, 0], [2, 1], [1, 1], [1, 0]], dtype=np.float64)
+    properties = pd.DataFrame({"KodPar": ["P001", "P002"], "Parliament": ["West", "East"]})
+    return PolygonIndex(coords, np.array([0, 5, 10]), np.array([0, 1], dtype=np.int32), properties)
+
+
+class ConstantEngine:
+    def __init__(self):
+        self.calls = []
+
+    def evaluate_batch(self, inputs):
+        self.calls.append(inputs)
+        sizes = [np.size(value) for value in inputs.values()]
+        return np.full(max(sizes), 42.0)
+
+
+def test_compute_risk_surface_scalar_inputs_cover_every_cell(two_squares):
+    engine = ConstantEngine()
+    surface = compute_risk_surface({"rainfall": 80.0}, n_lon=4, n_lat=2, index=two_squares, engine=engine)
+    assert len(surface) == 8
+    assert list(surface.columns) == ["lon", "lat", "KodPar", "Parliament", "risk_score"]
+    assert (surface.loc[surface["lon"] < 1, "KodPar"] == "P001").all()
+    assert (surface.loc[surface["lon"] > 1, "Parliament"] == "East").all()
+    assert (surface["risk_score"] == 42.0).all()
+
+
+def test_compute_risk_surface_masks_nan_cells(two_squares):
+    lon, lat = build_grid(two_squares.bounds, 4, 2)
+    slope = np.full((len(lat), len(lon)), 50.0)
+    slope[:, 0] = np.nan
+    engine = ConstantEngine()
+    surface = compute_risk_surface({"rainfall": 80.0, "slope_steepness": slope}, n_lon=4, n_lat=2,
+                                   index=two_squares, engine=engine)
+    assert len(surface) == 6
+    assert (surface["lon"] > lon[0]).all()
+    assert engine.calls[0]["slope_steepness"].shape == (6,)
+
+
+def test_compute_risk_surface_matches_the_engine_per_cell(two_squares):
+    lon, lat = build_grid(two_squares.bounds, 4, 2)
+    slope = np.tile(np.linspace(10, 90, len(lon)), (len(lat), 1))
+    inputs = dict(DEFAULT_INPUTS, rainfall=100, soil_moisture=10, human_activity=100, historical_landslides=100,
+                  soil_type=0, drainage_system=50, vegetated_surface=80, slope_nature=0, slope_steepness=slope)
+    surface = compute_risk_surface(inputs, n_lon=4, n_lat=2, index=two_squares)
+    engine = get_fuzzy_engine()
+    for row in surface.itertuples():
+        column = int(np.argmin(np.abs(lon - row.lon)))
+        cell = dict(inputs, slope_steepness=slope[0, column])
+        assert row.risk_score == pytest.approx(engine.evaluate(cell))
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fuzzy_engine import get_fuzzy_engine
+from sensitivity import sweep_inputs, tornado_table
+
+SITE = {'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': 5, 'human_activity': 0,
+        'historical_landslides': 0, 'soil_type': 0, 'drainage_system': 25,
+        'vegetated_surface': 5, 'slope_nature': 0}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return get_fuzzy_engine()
+
+
+@pytest.fixture(scope="module")
+def sweep(engine):
+    return sweep_inputs(SITE, engine, points=11)
+
+
+def test_sweep_matches_per_point_evaluation(engine, sweep):
+    assert set(sweep["input"]) == set(engine.input_names)
+    assert sweep.groupby("input").size().max() <= 11
+    for row in sweep.itertuples():
+        point = {**SITE, row.input: row.value}
+        try:
+            expected = engine.evaluate(point)
+        except ValueError:
+            assert np.isnan(row.risk_score)
+        else:
+            assert row.risk_score == pytest.approx(expected)
+
+
+def test_sweep_covers_each_universe(engine, sweep):
+    for name, universe in engine.input_universes.items():
+        values = sweep.loc[sweep["input"] == name, "value"]
+        assert values.iloc[0] == universe[0] and values.iloc[-1] == universe[-1]
+
+
+def test_sweep_requires_every_input(engine):
+    with pytest.raises(ValueError):
+        sweep_inputs({'rainfall': 300}, engine)
+
+
+def test_tornado_rows_are_sorted_by_swing(engine, sweep):
+    base_score = engine.evaluate(SITE)
+    table = tornado_table(sweep, base_score)
+    assert table["swing"].is_monotonic_decreasing
+    assert (table["swing"] == table["max_score"] - table["min_score"]).all()
+    np.testing.assert_allclose(table["high"] - table["low"], table["swing"])
+    assert (table["min_score"] <= base_score + 1e-9).all() and (table["max_score"] >= base_score - 1e-9).all()
+
+
+def test_tornado_uses_the_extremes_of_each_input():
+    sweep = pd.DataFrame({
+        "input": ["a", "a", "a", "b", "b", "b"],
+        "value": [0, 1, 2, 0, 1, 2],
+        "risk_score": [40, 50, np.nan, 10, 90, 30],
+    })
+    table = tornado_table(sweep, 50)
+    assert list(table.index) == ["b", "a"]
+    assert table.loc["b", ["min_value", "max_value", "low", "high", "swing"]].tolist() == [0, 1, -40, 40, 80]
+    assert table.loc["a", ["min_score", "max_score", "swing"]].tolist() == [40, 50, 10]
@@ -0,0 +1,31 @@
+import numpy as np
+
+from fuzzy_engine import get_fuzzy_engine
+from uncertainty import get_process_pool, sample_risk_scores, summarize_risk_scores
+
+SITE_INPUTS = {'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': 15, 'human_activity': 0,
+               'historical_landslides': 0, 'soil_type': 2, 'drainage_system': 50,
+               'vegetated_surface': 45, 'slope_nature': 100}
+
+
+def test_serial_samples_are_reproducible():
+    first = sample_risk_scores(SITE_INPUTS, 2_000, seed=0)
+    second = sample_risk_scores(SITE_INPUTS, 2_000, seed=0)
+    np.testing.assert_array_equal(first, second)
+    assert summarize_risk_scores(first)["samples"] > 0
+
+
+def test_parallel_samples_reuse_one_spawned_pool():
+    engine = get_fuzzy_engine()
+    first = sample_risk_scores(SITE_INPUTS, 3_000, engine, seed=0, workers=2)
+    pool = get_process_pool()
+    second = sample_risk_scores(SITE_INPUTS, 3_000, engine, seed=0, workers=2)
+    assert get_process_pool() is pool
+    assert pool._mp_context.get_start_method() == "spawn"
+    np.testing.assert_array_equal(first, second)
+    assert first.shape == (3_000,)
+
+    # Batches are scored as the serial path would score them with the same streams
+    seeds = np.random.SeedSequence(0).spawn(2)
+    expected = np.concatenate([sample_risk_scores(SITE_INPUTS, 1_500, engine, seed=seed) for seed in seeds])
+    np.testing.assert_array_equal(first, expected)
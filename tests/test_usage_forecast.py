@@ -0,0 +1,44 @@
+import pytest
+
+import usage_forecast
+
+
+@pytest.fixture
+def fresh_forecaster(monkeypatch):
+    for name, value in [("_forecaster", None), ("_forecaster_key", None), ("_forecaster_error", None),
+                        ("_forecaster_thread", None)]:
+        monkeypatch.setattr(usage_forecast, name, value)
+
+
+def wait_for_background_load():
+    if usage_forecast._forecaster_thread is not None:
+        usage_forecast._forecaster_thread.join(timeout=60)
+
+
+def test_failed_fit_is_reported_and_not_retried(fresh_forecaster, monkeypatch):
+    attempts = []
+
+    def failing_fit():
+        attempts.append(1)
+        raise ValueError("no usable rows")
+
+    monkeypatch.setattr(usage_forecast, "load_or_fit_forecaster", failing_fit)
+    assert usage_forecast.get_usage_forecaster() is None
+    wait_for_background_load()
+
+    assert usage_forecast.usage_forecaster_error() == "ValueError: no usable rows"
+    assert usage_forecast.get_usage_forecaster() is None
+    wait_for_background_load()
+    assert len(attempts) == 1
+
+
+def test_forecaster_is_loaded_once_per_data_version(fresh_forecaster, monkeypatch):
+    fitted = object()
+    attempts = []
+    monkeypatch.setattr(usage_forecast, "load_or_fit_forecaster", lambda: attempts.append(1) or fitted)
+    usage_forecast.get_usage_forecaster()
+    wait_for_background_load()
+
+    assert usage_forecast.get_usage_forecaster() is fitted
+    assert usage_forecast.usage_forecaster_error() is None
+    assert len(attempts) == 1
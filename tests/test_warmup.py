@@ -0,0 +1,22 @@
+import logging
+
+from instrumentation import get_span_recorder
+from warmup import warm_up, warmup_errors
+
+
+def test_failed_steps_are_logged_and_recorded(caplog):
+    def broken_step():
+        raise RuntimeError("lookup table unreadable")
+
+    with caplog.at_level(logging.ERROR, logger="warmup"):
+        timings = warm_up(modules=("json", "no_such_module_for_warmup"),
+                          steps={"broken": broken_step, "working": lambda: None})
+
+    assert set(timings) == {"import.json", "working"}
+    assert warmup_errors()["broken"] == "RuntimeError: lookup table unreadable"
+    assert warmup_errors()["import.no_such_module_for_warmup"].startswith("ModuleNotFoundError")
+    assert {record.getMessage() for record in caplog.records} == {
+        "Warm-up step broken failed", "Warm-up step import.no_such_module_for_warmup failed"}
+    spans = get_span_recorder().snapshot()
+    assert spans["warmup.broken.failed"]["count"] >= 1
+    assert "warmup.working" in spans
@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from water_datasets import DATASETS, load_dataset
+
+
+@pytest.mark.parametrize("name", list(DATASETS))
+def test_load_dataset_returns_private_copy(name):
+    frame = load_dataset(name)
+    expected = load_dataset(name)
+    # Overwrite the last column in place with values of its own dtype, which may be categorical
+    last = frame.iloc[:, -1]
+    frame.iloc[:, -1] = pd.Series(last.to_numpy()[::-1], index=frame.index, dtype=last.dtype)
+    frame.drop(index=frame.index[0], inplace=True)
+    pd.testing.assert_frame_equal(load_dataset(name), expected)
+
+
+def test_loading_leaves_pandas_options_alone():
+    load_dataset("water_usage")
+    assert pd.get_option("mode.copy_on_write") is False
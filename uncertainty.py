@@ -0,0 +1,165 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from fuzzy_engine import get_fuzzy_engine
+from fuzzy_model import DEFAULT_INPUTS
+from landslide_scoring import HIGH_RISK_THRESHOLD
+
+MONTE_CARLO_SAMPLES = 10_000
+
+# Spread of each field input around its form value: ("normal", standard deviation),
+# ("relative", standard deviation as a fraction of the value) or ("uniform", half
+# width, e.g. half a form bucket). Inputs not listed are taken as exact.
+INPUT_UNCERTAINTY = {
+    'rainfall': ("relative", 0.2),
+    'soil_moisture': ("normal", 10.0),
+    'slope_steepness': ("uniform", 2.5),
+    'vegetated_surface': ("uniform", 5.0),
+    'drainage_system': ("normal", 10.0),
+}
+
+
+def sample_inputs(inputs, n_samples, rng, uncertainty=INPUT_UNCERTAINTY):
+    """
+    Draws input samples around a set of form values.
+
+    Parameters:
+    - inputs: Fuzzy input values keyed by name.
+    - n_samples: Number of samples.
+    - rng: numpy Generator.
+    - uncertainty: Spread of every uncertain input, as in INPUT_UNCERTAINTY.
+
+    Returns:
+    - dict: One array of n_samples values per uncertain input, and the exact
+      value of every other input. The engine clips samples to each universe.
+    """
+    samples = {**DEFAULT_INPUTS, **inputs}
+    for name, (kind, spread) in uncertainty.items():
+        if name not in samples:
+            continue
+        value = float(samples[name])
+        if kind == "normal":
+            samples[name] = rng.normal(value, spread, n_samples)
+        elif kind == "relative":
+            samples[name] = rng.normal(value, abs(value) * spread, n_samples)
+        elif kind == "uniform":
+            samples[name] = rng.uniform(value - spread, value + spread, n_samples)
+        else:
+            raise ValueError("Unknown input distribution: " + kind)
+    return samples
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    """
+    Returns the process-wide pool for parallel sampling, one worker per CPU, started on first use.
+
+    Workers are spawned rather than forked: forking the multithreaded
+    Streamlit server can copy locks held by other threads into the child.
+    The pool is kept for the life of the process so reruns do not pay its
+    startup again.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_process_pool(pool):
+    # A worker died; the next call starts a fresh pool
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _score_samples(engine, inputs, n_samples, seed, uncertainty):
+    rng = np.random.default_rng(seed)
+    return engine.evaluate_batch(sample_inputs(inputs, n_samples, rng, uncertainty))
+
+
+def sample_risk_scores(inputs, n_samples=MONTE_CARLO_SAMPLES, engine=None, seed=None, workers=1,
+                       uncertainty=INPUT_UNCERTAINTY):
+    """
+    Monte Carlo risk scores for uncertain field inputs.
+
+    All samples go through the fuzzy model as one vectorized batch. With
+    ``workers > 1`` the samples are split into that many batches, each drawn
+    from an independent random stream and scored on the shared process pool
+    (see get_process_pool).
+
+    Parameters:
+    - inputs: Form values, as passed to calculate_landslide_risk.
+    - n_samples: Number of samples.
+    - engine: Scorer with an evaluate_batch method, the compiled fuzzy engine by default.
+    - seed: Random seed.
+    - workers: Number of batches scored in parallel (0 for one per CPU).
+    - uncertainty: Spread of every uncertain input, as in INPUT_UNCERTAINTY.
+
+    Returns:
+    - np.ndarray: One risk score per sample, NaN where no rule fires.
+    """
+    engine = engine or get_fuzzy_engine()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return _score_samples(engine, inputs, n_samples, seed, uncertainty)
+
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    sizes = [len(part) for part in np.array_split(np.arange(n_samples), workers)]
+    pool = get_process_pool()
+    try:
+        parts = pool.map(_score_samples, [engine] * workers, [inputs] * workers, sizes, seeds,
+                         [uncertainty] * workers)
+        return np.concatenate(list(parts))
+    except BrokenProcessPool:
+        _discard_process_pool(pool)
+        raise
+
+
+def summarize_risk_scores(scores):
+    """
+    Summarizes Monte Carlo risk scores.
+
+    Returns:
+    - dict: ``p5``, ``p50``, ``p95`` and ``mean`` of the scores, ``p_high``
+      (share of scores in the "High" category) and ``samples`` (number of
+      samples with a score).
+    """
+    scores = scores[~np.isnan(scores)]
+    if scores.size == 0:
+        return {"p5": np.nan, "p50": np.nan, "p95": np.nan, "mean": np.nan, "p_high": np.nan, "samples": 0}
+    p5, p50, p95 = np.percentile(scores, [5, 50, 95])
+    return {"p5": float(p5), "p50": float(p50), "p95": float(p95), "mean": float(scores.mean()),
+            "p_high": float(np.mean(scores > HIGH_RISK_THRESHOLD)), "samples": int(scores.size)}
+
+
+if __name__ == "__main__":
+    # Time the Monte Carlo run serially and across processes
+    import sys
+    import time
+
+    from fuzzy_lookup import get_fuzzy_lookup
+
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else MONTE_CARLO_SAMPLES
+    inputs = {'rainfall': 300, 'soil_moisture': 50, 'slope_steepness': 15, 'human_activity': 0,
+              'historical_landslides': 0, 'soil_type': 2, 'drainage_system': 50,
+              'vegetated_surface': 45, 'slope_nature': 100}
+    for label, engine in (("exact", get_fuzzy_engine()), ("lookup", get_fuzzy_lookup())):
+        for workers in (1, 0):
+            started = time.perf_counter()
+            summary = summarize_risk_scores(sample_risk_scores(inputs, n_samples, engine, seed=0, workers=workers))
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{label}, {'1 process' if workers == 1 else 'all CPUs'}: {n_samples:,} samples in "
+                  f"{elapsed:.0f} ms; P5/P50/P95 {summary['p5']:.1f}/{summary['p50']:.1f}/{summary['p95']:.1f}, "
+                  f"P(High) {summary['p_high']:.1%}")
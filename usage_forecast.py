@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from water_datasets import (AREA_DTYPE, DATASETS, FESTIVAL_DTYPE, MONTH_ORDER, WEATHER_DTYPE,
+                            dataset_version, load_water_usage_data)
+
+logger = logging.getLogger(__name__)
+
+FORECAST_CACHE_DIR = os.path.join(".cache", "forecast")
+
+AREAS = list(AREA_DTYPE.categories)
+WEATHERS = list(WEATHER_DTYPE.categories)
+
+
+def usage_features(month, weather, festival, visitors, residents):
+    """
+    Builds the model feature matrix from integer month/weather/festival codes and counts.
+
+    Months are encoded on the unit circle so December sits next to January;
+    weather is one-hot encoded.
+    """
+    month = np.asarray(month, dtype=np.float64)
+    angle = 2 * np.pi * month / len(MONTH_ORDER)
+    weather = np.asarray(weather, dtype=np.int64)
+    columns = [np.sin(angle), np.cos(angle), np.asarray(festival, dtype=np.float64),
+               np.log1p(np.asarray(visitors, dtype=np.float64)),
+               np.log1p(np.asarray(residents, dtype=np.float64))]
+    columns += [(weather == code).astype(np.float64) for code in range(len(WEATHERS))]
+    return np.column_stack(columns)
+
+
+class UsageForecaster:
+    """
+    Per-area regression models of monthly water usage.
+
+    Each area gets a standardized ridge regression of log usage on the month,
+    weather, festival, visitor and resident features. The historical row of
+    each (month, area) is kept as the default scenario, so a prediction only
+    needs the month and area and may override any feature.
+    """
+
+    def __init__(self, frame):
+        # scikit-learn takes over a second to import; only fitting needs it
+        from sklearn.linear_model import RidgeCV
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        self.models = {}
+        self.profile = {}
+        for area_code, area in enumerate(AREAS):
+            rows = frame[frame["Area"] == area]
+            month = rows["Month"].cat.codes.to_numpy()
+            weather = rows["Weather"].cat.codes.to_numpy()
+            festival = rows["Festival"].cat.codes.to_numpy()
+            visitors = rows["No_Visitor_Area"].to_numpy()
+            residents = rows["No_Residence_Area"].to_numpy()
+            model = make_pipeline(StandardScaler(), RidgeCV(alphas=np.logspace(-3, 3, 13)))
+            model.fit(usage_features(month, weather, festival, visitors, residents),
+                      np.log(rows["Avg_Usage_Litre"].to_numpy(dtype=np.float64)))
+            self.models[area] = model
+
+            # Scenario table indexed by month code: weather, festival, visitors, residents
+            profile = np.zeros((len(MONTH_ORDER), 4))
+            profile[month] = np.column_stack([weather, festival, visitors, residents])
+            self.profile[area_code] = profile
+
+    def predict(self, months, areas, weather=None, festival=None, visitors=None, residents=None):
+        """
+        Predicts usage in litres for many (month, area) pairs at once.
+
+        Parameters:
+        - months, areas: Sequences of month and area names (same length).
+        - weather, festival, visitors, residents: Optional overrides of the
+          historical scenario, scalars or sequences (weather by name,
+          festival as "Yes"/"No").
+
+        Returns:
+        - np.ndarray: Predicted usage for every pair.
+        """
+        month = np.asarray([MONTH_ORDER.index(m) for m in np.atleast_1d(months)])
+        area = np.asarray([AREAS.index(a) for a in np.atleast_1d(areas)])
+        scenario = np.empty((len(month), 4))
+        for area_code in np.unique(area):
+            scenario[area == area_code] = self.profile[area_code][month[area == area_code]]
+        if weather is not None:
+            scenario[:, 0] = [WEATHERS.index(w) for w in np.broadcast_to(weather, month.shape)]
+        if festival is not None:
+            scenario[:, 1] = [list(FESTIVAL_DTYPE.categories).index(f)
+                              for f in np.broadcast_to(festival, month.shape)]
+        if visitors is not None:
+            scenario[:, 2] = visitors
+        if residents is not None:
+            scenario[:, 3] = residents
+
+        features = usage_features(month, scenario[:, 0], scenario[:, 1], scenario[:, 2], scenario[:, 3])
+        predictions = np.empty(len(month))
+        for area_code in np.unique(area):
+            rows = area == area_code
+            predictions[rows] = np.exp(self.models[AREAS[area_code]].predict(features[rows]))
+        return predictions
+
+    def forecast_month(self, month):
+        """
+        Returns a per-area forecast table for one month.
+        """
+        usage = self.predict([month] * len(AREAS), AREAS)
+        return pd.DataFrame({"Area": AREAS, "Forecast_Usage_Litre": usage})
+
+
+def _data_hash():
+    digest = hashlib.sha256()
+    with open(DATASETS["water_usage"]["path"], "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_or_fit_forecaster(cache_dir=FORECAST_CACHE_DIR):
+    """
+    Loads the fitted forecaster for the current water_data.csv from disk,
+    fitting and saving it first if no model exists for this data hash.
+    """
+    import joblib
+
+    path = os.path.join(cache_dir, f"usage_forecaster-{_data_hash()}.joblib")
+    if os.path.exists(path):
+        return joblib.load(path)
+
+    forecaster = UsageForecaster(load_water_usage_data())
+    os.makedirs(cache_dir, exist_ok=True)
+    scratch = path + f".{os.getpid()}.tmp"
+    joblib.dump(forecaster, scratch)
+    os.replace(scratch, path)
+    for entry in os.listdir(cache_dir):
+        if entry.startswith("usage_forecaster-") and os.path.join(cache_dir, entry) != path:
+            os.remove(os.path.join(cache_dir, entry))
+    return forecaster
+
+
+_forecaster = None
+_forecaster_key = None
+_forecaster_error = None
+_forecaster_thread = None
+_forecaster_lock = threading.Lock()
+
+
+def _load_in_background(key):
+    global _forecaster, _forecaster_key, _forecaster_error
+    try:
+        forecaster = load_or_fit_forecaster()
+    except Exception as error:
+        logger.exception("Loading the usage forecaster failed")
+        with _forecaster_lock:
+            # Kept until water_data.csv changes, so a broken file is not refitted on every rerun
+            _forecaster, _forecaster_key, _forecaster_error = None, key, f"{type(error).__name__}: {error}"
+        return
+    with _forecaster_lock:
+        _forecaster, _forecaster_key, _forecaster_error = forecaster, key, None
+
+
+def get_usage_forecaster():
+    """
+    Returns the fitted forecaster, or None while it is being loaded or fitted
+    or when that failed (see usage_forecaster_error).
+
+    Loading and fitting run on a background thread so page reruns never wait
+    for them. Reruns only stat water_data.csv; the file is hashed again, and
+    the forecaster reloaded or refitted, once its modification time or size
+    changes.
+    """
+    global _forecaster_thread
+    key = dataset_version("water_usage")
+    with _forecaster_lock:
+        if _forecaster_key == key:
+            return _forecaster
+        if _forecaster_thread is None or not _forecaster_thread.is_alive():
+            _forecaster_thread = threading.Thread(target=_load_in_background, args=(key,), daemon=True)
+            _forecaster_thread.start()
+    return None
+
+
+def usage_forecaster_error():
+    """
+    Returns why the forecaster for the current water_data.csv could not be loaded or fitted, or None.
+    """
+    key = dataset_version("water_usage")
+    with _forecaster_lock:
+        return _forecaster_error if _forecaster_key == key else None
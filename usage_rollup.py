@@ -0,0 +1,161 @@
+import threading
+
+import numpy as np
+
+from water_datasets import (AREA_DTYPE, FESTIVAL_DTYPE, MONTH_ORDER, WEATHER_DTYPE, dataset_version,
+                            load_choropleth_data, load_water_usage_data)
+
+AREAS = list(AREA_DTYPE.categories)
+WEATHERS = list(WEATHER_DTYPE.categories)
+FESTIVALS = list(FESTIVAL_DTYPE.categories)
+
+# Supply is rated against the peak month: mean share of the peak below these is Low / Moderate.
+# Provisional: there is no published basis for these cutoffs. They only keep the 2023 monthly
+# reports (mean 65% of peak) at the "Low Risk" label of V_Compare_Data.csv, and are used just for
+# data without a source label, such as the reading store. Replace them once the supply risk criteria
+# of the water operator are available.
+LOW_RISK_PERCENT = 70
+MODERATE_RISK_PERCENT = 85
+
+
+class UsageRollup:
+    """
+    Materialized month x area x weather x festival aggregates of water usage.
+
+    Sums, counts and maxima are kept per cube cell, together with the month
+    and month-by-area marginals and the peak monthly total. ``add`` folds new
+    rows into all of them, so every dashboard question is answered by
+    indexing a small array instead of grouping the source table. Rows without
+    a weather or festival label go to an extra "unrecorded" slot on that axis.
+    """
+
+    def __init__(self):
+        shape = (len(MONTH_ORDER), len(AREAS), len(WEATHERS) + 1, len(FESTIVALS) + 1)
+        self._sum = np.zeros(shape)
+        self._count = np.zeros(shape, dtype=np.int64)
+        self._max = np.full(shape, -np.inf)
+        self._month_sum = np.zeros(len(MONTH_ORDER))
+        self._month_count = np.zeros(len(MONTH_ORDER), dtype=np.int64)
+        self._month_area_sum = np.zeros((len(MONTH_ORDER), len(AREAS)))
+        self._max_demand = 0.0
+        self.version = 0
+
+    def add(self, month, area, usage, weather=None, festival=None):
+        """
+        Folds rows into the cube.
+
+        Parameters:
+        - month, area: Integer codes into MONTH_ORDER and AREAS.
+        - usage: Usage value of each row (litres).
+        - weather, festival: Codes into WEATHERS and FESTIVALS; None or -1
+          marks the label as unrecorded.
+        """
+        month = np.asarray(month, dtype=np.int64)
+        area = np.asarray(area, dtype=np.int64)
+        usage = np.asarray(usage, dtype=np.float64)
+        weather = np.full(month.shape, -1) if weather is None else np.asarray(weather, dtype=np.int64)
+        festival = np.full(month.shape, -1) if festival is None else np.asarray(festival, dtype=np.int64)
+        weather = np.where(weather < 0, len(WEATHERS), weather)
+        festival = np.where(festival < 0, len(FESTIVALS), festival)
+
+        cell = np.ravel_multi_index((month, area, weather, festival), self._sum.shape)
+        np.add.at(self._sum.reshape(-1), cell, usage)
+        np.add.at(self._count.reshape(-1), cell, 1)
+        np.maximum.at(self._max.reshape(-1), cell, usage)
+        np.add.at(self._month_sum, month, usage)
+        np.add.at(self._month_count, month, 1)
+        np.add.at(self._month_area_sum, (month, area), usage)
+        self._max_demand = max(self._max_demand, float(self._month_sum[np.unique(month)].max(initial=0.0)))
+        self.version += 1
+
+    def add_usage_frame(self, frame, value_column="Avg_Usage_Litre"):
+        """
+        Folds a water_data.csv style frame (categorical Month, Area, Weather, Festival) into the cube.
+        """
+        self.add(frame["Month"].cat.codes, frame["Area"].cat.codes, frame[value_column],
+                 frame["Weather"].cat.codes, frame["Festival"].cat.codes)
+
+    def add_area_totals(self, area_totals):
+        """
+        Folds a V_Choropleth_Data style frame (Area plus one column per month) into the cube.
+        """
+        values = area_totals[MONTH_ORDER].to_numpy(dtype=np.float64)
+        area = np.asarray([AREAS.index(name) for name in area_totals["Area"]])
+        month, row = np.meshgrid(np.arange(len(MONTH_ORDER)), np.arange(len(area)))
+        self.add(month.ravel(), area[row.ravel()], values.ravel())
+
+    def monthly_average(self, month):
+        index = MONTH_ORDER.index(month)
+        return self._month_sum[index] / self._month_count[index] if self._month_count[index] else float("nan")
+
+    def monthly_total(self, month):
+        return float(self._month_sum[MONTH_ORDER.index(month)])
+
+    def area_total(self, month, area):
+        return float(self._month_area_sum[MONTH_ORDER.index(month), AREAS.index(area)])
+
+    def max_demand(self):
+        return self._max_demand
+
+    def percent_of_max(self, month):
+        return self.monthly_total(month) / self._max_demand * 100 if self._max_demand else 0.0
+
+    def risk_assessment(self):
+        """
+        Labels the supply risk from the mean monthly share of the peak month,
+        using the provisional LOW_RISK_PERCENT and MODERATE_RISK_PERCENT cutoffs.
+        """
+        if not self._max_demand:
+            return "Low Risk"
+        mean_percent = self._month_sum.mean() / self._max_demand * 100
+        if mean_percent < LOW_RISK_PERCENT:
+            return "Low Risk"
+        if mean_percent < MODERATE_RISK_PERCENT:
+            return "Moderate Risk"
+        return "High Risk"
+
+    def cell(self, month=None, area=None, weather=None, festival=None):
+        """
+        Returns (sum, count, max) over the cube cells matching the given labels.
+        """
+        selection = tuple(slice(None) if label is None else labels.index(label)
+                          for label, labels in ((month, MONTH_ORDER), (area, AREAS),
+                                                (weather, WEATHERS), (festival, FESTIVALS)))
+        return (float(self._sum[selection].sum()), int(self._count[selection].sum()),
+                float(self._max[selection].max()))
+
+
+def rollup_from_area_totals(area_totals):
+    rollup = UsageRollup()
+    rollup.add_area_totals(area_totals)
+    return rollup
+
+
+_rollups = {}
+_rollups_lock = threading.Lock()
+
+
+def _dataset_rollup(name, loader, fill):
+    version = dataset_version(name)
+    with _rollups_lock:
+        cached = _rollups.get(name)
+        if cached is None or cached[0] != version:
+            rollup = UsageRollup()
+            fill(rollup, loader())
+            cached = (version, rollup)
+            _rollups[name] = cached
+    return cached[1]
+
+
+def get_usage_rollup():
+    """
+    Returns the rollup of water_data.csv, rebuilt only when the file changes.
+    """
+    return _dataset_rollup("water_usage", load_water_usage_data, UsageRollup.add_usage_frame)
+
+
+def get_supply_rollup():
+    """
+    Returns the rollup of V_Choropleth_Data.csv, rebuilt only when the file changes.
+    """
+    return _dataset_rollup("choropleth", load_choropleth_data, UsageRollup.add_area_totals)
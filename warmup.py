@@ -0,0 +1,156 @@
+import importlib
+import logging
+import os
+import threading
+import time
+
+from instrumentation import get_span_recorder
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to skip the warm-up, e.g. when measuring a cold first submit
+WARMUP_ENV_VAR = "HYDRODATAHUB_WARMUP"
+
+# Heavy libraries the pages import on first use
+WARMUP_MODULES = ("pydeck", "streamlit_image_comparison", "image_io", "image_processing")
+
+
+def _warm_fuzzy_system():
+    from fuzzy_engine import get_fuzzy_engine
+    from fuzzy_lookup import get_fuzzy_lookup
+
+    get_fuzzy_engine()
+    get_fuzzy_lookup()
+
+
+def _warm_image_pipeline():
+    import numpy as np
+
+    from annotation_cache import get_annotation_cache
+    from image_processing import detect_and_annotate
+
+    # One small detection pays OpenCV's first-call setup (thread pool, kernels)
+    get_annotation_cache()
+    rng = np.random.default_rng(0)
+    detect_and_annotate(rng.integers(0, 256, (256, 256, 3), dtype=np.uint8))
+
+
+def _warm_penang_index():
+    from geo_index import get_penang_index
+
+    get_penang_index()
+
+
+def _warm_usage_forecaster():
+    from usage_forecast import get_usage_forecaster
+
+    # Starts the forecaster's own background load or fit
+    get_usage_forecaster()
+
+
+# Deferred initializations in the order a first visitor is likely to need them
+WARMUP_STEPS = {
+    "fuzzy_system": _warm_fuzzy_system,
+    "penang_index": _warm_penang_index,
+    "image_pipeline": _warm_image_pipeline,
+    "usage_forecaster": _warm_usage_forecaster,
+}
+
+
+def warm_up(modules=WARMUP_MODULES, steps=WARMUP_STEPS):
+    """
+    Imports the heavy libraries and builds the process-wide singletons so the
+    first visitor does not wait for them. Each step is timed as the span
+    ``warmup.<step>`` in the process-wide recorder.
+
+    A failing step does not stop the others. It is logged with its
+    traceback, timed as ``warmup.<step>.failed`` and kept in warmup_errors();
+    the page that needs it reports the error again on first use.
+
+    Returns:
+    - dict: Seconds taken by each import and step that succeeded.
+    """
+    recorder = get_span_recorder()
+    timings = {}
+    tasks = [(f"import.{name}", lambda name=name: importlib.import_module(name)) for name in modules]
+    for name, task in tasks + list(steps.items()):
+        started = time.perf_counter()
+        try:
+            task()
+        except Exception as error:
+            logger.exception("Warm-up step %s failed", name)
+            recorder.observe(f"warmup.{name}.failed", time.perf_counter() - started)
+            with _warmup_lock:
+                _warmup_errors[name] = f"{type(error).__name__}: {error}"
+            continue
+        timings[name] = time.perf_counter() - started
+        recorder.observe(f"warmup.{name}", timings[name])
+    return timings
+
+
+def warmup_errors():
+    """
+    Returns the error message of every warm-up step that failed in this process, keyed by step.
+    """
+    with _warmup_lock:
+        return dict(_warmup_errors)
+
+
+_warmup_thread = None
+_warmup_errors = {}
+_warmup_lock = threading.Lock()
+
+
+def start_warmup():
+    """
+    Starts warm_up on a background thread, once per process.
+
+    Every page calls this right after its own imports, so the first script run
+    after the server starts kicks it off; later calls return the same thread.
+
+    Returns:
+    - threading.Thread: The warm-up thread, or None when disabled through WARMUP_ENV_VAR.
+    """
+    global _warmup_thread
+    if os.environ.get(WARMUP_ENV_VAR) == "0":
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, name="warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+if __name__ == "__main__":
+    # Time to first paint of each page in fresh processes, then the warm-up steps
+    import json
+    import subprocess
+    import sys
+
+    PAGES = {
+        "landslide": "pages/🗻Landslide_Risk_Assessment_System.py",
+        "water": "pages/🚿Smart_Water_Meter_System.py",
+    }
+    # AppTest runs the page in the same process, like the first session of a freshly started server
+    PAGE_RUN = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+from instrumentation import get_span_recorder
+AppTest.from_file(sys.argv[1], default_timeout=300).run()
+spans = get_span_recorder().snapshot()
+print(json.dumps({stage: spans[f"{sys.argv[2]}.{stage}"]["last"] for stage in ("imports", "first_paint", "rerun")}))
+"""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for page, path in PAGES.items():
+        results = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", PAGE_RUN, path, page], capture_output=True, text=True,
+                                    check=True, env={**os.environ, WARMUP_ENV_VAR: "0"}).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        print(f"{page}: " + ", ".join(f"{stage} {min(result[stage] for result in results) * 1000:.0f} ms"
+                                      for stage in results[0]) + f" (best of {runs} cold starts)")
+
+    for name, seconds in warm_up().items():
+        print(f"warm-up {name}: {seconds * 1000:.0f} ms")
+    for name, error in warmup_errors().items():
+        print(f"warm-up {name}: failed, {error}")
@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+# Rendered chart specs kept per process; twelve months times a few data versions
+CHART_CACHE_SIZE = 64
+
+_chart_specs = OrderedDict()
+_chart_specs_lock = threading.Lock()
+
+
+def _cached_spec(key, build):
+    with _chart_specs_lock:
+        spec = _chart_specs.get(key)
+        if spec is not None:
+            _chart_specs.move_to_end(key)
+            return spec
+    spec = build()
+    with _chart_specs_lock:
+        _chart_specs[key] = spec
+        _chart_specs.move_to_end(key)
+        while len(_chart_specs) > CHART_CACHE_SIZE:
+            _chart_specs.popitem(last=False)
+    return spec
+
+
+def area_usage_chart_spec(selected_month, area_totals, data_version):
+    """
+    Returns the Vega-Lite spec of the area water usage bar chart for one month.
+
+    Specs are cached per (month, data version) and shared by every session;
+    Streamlit copies a spec before changing it, so the cached dict is never
+    modified. The chart is drawn in the browser, so no figure is held on the
+    server.
+
+    Parameters:
+    - selected_month: Month column of area_totals to plot.
+    - area_totals: DataFrame with an Area column and one usage column per month,
+      like V_Choropleth_Data.
+    - data_version: Hashable version of area_totals, e.g. water_datasets.dataset_version("choropleth").
+
+    Returns:
+    - dict: Vega-Lite spec with the data inlined.
+    """
+    def build():
+        values = [{"Area": str(area), "Usage": float(usage)}
+                  for area, usage in zip(area_totals["Area"], area_totals[selected_month])]
+        bars = {"x": {"field": "Usage", "type": "quantitative", "title": "Water Usage (Litre)"},
+                "y": {"field": "Area", "type": "nominal", "sort": "-x", "title": None}}
+        return {
+            "title": "Water Usage For Selected Month",
+            "data": {"values": values},
+            "transform": [{"calculate": "format(datum.Usage, ',.0f') + ' L'", "as": "Label"}],
+            "height": 240,
+            "layer": [
+                {"mark": {"type": "bar", "color": "#E24A33"}, "encoding": bars},
+                {"mark": {"type": "text", "align": "left", "dx": 3},
+                 "encoding": {**bars, "text": {"field": "Label", "type": "nominal"}}},
+            ],
+        }
+
+    return _cached_spec(("area_usage", selected_month, data_version), build)
+
+
+if __name__ == "__main__":
+    # Time and memory of 10k reruns cycling through the months. Every rerun loads
+    # its own copy of the dataset, as the page does; traced memory stays within a
+    # few KiB of where it was after the first 100 reruns (see load_dataset)
+    import sys
+    import time
+    import tracemalloc
+
+    from water_datasets import MONTH_ORDER, dataset_version, load_choropleth_data
+
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    tracemalloc.start()
+    started = time.perf_counter()
+    for rerun in range(reruns):
+        area_totals = load_choropleth_data()
+        area_usage_chart_spec(MONTH_ORDER[rerun % 12], area_totals, dataset_version("choropleth"))
+        if rerun == 99:
+            baseline = tracemalloc.get_traced_memory()[0]
+    elapsed = time.perf_counter() - started
+    grown = tracemalloc.get_traced_memory()[0] - baseline
+    print(f"{reruns:,} reruns in {elapsed * 1000:.0f} ms ({elapsed / reruns * 1e6:.1f} us each); "
+          f"memory grew {grown / 1024:.1f} KiB after the first 100; {len(_chart_specs)} specs cached")
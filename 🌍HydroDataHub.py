@@ -1,6 +1,8 @@
 import streamlit as st
 import os
 
+from warmup import start_warmup
+
 # Set page configuration with the globe emoji as the page icon
 st.set_page_config(
     page_title="HydroDataHub",
@@ -9,6 +11,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# The landing page is usually the first script run after the server starts: preload
+# the pages' heavy libraries and models in the background while the visitor reads it
+start_warmup()
+
 # Define the member information with LinkedIn profiles
 members = [
     {